@@ -0,0 +1,110 @@
+import argparse
+import http.client
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server'))
+
+from werkzeug.serving import make_server
+
+import app as game_app
+from request_log import FORMATTERS, RequestLogger
+
+class SlowStream:
+    # Simula um stdout lento (pipe do Docker cheio, terminal remoto...):
+    # cada write custa um tempo fixo, como uma syscall bloqueante, e é
+    # serializado por um lock, como no buffer do sys.stdout.
+    def __init__(self, delay):
+        self.delay = delay
+        self.lines = 0
+        self._lock = threading.Lock()
+
+    def write(self, data):
+        with self._lock:
+            time.sleep(self.delay)
+            self.lines += data.count('\n')
+
+    def flush(self):
+        pass
+
+class SyncLogger:
+    # Comportamento antigo: formata e escreve dentro da requisição
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.format = FORMATTERS[fmt]
+        self.dropped = 0
+
+    def log(self, record):
+        self.stream.write(self.format(record) + '\n')
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+def client_worker(port, requests, results):
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        conn.request('GET', '/')
+        conn.getresponse().read()
+        conn.close()
+        latencies.append(time.perf_counter() - start)
+    results.put(latencies)
+
+def run(logger, workers, requests):
+    # Servidor threaded real no processo atual e clientes em processos
+    # separados, para que os clientes não disputem o GIL com o servidor.
+    game_app.request_logger = logger
+    server = make_server('127.0.0.1', 0, game_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    ctx = multiprocessing.get_context('fork')
+    results = ctx.Queue()
+    procs = [ctx.Process(target=client_worker, args=(server.server_port, requests, results))
+        for _ in range(workers)]
+    start = time.perf_counter()
+    for p in procs:
+        p.start()
+    merged = sorted(l for _ in procs for l in results.get())
+    elapsed = time.perf_counter() - start
+    for p in procs:
+        p.join()
+    server.shutdown()
+    logger.close()
+
+    pct = {p: merged[int(len(merged) * p / 100) - 1] * 1000 for p in (50, 95, 99)}
+    return workers * requests / elapsed, pct
+
+def main():
+    parser = argparse.ArgumentParser(description='Latência de / com log síncrono vs assíncrono')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--write-delay-us', type=int, default=200)
+    parser.add_argument('--format', choices=sorted(FORMATTERS), default='text')
+    args = parser.parse_args()
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    delay = args.write_delay_us / 1e6
+
+    print("=" * 60)
+    print(f"📝 BENCHMARK DE LOG - stdout com {args.write_delay_us}µs por write")
+    print("=" * 60)
+
+    for name, logger in (
+        ('print síncrono (antigo)', SyncLogger(SlowStream(delay), args.format)),
+        ('RequestLogger assíncrono', RequestLogger(SlowStream(delay), args.format))
+    ):
+        throughput, pct = run(logger, args.workers, args.requests)
+        print(f"📊 {name}")
+        print(f"   {throughput:,.0f} req/s | p50 {pct[50]:.2f} ms | p95 {pct[95]:.2f} ms | "
+            f"p99 {pct[99]:.2f} ms | linhas: {logger.stream.lines:,} | descartados: {logger.dropped:,}")
+
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
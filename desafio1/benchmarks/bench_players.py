@@ -0,0 +1,83 @@
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server'))
+
+from players import PlayerTable
+
+def player_ids(count):
+    # IPs distintos, como os clientes reais identificados por remote_addr
+    return [f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}" for i in range(count)]
+
+class DictPlayers:
+    # Abordagem ingênua para comparação: um dict por jogador
+    def __init__(self):
+        self.players = {}
+
+    def add_xp(self, player_id, xp_gained):
+        player = self.players.get(player_id)
+        if player is None:
+            player = self.players[player_id] = {'xp': 0, 'level': 1, 'requests': 0}
+        player['xp'] += xp_gained
+        player['level'] = player['xp'] // 100 + 1
+        player['requests'] += 1
+        return player['xp'], player['requests']
+
+    def get(self, player_id):
+        player = self.players.get(player_id)
+        return None if player is None else (player['xp'], player['requests'])
+
+def measure_memory(factory, ids):
+    gc.collect()
+    tracemalloc.start()
+    table = factory()
+    start = time.perf_counter()
+    for player_id in ids:
+        table.add_xp(player_id, 20)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return table, current, elapsed
+
+def measure_lookups(table, ids, samples):
+    latencies = []
+    get = table.get
+    for player_id in random.sample(ids, samples):
+        start = time.perf_counter_ns()
+        get(player_id)
+        latencies.append(time.perf_counter_ns() - start)
+    latencies.sort()
+    return {p: latencies[int(len(latencies) * p / 100) - 1] for p in (50, 95, 99)}
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de memória e latência por jogador')
+    parser.add_argument('--players', type=int, default=1_000_000)
+    parser.add_argument('--lookups', type=int, default=100_000)
+    args = parser.parse_args()
+
+    ids = player_ids(args.players)
+
+    print("=" * 60)
+    print(f"👥 BENCHMARK DE JOGADORES - {args.players:,} clientes distintos")
+    print("=" * 60)
+
+    for name, factory in (('dict por jogador', DictPlayers), ('PlayerTable (arrays)', PlayerTable)):
+        table, memory, elapsed = measure_memory(factory, ids)
+        lookups = measure_lookups(table, ids, min(args.lookups, args.players))
+        print(f"📦 {name}")
+        print(f"   Memória: {memory / 2**20:,.1f} MiB ({memory / args.players:,.0f} bytes/jogador, "
+            "sem contar as strings dos ids)")
+        print(f"   Inserção: {args.players / elapsed:,.0f} jogadores/s")
+        print(f"   Lookup: p50 {lookups[50]:,} ns | p95 {lookups[95]:,} ns | p99 {lookups[99]:,} ns")
+        del table
+        gc.collect()
+
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import os
+import socket
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server'))
+
+from flask import jsonify
+
+import app as game_app
+from responses import HOSTNAME, clock, json_response, orjson
+
+XP, REQUESTS = 12345, 678
+
+def legacy_server_info():
+    return {
+        'hostname': socket.gethostname(),
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+def cached_server_info():
+    return {
+        'hostname': HOSTNAME,
+        'timestamp': clock.now()
+    }
+
+def home_body(server_info):
+    level = game_app.calculate_level(XP)
+    return {
+        'game_status': '🎮 RPG das Requisições HTTP',
+        'player_stats': {
+            'level': level,
+            'title': game_app.get_title(level),
+            'total_xp': XP,
+            'xp_progress': f"{XP % 100}/100 XP",
+            'requests_made': REQUESTS
+        },
+        'client_stats': game_app.build_player_stats('10.0.0.1', XP, REQUESTS),
+        'this_request': {
+            'xp_gained': 25,
+            'critical_hit': False,
+            'level_up': False,
+            'message': game_app.get_motivational_message(level)
+        },
+        'server_info': dict(server_info(), client_ip='10.0.0.1')
+    }
+
+def health_body(server_info):
+    return {
+        'status': 'healthy',
+        'game_mode': 'active',
+        'logs_dropped': 0,
+        'timestamp': server_info()['timestamp']
+    }
+
+def stats_body(server_info):
+    level = game_app.calculate_level(XP)
+    xp_progress = XP % 100
+    return {
+        'game_title': '🎮 RPG das Requisições HTTP - Estatísticas',
+        'player': {
+            'level': level,
+            'title': game_app.get_title(level),
+            'total_xp': XP,
+            'xp_to_next_level': 100 - xp_progress,
+            'progress_bar': '█' * (xp_progress // 10) + '░' * (10 - xp_progress // 10),
+            'total_requests': REQUESTS,
+            'average_xp_per_request': round(XP / REQUESTS, 2)
+        },
+        'server': server_info()
+    }
+
+def cpu_per_call(func, iterations):
+    start = time.process_time()
+    for _ in range(iterations):
+        func()
+    return (time.process_time() - start) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description='CPU por resposta: montagem antiga vs camada de respostas')
+    parser.add_argument('--iterations', type=int, default=50_000)
+    args = parser.parse_args()
+
+    encoder = 'orjson' if orjson is not None else 'json (stdlib)'
+
+    print("=" * 60)
+    print(f"⏱️  BENCHMARK DE RESPOSTAS - CPU por requisição (encoder: {encoder})")
+    print("=" * 60)
+
+    with game_app.app.app_context():
+        for name, body in (('/', home_body), ('/health', health_body), ('/stats', stats_body)):
+            before = cpu_per_call(lambda: jsonify(body(legacy_server_info)), args.iterations)
+            after = cpu_per_call(lambda: json_response(body(cached_server_info)), args.iterations)
+            print(f"📊 {name:<8} antes: {before:6.1f} µs | depois: {after:6.1f} µs | {before / after:.1f}x")
+
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server'))
+
+from state import MemoryStateStore, SharedStateStore
+
+XP_PER_REQUEST = 20
+
+class UnlockedGlobals:
+    # Reproduz o código antigo: leitura-modificação-escrita sem lock.
+    def __init__(self):
+        self.xp = 0
+        self.requests = 0
+
+    def add_xp(self, xp_gained):
+        requests = self.requests
+        xp = self.xp
+        time.sleep(0)
+        self.requests = requests + 1
+        self.xp = xp + xp_gained
+        return self.xp, self.requests
+
+    def snapshot(self):
+        return self.xp, self.requests
+
+def hammer(store, iterations):
+    for _ in range(iterations):
+        store.add_xp(XP_PER_REQUEST)
+
+def run_threads(store, workers, iterations):
+    threads = [threading.Thread(target=hammer, args=(store, iterations)) for _ in range(workers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+def process_worker(path, threads, iterations):
+    store = SharedStateStore(path)
+    run_threads(store, threads, iterations)
+    store.close()
+
+def run_processes(path, processes, threads, iterations):
+    ctx = multiprocessing.get_context('fork')
+    procs = [ctx.Process(target=process_worker, args=(path, threads, iterations)) for _ in range(processes)]
+    start = time.perf_counter()
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    return time.perf_counter() - start
+
+def run_http(workers, iterations):
+    import app as game_app
+    game_app.request_logger.stream = open(os.devnull, 'w')
+    client = game_app.app.test_client()
+    gained = [0] * workers
+
+    def player(index):
+        local = game_app.app.test_client()
+        for _ in range(iterations):
+            gained[index] += local.get('/').get_json()['this_request']['xp_gained']
+
+    threads = [threading.Thread(target=player, args=(i,)) for i in range(workers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    player_stats = client.get('/stats').get_json()['player']
+    return elapsed, sum(gained), player_stats['total_xp'], player_stats['total_requests']
+
+def report(name, elapsed, expected_requests, xp, requests):
+    expected_xp = expected_requests * XP_PER_REQUEST
+    lost = expected_requests - requests
+    status = "✅" if lost == 0 and xp == expected_xp else "❌"
+    print(f"{status} {name:<32} {expected_requests / elapsed:>12,.0f} req/s | "
+        f"XP {xp:,}/{expected_xp:,} | requisições perdidas: {lost:,}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de concorrência do estado do jogador')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--iterations', type=int, default=20000)
+    parser.add_argument('--http-iterations', type=int, default=1000)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🧪 BENCHMARK DE ESTADO CONCORRENTE - RPG das Requisições")
+    print("=" * 60)
+
+    total = args.threads * args.iterations
+
+    store = UnlockedGlobals()
+    elapsed = run_threads(store, args.threads, args.iterations)
+    report('globais sem lock (antigo)', elapsed, total, *store.snapshot())
+
+    store = MemoryStateStore()
+    elapsed = run_threads(store, args.threads, args.iterations)
+    report('memory (threads)', elapsed, total, *store.snapshot())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'state.bin')
+        elapsed = run_threads(SharedStateStore(path), args.threads, args.iterations)
+        report('shared (threads)', elapsed, total, *SharedStateStore(path).snapshot())
+
+        path = os.path.join(tmp, 'state-mp.bin')
+        elapsed = run_processes(path, args.processes, args.threads, args.iterations)
+        report(f'shared ({args.processes} processos x {args.threads} threads)', elapsed,
+            args.processes * total, *SharedStateStore(path).snapshot())
+
+    elapsed, gained, xp, requests = run_http(args.threads, args.http_iterations)
+    total = args.threads * args.http_iterations
+    lost = total - requests
+    status = "✅" if lost == 0 and xp == gained else "❌"
+    print(f"{status} {'HTTP / (Flask test client)':<32} {total / elapsed:>12,.0f} req/s | "
+        f"XP {xp:,}/{gained:,} | requisições perdidas: {lost:,}")
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server'))
+
+from titles import DEFAULT_TITLES, TitleLadder
+
+def legacy_get_title(level, titles=None):
+    # Caminho antigo: recria o dict e ordena as chaves a cada chamada
+    titles = dict(titles or DEFAULT_TITLES)
+    for req_level in sorted(titles.keys(), reverse=True):
+        if level >= req_level:
+            return titles[req_level]
+    return titles[1]
+
+def generated_tiers(count):
+    tiers = {1: DEFAULT_TITLES[1]}
+    for i in range(1, count):
+        tiers[i * 7] = f"Título #{i}"
+    return tiers
+
+def timed(label, func, calls):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<28} {elapsed / calls * 1e9:>10,.0f} ns/título")
+    return elapsed
+
+def run(name, tiers, levels):
+    ladder = TitleLadder(tiers)
+    mismatches = sum(1 for level in levels if ladder.resolve(level) != legacy_get_title(level, tiers))
+    print(f"📜 {name} ({len(tiers)} degraus) | divergências: {mismatches}")
+
+    calls = len(levels)
+    legacy = timed('get_title antigo', lambda: [legacy_get_title(level, tiers) for level in levels], calls)
+    single = timed('TitleLadder.resolve', lambda: [ladder.resolve(level) for level in levels], calls)
+    batch = timed('TitleLadder.resolve_many', lambda: ladder.resolve_many(levels), calls)
+    print(f"   Speedup: {legacy / single:,.1f}x (resolve) | {legacy / batch:,.1f}x (resolve_many)")
+    print()
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark de resolução de títulos')
+    parser.add_argument('--calls', type=int, default=100_000)
+    parser.add_argument('--tiers', type=int, default=500)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("👑 BENCHMARK DE TÍTULOS")
+    print("=" * 60)
+
+    levels = [random.randint(1, 150) for _ in range(args.calls)]
+    run('Títulos padrão', DEFAULT_TITLES, levels)
+
+    levels = [random.randint(1, args.tiers * 8) for _ in range(args.calls // 10)]
+    run('Escada gerada', generated_tiers(args.tiers), levels)
+
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server'))
+
+from wal import WriteAheadLog, encode_event
+
+def bench_append(directory, mode, threads, events):
+    wal = WriteAheadLog(directory, mode)
+
+    def worker(index):
+        player_id = f"10.0.0.{index}"
+        for _ in range(events):
+            wal.append(player_id, 20)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    wal.close()
+
+    total = threads * events
+    recovery = WriteAheadLog(directory, mode).recover()
+    return total / elapsed, elapsed / total * 1e6, cpu / total * 1e6, recovery.requests == total
+
+def write_segments(directory, events, players, segments):
+    per_segment = events // segments
+    ids = [f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}" for i in range(players)]
+    encoded = {player_id: encode_event(player_id, 20) for player_id in ids[:1000]}
+    for segment in range(segments):
+        path = os.path.join(directory, f"wal-{segment:020d}-0.log")
+        with open(path, 'wb') as f:
+            chunk = []
+            for _ in range(per_segment):
+                player_id = ids[random.randrange(players)]
+                chunk.append(encoded.get(player_id) or encode_event(player_id, 20))
+                if len(chunk) >= 100_000:
+                    f.write(b''.join(chunk))
+                    chunk = []
+            f.write(b''.join(chunk))
+    return per_segment * segments
+
+def main():
+    parser = argparse.ArgumentParser(description='Custo do WAL por requisição e tempo de replay na inicialização')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--events', type=int, default=5000, help='eventos por thread no teste de append')
+    parser.add_argument('--replay-events', type=int, default=2_000_000)
+    parser.add_argument('--players', type=int, default=10_000)
+    parser.add_argument('--segments', type=int, default=4)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📜 BENCHMARK DO WRITE-AHEAD LOG")
+    print("=" * 60)
+
+    for mode, events in (('async', args.events), ('group', args.events), ('always', max(args.events // 10, 1))):
+        with tempfile.TemporaryDirectory() as tmp:
+            throughput, wall, cpu, complete = bench_append(tmp, mode, args.threads, events)
+            status = "✅" if complete else "❌"
+            print(f"{status} {mode:<7} {throughput:>10,.0f} eventos/s | {wall:8.1f} µs/evento (parede) | "
+                f"{cpu:6.1f} µs/evento (CPU)")
+
+    print()
+    with tempfile.TemporaryDirectory() as tmp:
+        total = write_segments(tmp, args.replay_events, args.players, args.segments)
+        size = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp))
+        print(f"🗂️  {total:,} eventos em {args.segments} segmentos ({size / 2**20:,.1f} MiB)")
+
+        recovery = WriteAheadLog(tmp, 'async').recover()
+        print(f"🔄 Replay + compactação: {recovery.elapsed:.2f}s "
+            f"({recovery.events / recovery.elapsed:,.0f} eventos/s)")
+
+        snapshot_size = os.path.getsize(os.path.join(tmp, 'snapshot.bin'))
+        recovery = WriteAheadLog(tmp, 'async').recover()
+        print(f"📸 Inicialização a partir do snapshot ({snapshot_size / 2**20:,.1f} MiB): "
+            f"{recovery.elapsed:.3f}s | XP total: {recovery.xp:,}")
+
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
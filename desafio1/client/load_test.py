@@ -0,0 +1,364 @@
+import argparse
+import http.client
+import json
+import math
+import os
+import threading
+import time
+from array import array
+from urllib.parse import urlsplit
+
+SERVER_URL = os.environ.get('SERVER_URL', 'http://web-server:8080')
+# Janela de números de requisição conferidos contra duplicatas
+REQUEST_WINDOW = int(os.environ.get('REQUEST_WINDOW', 65536))
+
+class Histogram:
+    # Buckets logarítmicos (~2% de precisão) em vez da lista de latências,
+    # para rodar indefinidamente com memória constante.
+    GROWTH = math.log(1.02)
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        micros = max(seconds * 1e6, 1.0)
+        bucket = int(math.log(micros) / self.GROWTH)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other):
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p):
+        if not self.total:
+            return 0.0
+        target = math.ceil(self.total * p / 100)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                # Borda superior do bucket, sem passar do máximo observado
+                return min(math.exp((bucket + 1) * self.GROWTH) / 1e6, self.max)
+        return self.max
+
+    def bars(self, width=40, rows=12):
+        if not self.total:
+            return []
+        low = self.percentile(0.1)
+        high = max(self.max, low * 1.01)
+        edges = [low * (high / low) ** (i / rows) for i in range(rows + 1)]
+        counts = [0] * rows
+        for bucket, count in self.counts.items():
+            value = math.exp((bucket + 0.5) * self.GROWTH) / 1e6
+            index = min(max(int(rows * math.log(value / low) / math.log(high / low)), 0), rows - 1)
+            counts[index] += count
+        peak = max(counts)
+        return [
+            f"   {edges[i] * 1000:9.2f} ms | {'█' * round(width * counts[i] / peak):<{width}} {counts[i]:,}"
+            for i in range(rows)
+        ]
+
+class RequestWindow:
+    # Detecta números de requisição repetidos só entre os últimos `size`, com
+    # memória fixa: cada número ocupa a posição n % size de um array circular.
+    def __init__(self, size=REQUEST_WINDOW):
+        self.slots = array('q', [-1]) * size
+        self.highest = -1
+
+    def seen(self, number):
+        size = len(self.slots)
+        if number <= self.highest - size:
+            # Velho demais para a janela: não dá para afirmar nada
+            return False
+        slot = number % size
+        if self.slots[slot] == number:
+            return True
+        self.slots[slot] = number
+        self.highest = max(self.highest, number)
+        return False
+
+class EndpointStats:
+    def __init__(self):
+        self.histogram = Histogram()
+        self.errors = 0
+
+class Results:
+    def __init__(self, endpoints):
+        self.lock = threading.Lock()
+        self.endpoints = {endpoint: EndpointStats() for endpoint in endpoints}
+        self.violations = []
+        self.xp_gained = 0
+        self.requests_seen = RequestWindow()
+        self.duplicated_requests = 0
+
+    def record(self, endpoint, latency, ok):
+        with self.lock:
+            stats = self.endpoints[endpoint]
+            if ok:
+                stats.histogram.record(latency)
+            else:
+                stats.errors += 1
+
+    def violation(self, message):
+        with self.lock:
+            if len(self.violations) < 100:
+                self.violations.append(message)
+
+def check_player(player, violations, where):
+    level = player['level']
+    xp = player['total_xp']
+    if level != xp // 100 + 1:
+        violations.append(f"{where}: nível {level} incompatível com {xp} XP")
+
+def check_home(body, results):
+    violations = []
+    player = body['player_stats']
+    check_player(player, violations, '/')
+    if player['xp_progress'] != f"{player['total_xp'] - (player['level'] - 1) * 100}/100 XP":
+        violations.append(f"/: xp_progress {player['xp_progress']} incompatível com {player['total_xp']} XP")
+
+    this_request = body['this_request']
+    xp_gained = this_request['xp_gained']
+    low, high = (30, 60) if this_request['critical_hit'] else (15, 30)
+    if not low <= xp_gained <= high:
+        violations.append(f"/: {xp_gained} XP fora da faixa {low}-{high}")
+
+    with results.lock:
+        results.xp_gained += xp_gained
+        request_number = player['requests_made']
+        if results.requests_seen.seen(request_number):
+            results.duplicated_requests += 1
+            violations.append(f"/: requisição #{request_number} devolvida duas vezes (incremento perdido)")
+        for message in violations:
+            if len(results.violations) < 100:
+                results.violations.append(message)
+
+def check_stats(body, results):
+    violations = []
+    player = body['player']
+    check_player(player, violations, '/stats')
+    progress = player['total_xp'] - (player['level'] - 1) * 100
+    if player['xp_to_next_level'] != 100 - progress:
+        violations.append(f"/stats: xp_to_next_level {player['xp_to_next_level']} incompatível com {player['total_xp']} XP")
+    for message in violations:
+        results.violation(message)
+
+CHECKS = {
+    '/': check_home,
+    '/stats': check_stats
+}
+
+class Worker(threading.Thread):
+    def __init__(self, index, args, results, schedule):
+        super().__init__(name=f"player-{index}", daemon=True)
+        self.index = index
+        self.args = args
+        self.results = results
+        self.schedule = schedule
+        url = urlsplit(args.url)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.headers = {'Connection': 'keep-alive'}
+        if args.player_prefix:
+            self.headers['X-Player-Id'] = f"{args.player_prefix}-{index}"
+        self.conn = None
+
+    def request(self, endpoint):
+        # Uma conexão keep-alive por worker, refeita só em caso de erro
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.args.timeout)
+        try:
+            self.conn.request('GET', endpoint, headers=self.headers)
+            response = self.conn.getresponse()
+            data = response.read()
+            if response.will_close:
+                self.conn.close()
+                self.conn = None
+            return response.status, data
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = None
+            raise
+
+    def run(self):
+        endpoints = self.args.endpoints
+        for slot, intended in self.schedule.slots(self.index):
+            endpoint = endpoints[slot % len(endpoints)]
+            now = time.perf_counter()
+            if intended is not None and intended > now:
+                time.sleep(intended - now)
+            # Modelo aberto: a latência conta a partir do horário planejado,
+            # então o atraso de um servidor lento não some da medição.
+            start = intended if intended is not None else time.perf_counter()
+            try:
+                status, data = self.request(endpoint)
+                latency = time.perf_counter() - start
+                ok = status == 200
+                # Corpo sem um campo esperado (KeyError nos CHECKS) conta como falha,
+                # em vez de derrubar a thread do worker
+                if ok and endpoint in CHECKS:
+                    CHECKS[endpoint](json.loads(data), self.results)
+                if ok and self.args.verbose:
+                    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] 📤 {self.name} {endpoint} "
+                        f"→ {status} em {latency * 1000:.1f} ms")
+            except (OSError, http.client.HTTPException, ValueError, KeyError) as e:
+                latency = time.perf_counter() - start
+                ok = False
+                if self.args.verbose:
+                    print(f"❌ {self.name} {endpoint}: {e}")
+            self.results.record(endpoint, latency, ok)
+
+class Schedule:
+    def __init__(self, args):
+        self.concurrency = args.concurrency
+        self.rate = args.rate
+        self.requests = args.requests
+        self.deadline = time.perf_counter() + args.duration if args.duration else None
+        self.start = time.perf_counter()
+        self.stopped = threading.Event()
+
+    def slots(self, index):
+        # Cada worker fica com os slots index, index + C, index + 2C...
+        slot = index
+        while not self.stopped.is_set():
+            if self.requests and slot >= self.requests:
+                return
+            intended = self.start + slot / self.rate if self.rate else None
+            if self.deadline is not None and (intended or time.perf_counter()) >= self.deadline:
+                return
+            yield slot, intended
+            slot += self.concurrency
+
+def wait_for_server(args):
+    print("⏳ Aguardando servidor ficar disponível...")
+    url = urlsplit(args.url)
+    while True:
+        try:
+            conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=2)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                print("✅ Servidor está disponível!")
+                return
+        except (OSError, http.client.HTTPException):
+            pass
+        print("   Tentando conectar ao servidor...")
+        time.sleep(2)
+
+def fetch_stats(args):
+    url = urlsplit(args.url)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=args.timeout)
+    conn.request('GET', '/stats')
+    return json.loads(conn.getresponse().read())['player']
+
+def report(results, elapsed, final=False):
+    with results.lock:
+        combined = Histogram()
+        print("=" * 60)
+        print(f"📊 RELATÓRIO {'FINAL' if final else 'PARCIAL'} - {elapsed:.1f}s")
+        print("=" * 60)
+        for endpoint, stats in results.endpoints.items():
+            h = stats.histogram
+            combined.merge(h)
+            if not h.total and not stats.errors:
+                continue
+            print(f"🎯 {endpoint:<8} {h.total:>9,} ok | {stats.errors:>5,} erros | "
+                f"{h.total / elapsed:>9,.1f} req/s")
+            print(f"   p50 {h.percentile(50) * 1000:8.2f} ms | p95 {h.percentile(95) * 1000:8.2f} ms | "
+                f"p99 {h.percentile(99) * 1000:8.2f} ms | max {h.max * 1000:8.2f} ms")
+        print(f"🚀 Throughput total: {combined.total / elapsed:,.1f} req/s")
+        if final:
+            print("📈 Histograma de latência (todas as rotas):")
+            for line in combined.bars():
+                print(line)
+        violations = list(results.violations)
+
+    if violations:
+        print(f"❌ {len(violations)} violações de invariantes:")
+        for message in violations[:10]:
+            print(f"   • {message}")
+    else:
+        print("✅ Nenhuma violação de invariantes")
+    return violations
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Gerador de carga do RPG das Requisições HTTP')
+    parser.add_argument('--url', default=SERVER_URL)
+    parser.add_argument('--endpoints', default='/', type=lambda value: value.split(','),
+        help='rotas separadas por vírgula, usadas em rodízio (ex.: /,/stats,/health)')
+    parser.add_argument('--concurrency', type=int, default=8, help='workers / conexões keep-alive')
+    parser.add_argument('--rate', type=float, default=0,
+        help='req/s total (modelo aberto); 0 = loop fechado o mais rápido possível')
+    parser.add_argument('--duration', type=float, default=10, help='segundos; 0 = sem limite')
+    parser.add_argument('--requests', type=int, default=0, help='total de requisições; 0 = sem limite')
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--report-interval', type=float, default=0, help='segundos entre relatórios parciais')
+    parser.add_argument('--player-prefix', default='', help='envia X-Player-Id <prefixo>-<worker>')
+    parser.add_argument('--no-wait', action='store_true', help='não espera o /health antes de começar')
+    parser.add_argument('--verbose', action='store_true', help='imprime cada requisição')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    results = Results(args.endpoints)
+
+    print("🔄 Gerador de carga iniciando...")
+    print(f"📡 Servidor alvo: {args.url} | rotas: {', '.join(args.endpoints)}")
+    mode = f"modelo aberto a {args.rate:g} req/s" if args.rate else "loop fechado"
+    print(f"⚙️  {args.concurrency} workers | {mode} | duração: {args.duration or '∞'}s")
+    if not args.no_wait:
+        wait_for_server(args)
+
+    try:
+        before = fetch_stats(args)
+    except (OSError, http.client.HTTPException, ValueError, KeyError):
+        before = None
+
+    schedule = Schedule(args)
+    workers = [Worker(i, args, results, schedule) for i in range(args.concurrency)]
+    for worker in workers:
+        worker.start()
+
+    try:
+        next_report = time.perf_counter() + args.report_interval if args.report_interval else None
+        while any(worker.is_alive() for worker in workers):
+            time.sleep(0.1)
+            if next_report is not None and time.perf_counter() >= next_report:
+                report(results, time.perf_counter() - schedule.start)
+                next_report += args.report_interval
+    except KeyboardInterrupt:
+        print("\n👋 Interrompido pelo usuário")
+        schedule.stopped.set()
+        for worker in workers:
+            worker.join(args.timeout)
+
+    elapsed = time.perf_counter() - schedule.start
+    violations = report(results, elapsed, final=True)
+
+    if before is not None and '/' in args.endpoints:
+        after = fetch_stats(args)
+        home = results.endpoints['/'].histogram.total
+        delta_xp = after['total_xp'] - before['total_xp']
+        delta_requests = after['total_requests'] - before['total_requests']
+        # Outros clientes podem estar jogando ao mesmo tempo, então o
+        # servidor precisa ter contado pelo menos o que este cliente viu.
+        if delta_requests < home or delta_xp < results.xp_gained:
+            violations.append("stats")
+            print(f"❌ /stats contou {delta_requests:,} requisições / {delta_xp:,} XP, "
+                f"mas o cliente recebeu {home:,} / {results.xp_gained:,}")
+        else:
+            print(f"✅ /stats confere: +{delta_requests:,} requisições, +{delta_xp:,} XP "
+                f"(cliente: {home:,} / {results.xp_gained:,})")
+
+    return 1 if violations else 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,36 +1,60 @@
-from flask import Flask, jsonify, request
-from datetime import datetime
-import socket
+from flask import Flask, request
 import random
+import signal
+import sys
+from state import create_state_store
+from players import PlayerTable
+from titles import load_title_ladder
+from request_log import RequestLogger
+from responses import HOSTNAME, clock, json_response
+from wal import create_write_ahead_log
 
 app = Flask(__name__)
 
-player_xp = 0
-player_level = 1
-request_count = 0
+state_store = create_state_store()
+players = PlayerTable()
+title_ladder = load_title_ladder()
+request_logger = RequestLogger()
+wal = create_write_ahead_log()
+
+if wal is not None:
+    recovery = wal.recover()
+    state_store.restore(recovery.xp, recovery.requests)
+    players.restore(recovery.players)
+    print(f"📜 WAL ({wal.mode}): {recovery.events:,} eventos reaplicados em {recovery.elapsed:.2f}s "
+        f"| XP total: {recovery.xp:,} | jogadores: {len(recovery.players):,}")
+
+MOTIVATIONAL_MESSAGES = (
+    "Continue assim, aventureiro! 💪",
+    "Você está ficando mais forte! 🚀",
+    "Excelente progresso! ⭐",
+    "Suas habilidades estão melhorando! 📈",
+    "O poder das requisições flui em você! ✨",
+    "Imparável! Continue a jornada! 🎯",
+    "Cada requisição te leva mais longe! 🌟",
+    "A rede reconhece seu poder! ⚡"
+)
+PROGRESS_BARS = tuple('█' * filled + '░' * (10 - filled) for filled in range(11))
+
+def get_player_id():
+    return request.headers.get('X-Player-Id') or request.remote_addr
+
+def build_player_stats(player_id, xp, requests):
+    level = calculate_level(xp)
+    return {
+        'player': player_id,
+        'level': level,
+        'title': get_title(level),
+        'total_xp': xp,
+        'xp_progress': f"{xp - ((level - 1) * 100)}/100 XP",
+        'requests_made': requests
+    }
 
 def calculate_level(xp):
     return (xp // 100) + 1
 
 def get_title(level):
-    titles = {
-        1: "🌱 Novato das Requisições",
-        5: "⚔️ Guerreiro HTTP",
-        10: "🛡️ Guardião dos Endpoints",
-        15: "🔥 Mestre do Curl",
-        20: "⚡ Senhor das APIs",
-        25: "🌟 Lendário Docker",
-        30: "👑 Rei das Requisições",
-        40: "🏆 Campeão dos Containers",
-        50: "💎 Deus das Conexões",
-        75: "🌌 Transcendente Digital",
-        100: "∞ Entidade Cósmica da Rede"
-    }
-    
-    for req_level in sorted(titles.keys(), reverse=True):
-        if level >= req_level:
-            return titles[req_level]
-    return titles[1]
+    return title_ladder.resolve(level)
 
 def get_xp_reward():
     base_xp = random.randint(15, 30)
@@ -41,33 +65,23 @@ def get_xp_reward():
     return base_xp, False
 
 def get_motivational_message(level):
-    messages = [
-        "Continue assim, aventureiro! 💪",
-        "Você está ficando mais forte! 🚀",
-        "Excelente progresso! ⭐",
-        "Suas habilidades estão melhorando! 📈",
-        "O poder das requisições flui em você! ✨",
-        "Imparável! Continue a jornada! 🎯",
-        "Cada requisição te leva mais longe! 🌟",
-        "A rede reconhece seu poder! ⚡"
-    ]
-    return random.choice(messages)
+    return random.choice(MOTIVATIONAL_MESSAGES)
 
 @app.route('/')
 def home():
-    global player_xp, player_level, request_count
-    request_count += 1
-    
     xp_gained, is_critical = get_xp_reward()
-    old_level = player_level
-    player_xp += xp_gained
+    player_xp, request_count = state_store.add_xp(xp_gained)
+    old_level = calculate_level(player_xp - xp_gained)
     player_level = calculate_level(player_xp)
     
     leveled_up = player_level > old_level
     
     client_ip = request.remote_addr
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    hostname = socket.gethostname()
+    player_id = get_player_id()
+    client_xp, client_requests = players.add_xp(player_id, xp_gained)
+    if wal is not None:
+        wal.append(player_id, xp_gained)
+    timestamp = clock.now()
     title = get_title(player_level)
     
     xp_progress = player_xp - ((player_level - 1) * 100)
@@ -81,6 +95,7 @@ def home():
             'xp_progress': f"{xp_progress}/100 XP",
             'requests_made': request_count
         },
+        'client_stats': build_player_stats(player_id, client_xp, client_requests),
         'this_request': {
             'xp_gained': xp_gained,
             'critical_hit': is_critical,
@@ -88,58 +103,85 @@ def home():
             'message': get_motivational_message(player_level)
         },
         'server_info': {
-            'hostname': hostname,
+            'hostname': HOSTNAME,
             'client_ip': client_ip,
             'timestamp': timestamp
         }
     }
 
-    log_msg = f"[{timestamp}] 🎮 Requisição #{request_count} de {client_ip}"
-    if is_critical:
-        log_msg += f" | 💥 CRITICAL HIT! +{xp_gained} XP"
-    else:
-        log_msg += f" | ⚔️ +{xp_gained} XP"
+    request_logger.log({
+        'timestamp': timestamp,
+        'request': request_count,
+        'client_ip': client_ip,
+        'player': player_id,
+        'xp_gained': xp_gained,
+        'critical': is_critical,
+        'leveled_up': leveled_up,
+        'old_level': old_level,
+        'level': player_level,
+        'title': title,
+        'xp_progress': xp_progress
+    })
     
-    if leveled_up:
-        log_msg += f" | 🎊 LEVEL UP! {old_level} → {player_level} | {title}"
-    else:
-        log_msg += f" | Level {player_level} ({xp_progress}/100 XP)"
-    
-    print(log_msg)
-    
-    return jsonify(response_data), 200
+    return json_response(response_data)
 
 @app.route('/health')
 def health():
-    return jsonify({
+    return json_response({
         'status': 'healthy',
         'game_mode': 'active',
-        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    }), 200
+        'logs_dropped': request_logger.dropped,
+        'timestamp': clock.now()
+    })
 
 @app.route('/stats')
 def stats():
+    player_xp, request_count = state_store.snapshot()
+    player_level = calculate_level(player_xp)
     title = get_title(player_level)
     xp_progress = player_xp - ((player_level - 1) * 100)
     
-    return jsonify({
+    return json_response({
         'game_title': '🎮 RPG das Requisições HTTP - Estatísticas',
         'player': {
             'level': player_level,
             'title': title,
             'total_xp': player_xp,
             'xp_to_next_level': 100 - xp_progress,
-            'progress_bar': '█' * (xp_progress // 10) + '░' * (10 - xp_progress // 10),
+            'progress_bar': PROGRESS_BARS[xp_progress // 10],
             'total_requests': request_count,
             'average_xp_per_request': round(player_xp / request_count, 2) if request_count > 0 else 0
         },
         'server': {
-            'hostname': socket.gethostname(),
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'hostname': HOSTNAME,
+            'timestamp': clock.now()
         }
-    }), 200
+    })
+
+@app.route('/stats/<player_id>')
+def player_stats(player_id):
+    entry = players.get(player_id)
+    if entry is None:
+        return json_response({'error': f'Jogador {player_id} não encontrado'}, 404)
+    
+    return json_response(build_player_stats(player_id, *entry))
+
+@app.route('/leaderboard')
+def leaderboard():
+    limit = request.args.get('limit', players.leaderboard.size, type=int)
+    limit = min(max(limit, 0), players.leaderboard.size)
+    
+    return json_response({
+        'total_players': len(players),
+        'leaderboard': [
+            {'rank': i + 1, 'player': player_id, 'level': calculate_level(xp), 'total_xp': xp}
+            for i, (xp, player_id) in enumerate(players.leaderboard.top(limit))
+        ]
+    })
 
 if __name__ == '__main__':
+    from serve import serve
+    
     print("=" * 60)
     print("🎮 RPG DAS REQUISIÇÕES HTTP - SERVIDOR DE JOGO INICIADO!")
     print("=" * 60)
@@ -147,8 +189,11 @@ if __name__ == '__main__':
     print("⚔️  Cada requisição ganha XP e aumenta seu nível")
     print("🏆 Conquiste títulos épicos conforme progride")
     print("💎 10% de chance de CRITICAL HIT (XP em dobro)!")
+    print(f"💾 Backend de estado: {type(state_store).__name__}")
+    print(f"👑 Títulos carregados: {len(title_ladder)}")
     print("=" * 60)
     print("🚀 Servidor rodando na porta 8080...")
     print("=" * 60)
     print()
-    app.run(host='0.0.0.0', port=8080, debug=False)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    serve(app, port=8080)
@@ -0,0 +1,102 @@
+import bisect
+import threading
+from array import array
+
+PLAYER_SHARDS = 16
+LEADERBOARD_SIZE = 10
+
+class PlayerShard:
+    # Colunas em arrays compactos (8 bytes por valor) em vez de um dict por
+    # jogador; o dict só guarda o índice da linha de cada jogador.
+    __slots__ = ('lock', 'index', 'xp', 'requests')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.index = {}
+        self.xp = array('q')
+        self.requests = array('q')
+
+class Leaderboard:
+    # O XP só cresce, então um jogador fora do top-N só volta a ele através
+    # de uma atualização própria: basta comparar com o último colocado.
+    def __init__(self, size=LEADERBOARD_SIZE):
+        self.size = size
+        self._lock = threading.Lock()
+        # (-xp, player_id) em ordem crescente = maior XP primeiro
+        self._entries = []
+        # XP do último colocado com o top-N cheio; só cresce, então ler sem
+        # lock no máximo manda uma escrita a mais para o caminho com lock
+        self._floor = None
+
+    def update(self, player_id, xp):
+        floor = self._floor
+        if floor is not None and xp <= floor:
+            return
+        with self._lock:
+            entries = self._entries
+            for i, (negative_xp, p) in enumerate(entries):
+                if p == player_id:
+                    if xp <= -negative_xp:
+                        return
+                    del entries[i]
+                    break
+            else:
+                if len(entries) == self.size and xp <= -entries[-1][0]:
+                    return
+            bisect.insort(entries, (-xp, player_id))
+            del entries[self.size:]
+            if len(entries) == self.size:
+                self._floor = -entries[-1][0]
+
+    def top(self, limit=None):
+        if limit is None:
+            limit = self.size
+        limit = min(max(limit, 0), self.size)
+        with self._lock:
+            return [(-negative_xp, player_id) for negative_xp, player_id in self._entries[:limit]]
+
+class PlayerTable:
+    def __init__(self, shards=PLAYER_SHARDS, leaderboard_size=LEADERBOARD_SIZE):
+        self._shards = [PlayerShard() for _ in range(shards)]
+        self.leaderboard = Leaderboard(leaderboard_size)
+
+    def _shard(self, player_id):
+        return self._shards[hash(player_id) % len(self._shards)]
+
+    def add_xp(self, player_id, xp_gained):
+        shard = self._shard(player_id)
+        with shard.lock:
+            row = shard.index.get(player_id)
+            if row is None:
+                row = shard.index[player_id] = len(shard.xp)
+                shard.xp.append(0)
+                shard.requests.append(0)
+            xp = shard.xp[row] = shard.xp[row] + xp_gained
+            requests = shard.requests[row] = shard.requests[row] + 1
+        self.leaderboard.update(player_id, xp)
+        return xp, requests
+
+    def restore(self, entries):
+        for player_id, (xp, requests) in entries.items():
+            shard = self._shard(player_id)
+            with shard.lock:
+                row = shard.index.get(player_id)
+                if row is None:
+                    shard.index[player_id] = len(shard.xp)
+                    shard.xp.append(xp)
+                    shard.requests.append(requests)
+                else:
+                    shard.xp[row] = xp
+                    shard.requests[row] = requests
+            self.leaderboard.update(player_id, xp)
+
+    def get(self, player_id):
+        shard = self._shard(player_id)
+        with shard.lock:
+            row = shard.index.get(player_id)
+            if row is None:
+                return None
+            return shard.xp[row], shard.requests[row]
+
+    def __len__(self):
+        return sum(len(shard.index) for shard in self._shards)
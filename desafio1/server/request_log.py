@@ -0,0 +1,108 @@
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+
+LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+LOG_BATCH_SIZE = int(os.environ.get('LOG_BATCH_SIZE', 256))
+LOG_FLUSH_INTERVAL = float(os.environ.get('LOG_FLUSH_INTERVAL', 0.1))
+
+_STOP = object()
+
+def format_text(record):
+    msg = f"[{record['timestamp']}] 🎮 Requisição #{record['request']} de {record['client_ip']}"
+    if record['critical']:
+        msg += f" | 💥 CRITICAL HIT! +{record['xp_gained']} XP"
+    else:
+        msg += f" | ⚔️ +{record['xp_gained']} XP"
+
+    if record['leveled_up']:
+        msg += f" | 🎊 LEVEL UP! {record['old_level']} → {record['level']} | {record['title']}"
+    else:
+        msg += f" | Level {record['level']} ({record['xp_progress']}/100 XP)"
+    return msg
+
+def format_json(record):
+    return json.dumps(record, ensure_ascii=False)
+
+FORMATTERS = {
+    'text': format_text,
+    'json': format_json
+}
+
+class RequestLogger:
+    # A thread da requisição só enfileira um dict; formatação e escrita
+    # acontecem em lotes numa thread de fundo. Com a fila cheia o registro é
+    # descartado (e contado) em vez de bloquear a requisição. Entre lotes
+    # incompletos a thread dorme flush_interval, acumulando o próximo lote
+    # em vez de acordar (e disputar o GIL) a cada requisição. A thread é
+    # criada no primeiro log de cada processo, já que não sobrevive ao fork
+    # dos workers do Gunicorn.
+    def __init__(self, stream=None, fmt=LOG_FORMAT, max_queue=LOG_QUEUE_SIZE, batch_size=LOG_BATCH_SIZE,
+            flush_interval=LOG_FLUSH_INTERVAL):
+        if fmt not in FORMATTERS:
+            raise ValueError(f"Formato de log desconhecido: {fmt}")
+        self.stream = stream
+        self.format = FORMATTERS[fmt]
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self.max_queue = max_queue
+        self._drop_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._pid = None
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self.max_queue)
+            self._closed = False
+            self._stopping = threading.Event()
+            self._thread = threading.Thread(target=self._run, name='request-logger', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+        atexit.register(self.close)
+
+    def log(self, record):
+        if self._pid != os.getpid():
+            self._ensure_started()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(record is _STOP for record in batch)
+            if stop:
+                batch = batch[:batch.index(_STOP)]
+            if batch:
+                stream = self.stream or sys.stdout
+                stream.write(''.join(self.format(record) + '\n' for record in batch))
+                stream.flush()
+                self.written += len(batch)
+            if stop:
+                return
+            if len(batch) < self.batch_size:
+                self._stopping.wait(self.flush_interval)
+
+    def close(self, timeout=5):
+        if self._pid != os.getpid() or self._closed:
+            return
+        self._closed = True
+        self._stopping.set()
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
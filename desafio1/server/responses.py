@@ -0,0 +1,42 @@
+import json
+import socket
+import time
+from datetime import datetime
+from flask import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+HOSTNAME = socket.gethostname()
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+class SecondClock:
+    # O timestamp das respostas tem resolução de segundos, então só é
+    # formatado de novo quando o segundo muda. A tupla é trocada de uma vez,
+    # então threads concorrentes nunca leem segundo e texto desencontrados.
+    def __init__(self):
+        self._cache = (None, None)
+
+    def now(self):
+        second = int(time.time())
+        cached_second, formatted = self._cache
+        if cached_second != second:
+            formatted = datetime.fromtimestamp(second).strftime(TIMESTAMP_FORMAT)
+            self._cache = (second, formatted)
+        return formatted
+
+clock = SecondClock()
+
+if orjson is not None:
+    def dumps(data):
+        return orjson.dumps(data)
+else:
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+    def dumps(data):
+        return _encoder.encode(data).encode('utf-8')
+
+def json_response(data, status=200):
+    return Response(dumps(data), status=status, mimetype='application/json')
@@ -0,0 +1,106 @@
+import fcntl
+import mmap
+import os
+import struct
+import threading
+
+STATE_BACKEND = os.environ.get('STATE_BACKEND', 'memory')
+STATE_FILE = os.environ.get('STATE_FILE', '/tmp/rpg_state.bin')
+
+class MemoryStateStore:
+    def __init__(self, xp=0, requests=0):
+        self._lock = threading.Lock()
+        self._xp = xp
+        self._requests = requests
+
+    def add_xp(self, xp_gained):
+        with self._lock:
+            self._xp += xp_gained
+            self._requests += 1
+            return self._xp, self._requests
+
+    def snapshot(self):
+        with self._lock:
+            return self._xp, self._requests
+
+    def restore(self, xp, requests):
+        with self._lock:
+            if self._xp == 0 and self._requests == 0:
+                self._xp = xp
+                self._requests = requests
+
+    def close(self):
+        pass
+
+class SharedStateStore:
+    # Contadores num arquivo mapeado em memória (ex.: /dev/shm) protegido por
+    # flock, para que vários workers/processos compartilhem o mesmo jogador.
+    # O flock vale por descritor aberto, então o arquivo é reaberto em cada
+    # processo depois do fork; o lock de thread serializa as threads locais.
+    _LAYOUT = struct.Struct('<qq')
+
+    def __init__(self, path=STATE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pid = None
+        self._open()
+
+    def _open(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size < self._LAYOUT.size:
+                os.ftruncate(self._fd, self._LAYOUT.size)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._fd, self._LAYOUT.size)
+        self._pid = os.getpid()
+
+    def _ensure_open(self):
+        if self._pid != os.getpid():
+            self._open()
+
+    def add_xp(self, xp_gained):
+        with self._lock:
+            self._ensure_open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                xp, requests = self._LAYOUT.unpack_from(self._map)
+                xp += xp_gained
+                requests += 1
+                self._LAYOUT.pack_into(self._map, 0, xp, requests)
+                return xp, requests
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def snapshot(self):
+        with self._lock:
+            self._ensure_open()
+            fcntl.flock(self._fd, fcntl.LOCK_SH)
+            try:
+                return self._LAYOUT.unpack_from(self._map)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def restore(self, xp, requests):
+        # Só o primeiro worker a subir restaura; os demais já encontram o
+        # arquivo compartilhado preenchido.
+        with self._lock:
+            self._ensure_open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                if self._LAYOUT.unpack_from(self._map) == (0, 0):
+                    self._LAYOUT.pack_into(self._map, 0, xp, requests)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+def create_state_store(backend=STATE_BACKEND, path=STATE_FILE):
+    if backend == 'memory':
+        return MemoryStateStore()
+    if backend == 'shared':
+        return SharedStateStore(path)
+    raise ValueError(f"Backend de estado desconhecido: {backend}")
@@ -0,0 +1,64 @@
+import json
+import os
+from bisect import bisect_right
+
+TITLES_FILE = os.environ.get('TITLES_FILE')
+DIRECT_TABLE_LIMIT = 4096
+
+DEFAULT_TITLES = {
+    1: "🌱 Novato das Requisições",
+    5: "⚔️ Guerreiro HTTP",
+    10: "🛡️ Guardião dos Endpoints",
+    15: "🔥 Mestre do Curl",
+    20: "⚡ Senhor das APIs",
+    25: "🌟 Lendário Docker",
+    30: "👑 Rei das Requisições",
+    40: "🏆 Campeão dos Containers",
+    50: "💎 Deus das Conexões",
+    75: "🌌 Transcendente Digital",
+    100: "∞ Entidade Cósmica da Rede"
+}
+
+class TitleLadder:
+    # Montada uma única vez: níveis até o último degrau (ou até
+    # DIRECT_TABLE_LIMIT) são resolvidos por índice direto numa lista, o
+    # resto por busca binária nos degraus ordenados.
+    def __init__(self, tiers):
+        if not tiers:
+            raise ValueError("A escada de títulos precisa de pelo menos um degrau")
+        self.levels = sorted(tiers)
+        self.titles = [tiers[level] for level in self.levels]
+        table_size = min(self.levels[-1], DIRECT_TABLE_LIMIT) + 1
+        self._table = [self._search(level) for level in range(table_size)]
+
+    def _search(self, level):
+        index = bisect_right(self.levels, level) - 1
+        return self.titles[max(index, 0)]
+
+    def resolve(self, level):
+        if 0 <= level < len(self._table):
+            return self._table[level]
+        return self._search(level)
+
+    def resolve_many(self, levels):
+        table = self._table
+        size = len(table)
+        search = self._search
+        return [table[level] if 0 <= level < size else search(level) for level in levels]
+
+    def __len__(self):
+        return len(self.levels)
+
+def load_title_ladder(path=TITLES_FILE):
+    if not path:
+        return TitleLadder(DEFAULT_TITLES)
+
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    # Aceita {"1": "título", ...} ou [{"level": 1, "title": "título"}, ...]
+    if isinstance(data, dict):
+        tiers = {int(level): title for level, title in data.items()}
+    else:
+        tiers = {int(tier['level']): tier['title'] for tier in data}
+    return TitleLadder(tiers)
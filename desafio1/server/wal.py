@@ -0,0 +1,347 @@
+import atexit
+import fcntl
+import os
+import struct
+import threading
+import time
+import zlib
+
+WAL_MODE = os.environ.get('WAL_MODE', 'off')
+WAL_DIR = os.environ.get('WAL_DIR', '/data/wal')
+WAL_FLUSH_INTERVAL = float(os.environ.get('WAL_FLUSH_INTERVAL', 0.01))
+WAL_SEGMENT_EVENTS = int(os.environ.get('WAL_SEGMENT_EVENTS', 1_000_000))
+
+# off: sem WAL | async: fsync em grupo a cada WAL_FLUSH_INTERVAL, a requisição
+# não espera | group: a requisição espera o fsync do grupo em que entrou |
+# always: write + fsync dentro de cada requisição
+WAL_MODES = ('off', 'async', 'group', 'always')
+
+SNAPSHOT_FILE = 'snapshot.bin'
+SNAPSHOT_MAGIC = b'RPG1'
+COMPACT_LOCK_FILE = 'compact.lock'
+# Idade mínima de um wal-*.log.new sem lock para a compactação apagá-lo
+ORPHAN_SEGMENT_AGE = 60
+
+_CRC = struct.Struct('<I')
+_EVENT = struct.Struct('<IH')
+_SNAPSHOT_HEADER = struct.Struct('<4sIqqI')
+_NAME = struct.Struct('<H')
+_PLAYER = struct.Struct('<qq')
+
+def encode_event(player_id, xp_gained):
+    key = player_id.encode('utf-8')
+    body = _EVENT.pack(xp_gained, len(key)) + key
+    return _CRC.pack(zlib.crc32(body)) + body
+
+class Recovery:
+    __slots__ = ('folded', 'xp', 'requests', 'players', 'events', 'elapsed')
+
+    def __init__(self):
+        self.folded = set()
+        self.xp = 0
+        self.requests = 0
+        self.players = {}
+        self.events = 0
+        self.elapsed = 0.0
+
+    def fold_segment(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        players = self.players
+        header_size = _CRC.size + _EVENT.size
+        offset = 0
+        end_of_data = len(data)
+        xp_total = 0
+        events = 0
+        while offset + header_size <= end_of_data:
+            crc, = _CRC.unpack_from(data, offset)
+            xp_gained, size = _EVENT.unpack_from(data, offset + _CRC.size)
+            end = offset + header_size + size
+            # Registro cortado ou corrompido: é a cauda de um write que não
+            # chegou ao disco antes da queda, então a leitura para ali.
+            if end > end_of_data or zlib.crc32(data[offset + _CRC.size:end]) != crc:
+                break
+            player_id = data[offset + header_size:end].decode('utf-8')
+            entry = players.get(player_id)
+            if entry is None:
+                players[player_id] = [xp_gained, 1]
+            else:
+                entry[0] += xp_gained
+                entry[1] += 1
+            xp_total += xp_gained
+            events += 1
+            offset = end
+
+        self.xp += xp_total
+        self.requests += events
+        self.events += events
+
+def load_snapshot(path):
+    recovery = Recovery()
+    if not os.path.exists(path):
+        return recovery
+
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    magic, folded_count, recovery.xp, recovery.requests, player_count = _SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError(f"Snapshot inválido: {path}")
+
+    offset = _SNAPSHOT_HEADER.size
+    for _ in range(folded_count):
+        size, = _NAME.unpack_from(data, offset)
+        offset += _NAME.size
+        recovery.folded.add(data[offset:offset + size].decode('utf-8'))
+        offset += size
+
+    players = recovery.players
+    for _ in range(player_count):
+        size, = _NAME.unpack_from(data, offset)
+        offset += _NAME.size
+        player_id = data[offset:offset + size].decode('utf-8')
+        offset += size
+        xp, requests = _PLAYER.unpack_from(data, offset)
+        offset += _PLAYER.size
+        players[player_id] = [xp, requests]
+    return recovery
+
+def write_snapshot(path, recovery):
+    parts = [_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(recovery.folded), recovery.xp,
+        recovery.requests, len(recovery.players))]
+    for name in recovery.folded:
+        encoded = name.encode('utf-8')
+        parts.append(_NAME.pack(len(encoded)))
+        parts.append(encoded)
+    for player_id, (xp, requests) in recovery.players.items():
+        encoded = player_id.encode('utf-8')
+        parts.append(_NAME.pack(len(encoded)))
+        parts.append(encoded)
+        parts.append(_PLAYER.pack(xp, requests))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(b''.join(parts))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    fsync_directory(os.path.dirname(path))
+
+def fsync_directory(directory):
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class WriteAheadLog:
+    # Cada processo escreve no próprio segmento (wal-<ns>-<pid>.log), mantendo
+    # um flock nele enquanto está aberto. A compactação só dobra no snapshot
+    # os segmentos que ninguém mais segura, e o snapshot guarda o nome dos
+    # segmentos que absorveu, para que uma queda antes da remoção deles não
+    # conte os mesmos eventos duas vezes.
+    def __init__(self, directory=WAL_DIR, mode=WAL_MODE, flush_interval=WAL_FLUSH_INTERVAL,
+            segment_events=WAL_SEGMENT_EVENTS):
+        if mode not in WAL_MODES[1:]:
+            raise ValueError(f"Modo de durabilidade desconhecido: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self.flush_interval = flush_interval
+        self.segment_events = segment_events
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._flushed = threading.Condition(self._lock)
+        self._buffer = []
+        self._appended = 0
+        self._durable = 0
+        self._segment_fd = None
+        self._segment_written = 0
+        self._closed = False
+        self._pid = None
+        self._flusher = None
+
+    def _segments(self):
+        return sorted(
+            os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if name.startswith('wal-') and name.endswith('.log')
+        )
+
+    def _open_segment(self):
+        # O segmento só ganha o nome final depois de travado, para que a
+        # compactação de outro processo nunca o veja aberto e sem lock.
+        path = os.path.join(self.directory, f"wal-{time.time_ns():020d}-{os.getpid()}.log")
+        fd = os.open(path + '.new', os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        os.rename(path + '.new', path)
+        fsync_directory(self.directory)
+        self._segment_fd = fd
+        self._segment_written = 0
+
+    def _close_segment(self):
+        if self._segment_fd is not None:
+            os.close(self._segment_fd)
+            self._segment_fd = None
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._buffer = []
+        self._open_segment()
+        if self.mode != 'always':
+            self._flusher = threading.Thread(target=self._run, name='wal-flusher', daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def _is_closed_segment(self, path):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+        finally:
+            os.close(fd)
+
+    def _remove_orphan_segments(self):
+        # wal-*.log.new de um processo que morreu entre o open e o rename: nunca
+        # recebeu eventos (a escrita só começa depois do rename). Sem lock e com
+        # alguns segundos de idade, não é de ninguém que ainda esteja abrindo.
+        for name in os.listdir(self.directory):
+            if not (name.startswith('wal-') and name.endswith('.log.new')):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if time.time() - os.path.getmtime(path) < ORPHAN_SEGMENT_AGE:
+                    continue
+                if self._is_closed_segment(path):
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _compact_locked(self):
+        recovery = load_snapshot(self.snapshot_path)
+        for name in recovery.folded:
+            path = os.path.join(self.directory, name)
+            if os.path.exists(path):
+                os.remove(path)
+        self._remove_orphan_segments()
+
+        closed = [path for path in self._segments() if self._is_closed_segment(path)]
+        if not closed:
+            return recovery
+
+        for path in closed:
+            recovery.fold_segment(path)
+        recovery.folded = {os.path.basename(path) for path in closed}
+        write_snapshot(self.snapshot_path, recovery)
+        for path in closed:
+            os.remove(path)
+        fsync_directory(self.directory)
+        return recovery
+
+    def compact(self, blocking=False):
+        lock_fd = os.open(os.path.join(self.directory, COMPACT_LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return None
+            return self._compact_locked()
+        finally:
+            os.close(lock_fd)
+
+    def recover(self):
+        start = time.perf_counter()
+        lock_fd = os.open(os.path.join(self.directory, COMPACT_LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            recovery = self._compact_locked()
+            # Segmentos ainda abertos por outros workers vivos
+            for path in self._segments():
+                if os.path.basename(path) not in recovery.folded:
+                    recovery.fold_segment(path)
+        finally:
+            os.close(lock_fd)
+        recovery.elapsed = time.perf_counter() - start
+        return recovery
+
+    def _write(self, batch):
+        os.write(self._segment_fd, b''.join(batch))
+        os.fdatasync(self._segment_fd)
+        self._segment_written += len(batch)
+        if self._segment_written >= self.segment_events:
+            self._close_segment()
+            self._open_segment()
+            threading.Thread(target=self.compact, name='wal-compact', daemon=True).start()
+
+    def append(self, player_id, xp_gained):
+        record = encode_event(player_id, xp_gained)
+        with self._lock:
+            self._ensure_started()
+            if self.mode == 'always':
+                self._write([record])
+                return
+
+            self._buffer.append(record)
+            self._appended += 1
+            if len(self._buffer) == 1:
+                self._wakeup.notify()
+            if self.mode == 'group':
+                lsn = self._appended
+                while self._durable < lsn and not self._closed:
+                    self._flushed.wait()
+
+    def _run(self):
+        while True:
+            if self.mode == 'async' and not self._closed:
+                time.sleep(self.flush_interval)
+
+            with self._lock:
+                while not self._buffer and not self._closed:
+                    self._wakeup.wait()
+                batch, self._buffer = self._buffer, []
+                lsn = self._appended
+                closed = self._closed
+
+            # Só o flusher escreve no segmento nos modos async/group, então o
+            # write + fsync acontece fora do lock e as requisições continuam
+            # enfileirando o próximo grupo enquanto o disco trabalha.
+            if batch:
+                self._write(batch)
+
+            with self._lock:
+                self._durable = lsn
+                self._flushed.notify_all()
+            if closed:
+                return
+
+    def close(self):
+        with self._lock:
+            if self._closed or self._pid != os.getpid():
+                return
+            self._closed = True
+            self._wakeup.notify()
+            if self.mode == 'always':
+                self._close_segment()
+                return
+            deadline = time.monotonic() + 5
+            while self._durable < self._appended and time.monotonic() < deadline:
+                self._flushed.wait(0.1)
+        # O flusher pode estar no meio de um write/fdatasync: fechar o fd agora
+        # daria EBADF ou, pior, escreveria num fd já reaproveitado. Se ele não
+        # terminar a tempo, o fd fica aberto e o sistema fecha na saída.
+        if self._flusher is not None:
+            self._flusher.join(max(0, deadline - time.monotonic()))
+            if self._flusher.is_alive():
+                return
+        self._close_segment()
+
+def create_write_ahead_log(mode=WAL_MODE, directory=WAL_DIR):
+    if mode == 'off':
+        return None
+    return WriteAheadLog(directory, mode)
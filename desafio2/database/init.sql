@@ -74,26 +74,12 @@ INSERT INTO achievements (hero_id, achievement_name, achievement_description) VA
 (3, '🎯 Olho de Águia', 'Acertou 100 tiros críticos'),
 (5, '💎 Caçador de Tesouros', 'Encontrou 10 tesouros lendários');
 
-CREATE OR REPLACE VIEW hero_ranking AS
-SELECT 
-    name,
-    class,
-    level,
-    experience,
-    gold,
-    RANK() OVER (ORDER BY level DESC, experience DESC) as ranking
-FROM heroes
-ORDER BY level DESC, experience DESC;
-
-CREATE OR REPLACE VIEW tavern_stats AS
-SELECT 
-    COUNT(*) as total_heroes,
-    AVG(level)::NUMERIC(10,2) as average_level,
-    SUM(gold) as total_gold,
-    MAX(level) as highest_level,
-    (SELECT COUNT(*) FROM quests WHERE status = 'available') as available_quests,
-    (SELECT COUNT(*) FROM quests WHERE status = 'completed') as completed_quests
-FROM heroes;
+-- Migrações de schema (database/migrations): aplicadas em ordem no init de um
+-- volume novo e pelo Game Master ao iniciar, para volumes criados antes delas
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
 
 SELECT '🏰 TAVERNA DOS HERÓIS - DATABASE INITIALIZED!' as status;
-SELECT * FROM tavern_stats;
@@ -0,0 +1,108 @@
+-- Migração 001: notificações de mudança (LISTEN/NOTIFY)
+-- Idempotente: roda no init de um volume novo e pelo Game Master em volumes antigos.
+
+-- Notificações de mudança para o modo por eventos do Quest Reader.
+-- Triggers por comando (não por linha) com tabelas de transição: um INSERT de
+-- 1 milhão de heróis gera um único NOTIFY com os deltas agregados. O NOTIFY só
+-- é entregue no COMMIT; o xid permite ao leitor descartar mudanças que já
+-- estavam na recontagem completa.
+CREATE OR REPLACE FUNCTION notify_heroes_change() RETURNS trigger AS $$
+DECLARE
+    delta_heroes BIGINT := 0;
+    delta_gold BIGINT := 0;
+    rows_count BIGINT;
+    rows_gold BIGINT;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT COUNT(*), COALESCE(SUM(gold), 0) INTO rows_count, rows_gold FROM new_rows;
+        delta_heroes := delta_heroes + rows_count;
+        delta_gold := delta_gold + rows_gold;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        SELECT COUNT(*), COALESCE(SUM(gold), 0) INTO rows_count, rows_gold FROM old_rows;
+        delta_heroes := delta_heroes - rows_count;
+        delta_gold := delta_gold - rows_gold;
+    END IF;
+    IF delta_heroes <> 0 OR delta_gold <> 0 THEN
+        PERFORM pg_notify('tavern_changes', json_build_object(
+            'table', 'heroes',
+            'xid', pg_current_xact_id()::text,
+            'heroes', delta_heroes,
+            'total_gold', delta_gold
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION notify_quests_change() RETURNS trigger AS $$
+DECLARE
+    delta_completed BIGINT := 0;
+    rows_completed BIGINT;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT COUNT(*) INTO rows_completed FROM new_rows WHERE status = 'completed';
+        delta_completed := delta_completed + rows_completed;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        SELECT COUNT(*) INTO rows_completed FROM old_rows WHERE status = 'completed';
+        delta_completed := delta_completed - rows_completed;
+    END IF;
+    IF delta_completed <> 0 THEN
+        PERFORM pg_notify('tavern_changes', json_build_object(
+            'table', 'quests',
+            'xid', pg_current_xact_id()::text,
+            'completed_quests', delta_completed
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- TRUNCATE não tem tabela de transição: o leitor faz uma recontagem completa
+CREATE OR REPLACE FUNCTION notify_tavern_truncate() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('tavern_changes', json_build_object(
+        'table', TG_TABLE_NAME,
+        'xid', pg_current_xact_id()::text,
+        'truncate', true
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS heroes_notify_insert ON heroes;
+DROP TRIGGER IF EXISTS heroes_notify_update ON heroes;
+DROP TRIGGER IF EXISTS heroes_notify_delete ON heroes;
+DROP TRIGGER IF EXISTS heroes_notify_truncate ON heroes;
+DROP TRIGGER IF EXISTS quests_notify_insert ON quests;
+DROP TRIGGER IF EXISTS quests_notify_update ON quests;
+DROP TRIGGER IF EXISTS quests_notify_delete ON quests;
+DROP TRIGGER IF EXISTS quests_notify_truncate ON quests;
+
+CREATE TRIGGER heroes_notify_insert AFTER INSERT ON heroes
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_heroes_change();
+CREATE TRIGGER heroes_notify_update AFTER UPDATE ON heroes
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_heroes_change();
+CREATE TRIGGER heroes_notify_delete AFTER DELETE ON heroes
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_heroes_change();
+CREATE TRIGGER heroes_notify_truncate AFTER TRUNCATE ON heroes
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_tavern_truncate();
+
+CREATE TRIGGER quests_notify_insert AFTER INSERT ON quests
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_quests_change();
+CREATE TRIGGER quests_notify_update AFTER UPDATE ON quests
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_quests_change();
+CREATE TRIGGER quests_notify_delete AFTER DELETE ON quests
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_quests_change();
+CREATE TRIGGER quests_notify_truncate AFTER TRUNCATE ON quests
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_tavern_truncate();
+
+INSERT INTO schema_migrations (version, name) VALUES ('001', 'change_notifications')
+ON CONFLICT (version) DO NOTHING;
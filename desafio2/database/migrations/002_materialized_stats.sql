@@ -0,0 +1,238 @@
+-- Migração 002: estatísticas e ranking materializados
+-- Idempotente: roda no init de um volume novo e pelo Game Master em volumes antigos.
+
+-- Estatísticas materializadas: uma linha de contadores mantida por triggers
+-- (por comando, com tabelas de transição) em vez de COUNT/AVG/SUM/MAX sobre
+-- heroes a cada leitura. O nível mais alto vem de um histograma por nível,
+-- que aguenta DELETE sem reescanear a tabela.
+CREATE TABLE IF NOT EXISTS tavern_counters (
+    id BOOLEAN PRIMARY KEY DEFAULT true CHECK (id),
+    total_heroes BIGINT NOT NULL DEFAULT 0,
+    level_sum BIGINT NOT NULL DEFAULT 0,
+    level_count BIGINT NOT NULL DEFAULT 0,
+    total_gold BIGINT NOT NULL DEFAULT 0,
+    available_quests BIGINT NOT NULL DEFAULT 0,
+    completed_quests BIGINT NOT NULL DEFAULT 0,
+    heroes_changed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS hero_level_counts (
+    level INTEGER PRIMARY KEY,
+    heroes BIGINT NOT NULL
+);
+
+CREATE OR REPLACE FUNCTION rebuild_tavern_counters() RETURNS void AS $$
+BEGIN
+    LOCK TABLE tavern_counters IN EXCLUSIVE MODE;
+    INSERT INTO tavern_counters (id) VALUES (true) ON CONFLICT (id) DO NOTHING;
+    UPDATE tavern_counters SET
+        total_heroes = h.total_heroes,
+        level_sum = h.level_sum,
+        level_count = h.level_count,
+        total_gold = h.total_gold,
+        available_quests = q.available_quests,
+        completed_quests = q.completed_quests,
+        heroes_changed_at = clock_timestamp(),
+        updated_at = clock_timestamp()
+    FROM (SELECT COUNT(*) AS total_heroes, COALESCE(SUM(level), 0) AS level_sum, COUNT(level) AS level_count,
+                 COALESCE(SUM(gold), 0) AS total_gold FROM heroes) h,
+         (SELECT COUNT(*) FILTER (WHERE status = 'available') AS available_quests,
+                 COUNT(*) FILTER (WHERE status = 'completed') AS completed_quests FROM quests) q;
+    DELETE FROM hero_level_counts;
+    INSERT INTO hero_level_counts (level, heroes)
+    SELECT level, COUNT(*) FROM heroes WHERE level IS NOT NULL GROUP BY level;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION maintain_hero_counters() RETURNS trigger AS $$
+DECLARE
+    delta_heroes BIGINT := 0;
+    delta_level_sum BIGINT := 0;
+    delta_level_count BIGINT := 0;
+    delta_gold BIGINT := 0;
+    rows_count BIGINT;
+    rows_level_sum BIGINT;
+    rows_level_count BIGINT;
+    rows_gold BIGINT;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT COUNT(*), COALESCE(SUM(level), 0), COUNT(level), COALESCE(SUM(gold), 0)
+        INTO rows_count, rows_level_sum, rows_level_count, rows_gold FROM new_rows;
+        delta_heroes := delta_heroes + rows_count;
+        delta_level_sum := delta_level_sum + rows_level_sum;
+        delta_level_count := delta_level_count + rows_level_count;
+        delta_gold := delta_gold + rows_gold;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        SELECT COUNT(*), COALESCE(SUM(level), 0), COUNT(level), COALESCE(SUM(gold), 0)
+        INTO rows_count, rows_level_sum, rows_level_count, rows_gold FROM old_rows;
+        delta_heroes := delta_heroes - rows_count;
+        delta_level_sum := delta_level_sum - rows_level_sum;
+        delta_level_count := delta_level_count - rows_level_count;
+        delta_gold := delta_gold - rows_gold;
+    END IF;
+
+    -- A linha de contadores é travada primeiro: escritores de heroes ficam em
+    -- fila aqui e o histograma abaixo nunca é atualizado em ordens cruzadas
+    UPDATE tavern_counters SET
+        total_heroes = total_heroes + delta_heroes,
+        level_sum = level_sum + delta_level_sum,
+        level_count = level_count + delta_level_count,
+        total_gold = total_gold + delta_gold,
+        heroes_changed_at = clock_timestamp(),
+        updated_at = clock_timestamp();
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO hero_level_counts AS counts (level, heroes)
+        SELECT level, COUNT(*) FROM new_rows WHERE level IS NOT NULL GROUP BY level
+        ON CONFLICT (level) DO UPDATE SET heroes = counts.heroes + EXCLUDED.heroes;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE hero_level_counts AS counts SET heroes = counts.heroes - old_levels.heroes
+        FROM (SELECT level, COUNT(*) AS heroes FROM old_rows WHERE level IS NOT NULL GROUP BY level) old_levels
+        WHERE counts.level = old_levels.level;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION maintain_quest_counters() RETURNS trigger AS $$
+DECLARE
+    delta_available BIGINT := 0;
+    delta_completed BIGINT := 0;
+    rows_available BIGINT;
+    rows_completed BIGINT;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT COUNT(*) FILTER (WHERE status = 'available'), COUNT(*) FILTER (WHERE status = 'completed')
+        INTO rows_available, rows_completed FROM new_rows;
+        delta_available := delta_available + rows_available;
+        delta_completed := delta_completed + rows_completed;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        SELECT COUNT(*) FILTER (WHERE status = 'available'), COUNT(*) FILTER (WHERE status = 'completed')
+        INTO rows_available, rows_completed FROM old_rows;
+        delta_available := delta_available - rows_available;
+        delta_completed := delta_completed - rows_completed;
+    END IF;
+    IF delta_available <> 0 OR delta_completed <> 0 THEN
+        UPDATE tavern_counters SET
+            available_quests = available_quests + delta_available,
+            completed_quests = completed_quests + delta_completed,
+            updated_at = clock_timestamp();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION rebuild_tavern_counters_trigger() RETURNS trigger AS $$
+BEGIN
+    PERFORM rebuild_tavern_counters();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS heroes_counters_insert ON heroes;
+DROP TRIGGER IF EXISTS heroes_counters_update ON heroes;
+DROP TRIGGER IF EXISTS heroes_counters_delete ON heroes;
+DROP TRIGGER IF EXISTS heroes_counters_truncate ON heroes;
+DROP TRIGGER IF EXISTS quests_counters_insert ON quests;
+DROP TRIGGER IF EXISTS quests_counters_update ON quests;
+DROP TRIGGER IF EXISTS quests_counters_delete ON quests;
+DROP TRIGGER IF EXISTS quests_counters_truncate ON quests;
+
+CREATE TRIGGER heroes_counters_insert AFTER INSERT ON heroes
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_hero_counters();
+CREATE TRIGGER heroes_counters_update AFTER UPDATE ON heroes
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_hero_counters();
+CREATE TRIGGER heroes_counters_delete AFTER DELETE ON heroes
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_hero_counters();
+CREATE TRIGGER heroes_counters_truncate AFTER TRUNCATE ON heroes
+    FOR EACH STATEMENT EXECUTE FUNCTION rebuild_tavern_counters_trigger();
+
+CREATE TRIGGER quests_counters_insert AFTER INSERT ON quests
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_quest_counters();
+CREATE TRIGGER quests_counters_update AFTER UPDATE ON quests
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_quest_counters();
+CREATE TRIGGER quests_counters_delete AFTER DELETE ON quests
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION maintain_quest_counters();
+CREATE TRIGGER quests_counters_truncate AFTER TRUNCATE ON quests
+    FOR EACH STATEMENT EXECUTE FUNCTION rebuild_tavern_counters_trigger();
+
+SELECT rebuild_tavern_counters();
+
+DROP VIEW IF EXISTS tavern_stats;
+CREATE VIEW tavern_stats AS
+SELECT 
+    total_heroes,
+    (level_sum::NUMERIC / NULLIF(level_count, 0))::NUMERIC(10,2) as average_level,
+    total_gold,
+    (SELECT MAX(level) FROM hero_level_counts WHERE heroes > 0) as highest_level,
+    available_quests,
+    completed_quests,
+    updated_at
+FROM tavern_counters;
+
+-- Ranking materializado: o RANK() sobre todos os heróis roda só no refresh.
+-- O índice único em id permite REFRESH ... CONCURRENTLY (leitores não bloqueiam).
+-- Volumes antigos têm hero_ranking como view comum
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_class WHERE relname = 'hero_ranking' AND relkind = 'v') THEN
+        DROP VIEW hero_ranking;
+    END IF;
+END;
+$$;
+CREATE MATERIALIZED VIEW IF NOT EXISTS hero_ranking AS
+SELECT 
+    id,
+    name,
+    class,
+    level,
+    experience,
+    gold,
+    RANK() OVER (ORDER BY level DESC, experience DESC) as ranking
+FROM heroes;
+
+CREATE UNIQUE INDEX IF NOT EXISTS hero_ranking_id ON hero_ranking (id);
+CREATE INDEX IF NOT EXISTS hero_ranking_ranking ON hero_ranking (ranking, id);
+
+CREATE TABLE IF NOT EXISTS materialized_refreshes (
+    view_name TEXT PRIMARY KEY,
+    refreshed_at TIMESTAMPTZ NOT NULL,
+    source_changed_at TIMESTAMPTZ NOT NULL,
+    duration_ms NUMERIC(12,2) NOT NULL DEFAULT 0
+);
+
+-- heroes_changed_at é lido antes do REFRESH, que enxerga tudo o que já estava
+-- commitado: se depois disso heroes mudar, o ranking aparece como desatualizado
+CREATE OR REPLACE FUNCTION refresh_hero_ranking() RETURNS NUMERIC AS $$
+DECLARE
+    changed_at TIMESTAMPTZ;
+    started_at TIMESTAMPTZ := clock_timestamp();
+    elapsed_ms NUMERIC(12,2);
+BEGIN
+    SELECT heroes_changed_at INTO changed_at FROM tavern_counters;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY hero_ranking;
+    elapsed_ms := EXTRACT(EPOCH FROM clock_timestamp() - started_at) * 1000;
+    INSERT INTO materialized_refreshes (view_name, refreshed_at, source_changed_at, duration_ms)
+    VALUES ('hero_ranking', clock_timestamp(), changed_at, elapsed_ms)
+    ON CONFLICT (view_name) DO UPDATE SET
+        refreshed_at = EXCLUDED.refreshed_at,
+        source_changed_at = EXCLUDED.source_changed_at,
+        duration_ms = EXCLUDED.duration_ms;
+    RETURN elapsed_ms;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT refresh_hero_ranking();
+
+INSERT INTO schema_migrations (version, name) VALUES ('002', 'materialized_stats')
+ON CONFLICT (version) DO NOTHING;
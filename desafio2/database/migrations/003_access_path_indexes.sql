@@ -0,0 +1,38 @@
+-- Migração 003: índices para os caminhos de acesso do Game Master e do Quest Reader
+-- Idempotente: roda no init de um volume novo e pelo Game Master em volumes antigos.
+
+-- Dificuldade como ordinal ordenável, calculada pelo próprio banco a partir
+-- do texto: substitui o ORDER BY CASE difficulty ... nas consultas
+ALTER TABLE quests ADD COLUMN IF NOT EXISTS difficulty_rank SMALLINT
+    GENERATED ALWAYS AS (
+        CASE difficulty
+            WHEN 'Fácil' THEN 1
+            WHEN 'Médio' THEN 2
+            WHEN 'Difícil' THEN 3
+        END
+    ) STORED;
+
+-- show_hero_inventory: WHERE hero_id = ? ORDER BY item_type, power DESC
+-- (INCLUDE permite index-only scan sem visitar a tabela)
+CREATE INDEX IF NOT EXISTS inventory_hero_type_power
+    ON inventory (hero_id, item_type, power DESC)
+    INCLUDE (item_name, quantity);
+
+-- show_achievements: WHERE hero_id = ? ORDER BY unlocked_at DESC
+CREATE INDEX IF NOT EXISTS achievements_hero_unlocked
+    ON achievements (hero_id, unlocked_at DESC);
+
+-- show_available_quests: WHERE status = ? ORDER BY difficulty_rank
+CREATE INDEX IF NOT EXISTS quests_status_difficulty
+    ON quests (status, difficulty_rank, created_at);
+
+-- read_all_quests / export: ORDER BY difficulty_rank, created_at
+CREATE INDEX IF NOT EXISTS quests_difficulty_created
+    ON quests (difficulty_rank, created_at);
+
+ANALYZE quests;
+ANALYZE inventory;
+ANALYZE achievements;
+
+INSERT INTO schema_migrations (version, name) VALUES ('003', 'access_path_indexes')
+ON CONFLICT (version) DO NOTHING;
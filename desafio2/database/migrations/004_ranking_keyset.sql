@@ -0,0 +1,42 @@
+-- Migração 004: ranking paginado por keyset (level, experience, id)
+-- Idempotente: roda no init de um volume novo e pelo Game Master em volumes antigos.
+
+-- O ranking é recriado com level/experience sem NULL: a comparação de linhas
+-- (level, experience, id) < (...) do keyset não funciona com NULLs. A ordem
+-- do RANK() e a do keyset passam a ser exatamente as mesmas.
+
+-- Só recria se ainda for a versão antiga (sem o índice de keyset): rodar de
+-- novo não derruba a view nem os seus índices.
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_indexes
+        WHERE tablename = 'hero_ranking' AND indexname = 'hero_ranking_keyset'
+    ) THEN
+        DROP MATERIALIZED VIEW IF EXISTS hero_ranking;
+        CREATE MATERIALIZED VIEW hero_ranking AS
+        SELECT
+            id,
+            name,
+            class,
+            COALESCE(level, 0) as level,
+            COALESCE(experience, 0) as experience,
+            gold,
+            RANK() OVER (ORDER BY COALESCE(level, 0) DESC, COALESCE(experience, 0) DESC) as ranking
+        FROM heroes;
+    END IF;
+END $$;
+
+CREATE UNIQUE INDEX IF NOT EXISTS hero_ranking_id ON hero_ranking (id);
+
+-- Páginas: ORDER BY level DESC, experience DESC, id DESC é este índice lido
+-- de trás para frente; a página seguinte começa direto na chave da anterior
+CREATE INDEX IF NOT EXISTS hero_ranking_keyset ON hero_ranking (level, experience, id);
+
+-- Pular para a posição N
+CREATE INDEX IF NOT EXISTS hero_ranking_ranking ON hero_ranking (ranking, id);
+
+SELECT refresh_hero_ranking();
+
+INSERT INTO schema_migrations (version, name) VALUES ('004', 'ranking_keyset')
+ON CONFLICT (version) DO NOTHING;
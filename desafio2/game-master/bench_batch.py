@@ -0,0 +1,75 @@
+import argparse
+import statistics
+import sys
+import time
+
+import game_master
+from db import DatabasePool
+from seed import seed_heroes
+
+def per_hero(db, hero_ids):
+    # Padrão antigo: uma ida ao banco (e conexão) por herói
+    details = {}
+    for hero_id in hero_ids:
+        with db.cursor() as cursor:
+            details.update(game_master.fetch_heroes_details(cursor, [hero_id]))
+    return details
+
+def batched(db, hero_ids):
+    with db.cursor() as cursor:
+        return game_master.fetch_heroes_details(cursor, hero_ids)
+
+def measure(db, fetch, hero_ids, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        details = fetch(db, hero_ids)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), details
+
+def main():
+    parser = argparse.ArgumentParser(description='Inventário e conquistas: um herói por vez vs lote com = ANY')
+    parser.add_argument('--heroes', type=int, default=1_000, help='heróis consultados')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if not game_master.wait_for_database():
+        sys.exit(1)
+
+    with game_master.db.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM heroes")
+        heroes = cursor.fetchone()[0]
+    if heroes < args.heroes:
+        print(f"🌱 Gerando {args.heroes - heroes:,} heróis...")
+        seed_heroes(game_master.db, args.heroes - heroes)
+    with game_master.db.cursor() as cursor:
+        cursor.execute("SELECT id FROM heroes ORDER BY id DESC LIMIT %s", (args.heroes,))
+        hero_ids = [row[0] for row in cursor.fetchall()]
+    game_master.db.close()
+
+    print("=" * 70)
+    print(f"🎒 DETALHES DE {len(hero_ids):,} HERÓIS (mediana de {args.repeat})")
+    print("=" * 70)
+
+    runs = (
+        ('um por vez, sem pool', False, per_hero),
+        ('um por vez, com pool', True, per_hero),
+        ('lote (= ANY)', True, batched)
+    )
+    baseline = None
+    for label, pooled, fetch in runs:
+        db = DatabasePool(game_master.STATEMENTS, enabled=pooled)
+        elapsed, details = measure(db, fetch, hero_ids, args.repeat)
+        opened = db.connections_opened
+        db.close()
+
+        baseline = baseline or elapsed
+        items = sum(len(d[1]) for d in details.values())
+        achievements = sum(len(d[2]) for d in details.values())
+        print(f"  {label:<22} {elapsed * 1000:>9.1f} ms | {baseline / elapsed:>6.1f}x | "
+            f"{opened:>5} conexões | {items:,} itens, {achievements:,} conquistas")
+
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import contextlib
+import io
+import time
+
+import psycopg2
+
+import game_master
+from db import DB_CONFIG, DatabasePool
+
+COMMANDS = (
+    ('estatísticas', game_master.show_tavern_stats, ()),
+    ('ranking', game_master.show_hero_ranking, ()),
+    ('quests', game_master.show_available_quests, ()),
+    ('inventário', game_master.show_hero_inventory, (1,)),
+    ('conquistas', game_master.show_achievements, (2,)),
+    ('herói inexistente', game_master.show_hero_inventory, (999_999,))
+)
+
+def count_connections():
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM pg_stat_activity WHERE usename = current_user")
+            return cursor.fetchone()[0] - 1
+    finally:
+        conn.close()
+
+def bench(pooled, iterations):
+    game_master.db = DatabasePool(game_master.STATEMENTS, enabled=pooled)
+    results = []
+    for label, command, args in COMMANDS:
+        latencies = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(iterations):
+                start = time.perf_counter()
+                command(*args)
+                latencies.append(time.perf_counter() - start)
+        latencies.sort()
+        results.append((label, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99) - 1]))
+    open_connections = count_connections()
+    opened = game_master.db.connections_opened
+    game_master.db.close()
+    return results, opened, open_connections
+
+def main():
+    parser = argparse.ArgumentParser(description='Latência por comando do Game Master com e sem pool de conexões')
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    if not game_master.wait_for_database():
+        return
+
+    print("=" * 70)
+    print("⏱️  LATÊNCIA POR COMANDO: conexão nova vs pool + statements preparados")
+    print("=" * 70)
+
+    runs = {}
+    for pooled in (False, True):
+        runs[pooled] = bench(pooled, args.iterations)
+
+    print(f"{'comando':<20} {'sem pool p50':>13} {'p99':>9} {'com pool p50':>13} {'p99':>9} {'ganho':>7}")
+    for (label, p50, p99), (_, pooled_p50, pooled_p99) in zip(runs[False][0], runs[True][0]):
+        print(f"{label:<20} {p50 * 1000:>10.2f} ms {p99 * 1000:>6.2f} ms "
+            f"{pooled_p50 * 1000:>10.2f} ms {pooled_p99 * 1000:>6.2f} ms {p50 / pooled_p50:>6.1f}x")
+
+    print()
+    for pooled, label in ((False, 'sem pool'), (True, 'com pool')):
+        _, opened, open_connections = runs[pooled]
+        print(f"🔌 {label}: {opened:,} conexões abertas no total | {open_connections} ainda abertas ao fim do teste")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
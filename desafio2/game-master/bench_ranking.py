@@ -0,0 +1,87 @@
+import argparse
+import statistics
+import sys
+import time
+
+import game_master
+from migrate import migrate
+from seed import seed_heroes
+
+# Paginação antiga: o banco percorre e descarta todas as linhas antes da página
+OFFSET_PAGE = """
+    SELECT ranking, name, class, level, experience, gold, id
+    FROM hero_ranking
+    ORDER BY level DESC, experience DESC, id DESC
+    LIMIT %s OFFSET %s
+"""
+
+def timed(cursor, repeat, run):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(cursor)
+        cursor.fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description='Paginação do ranking: OFFSET vs keyset em profundidade')
+    parser.add_argument('--heroes', type=int, default=1_000_000, help='heróis mínimos na taverna (gera o que faltar)')
+    parser.add_argument('--page-size', type=int, default=game_master.RANKING_PAGE_SIZE)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    if not game_master.wait_for_database():
+        sys.exit(1)
+    db = game_master.db
+    migrate(db)
+
+    with db.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM heroes")
+        heroes = cursor.fetchone()[0]
+    if heroes < args.heroes:
+        print(f"🌱 Gerando {args.heroes - heroes:,} heróis...")
+        seed_heroes(db, args.heroes - heroes)
+    game_master.refresh_ranking_now()
+
+    with db.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM hero_ranking")
+        total = cursor.fetchone()[0]
+    depths = [depth for depth in (0, 1_000, 100_000, total - args.page_size) if 0 <= depth < total]
+
+    print("=" * 70)
+    print(f"📑 PAGINAÇÃO DO RANKING ({total:,} heróis, páginas de {args.page_size}, mediana de {args.repeat})")
+    print("=" * 70)
+    print(f"{'profundidade':>14} | {'OFFSET':>10} | {'keyset':>10} | {'ganho':>8}")
+    print("-" * 70)
+
+    size = args.page_size
+    with db.cursor() as cursor:
+        for depth in sorted(set(depths)):
+            offset_ms = timed(cursor, args.repeat, lambda c: c.execute(OFFSET_PAGE, (size, depth)))
+            if depth == 0:
+                keyset_ms = timed(cursor, args.repeat, lambda c: c.run('ranking_first_page', (size,)))
+            else:
+                # Chave da última linha da página anterior (fora da medição)
+                cursor.execute(OFFSET_PAGE, (1, depth - 1))
+                key = game_master.page_key(cursor.fetchone())
+                keyset_ms = timed(cursor, args.repeat, lambda c: c.run('ranking_page_after', (*key, size)))
+            print(f"{depth:>14,} | {offset_ms:>7.2f} ms | {keyset_ms:>7.2f} ms | {offset_ms / keyset_ms:>7.1f}x")
+
+        print("-" * 70)
+        rank = max(1, total - size)
+        rank_ms = timed(cursor, args.repeat, lambda c: c.run('ranking_at_rank', (rank, size)))
+        print(f"🎯 Pular para a posição #{rank:,}: {rank_ms:.2f} ms")
+
+        cursor.execute(OFFSET_PAGE, (1, total // 2))
+        hero_id = cursor.fetchone()[6]
+        around = game_master.RANKING_AROUND
+        around_ms = timed(cursor, args.repeat,
+            lambda c: c.run('ranking_around_hero', (hero_id, around, around + 1)))
+        print(f"🧭 Heróis ao redor do herói {hero_id} (meio do ranking): {around_ms:.2f} ms")
+
+    db.close()
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
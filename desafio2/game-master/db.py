@@ -0,0 +1,139 @@
+import os
+import re
+import time
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import extensions, pool
+
+DB_CONFIG = {
+    'dbname': 'tavern_rpg',
+    'user': 'gamemaster',
+    'password': 'hero123',
+    'host': 'tavern-database',
+    'port': '5432'
+}
+
+DB_POOL = os.environ.get('DB_POOL', 'on') == 'on'
+DB_POOL_MIN = int(os.environ.get('DB_POOL_MIN', 1))
+DB_POOL_MAX = int(os.environ.get('DB_POOL_MAX', 4))
+DB_HEALTH_CHECK_INTERVAL = float(os.environ.get('DB_HEALTH_CHECK_INTERVAL', 30))
+
+def to_prepared(sql):
+    # "... WHERE id = %s AND x = %s" -> "... WHERE id = $1 AND x = $2"
+    counter = iter(range(1, sql.count('%s') + 1))
+    return re.sub(r'%s', lambda _: f"${next(counter)}", sql)
+
+class PreparedCursor(extensions.cursor):
+    def run(self, name, params=()):
+        conn = self.connection
+        sql = conn.statements[name]
+        if not conn.use_prepared:
+            self.execute(sql, params)
+            return
+        if name not in conn.prepared:
+            self.execute(f"PREPARE {name} AS {to_prepared(sql)}")
+            conn.prepared.add(name)
+        if params:
+            self.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            self.execute(f"EXECUTE {name}")
+
+class PreparedConnection(extensions.connection):
+    def __init__(self, dsn, statements, use_prepared):
+        super().__init__(dsn)
+        self.cursor_factory = PreparedCursor
+        self.statements = statements
+        self.use_prepared = use_prepared
+        self.prepared = set()
+        self.last_used = time.monotonic()
+
+class DatabasePool:
+    def __init__(self, statements, enabled=DB_POOL, minconn=DB_POOL_MIN, maxconn=DB_POOL_MAX,
+            health_check_interval=DB_HEALTH_CHECK_INTERVAL):
+        self.statements = statements
+        self.enabled = enabled
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.health_check_interval = health_check_interval
+        self.pool = None
+        self.connections_opened = 0
+        self.reconnects = 0
+
+    def _connection_factory(self, dsn, *args):
+        self.connections_opened += 1
+        return PreparedConnection(dsn, self.statements, self.enabled)
+
+    def _is_healthy(self, conn):
+        if conn.closed:
+            return False
+        if time.monotonic() - conn.last_used < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _acquire(self):
+        if not self.enabled:
+            return psycopg2.connect(connection_factory=self._connection_factory, **DB_CONFIG)
+
+        if self.pool is None:
+            # O pool só é aberto no primeiro comando, depois de wait_for_database
+            self.pool = pool.ThreadedConnectionPool(
+                self.minconn, self.maxconn, connection_factory=self._connection_factory, **DB_CONFIG)
+
+        conn = self.pool.getconn()
+        if not self._is_healthy(conn):
+            # Conexão derrubada pelo servidor (restart, timeout ocioso): descarta e abre outra
+            self.pool.putconn(conn, close=True)
+            self.reconnects += 1
+            conn = self.pool.getconn()
+        return conn
+
+    def _release(self, conn):
+        conn.last_used = time.monotonic()
+        if self.enabled:
+            self.pool.putconn(conn, close=bool(conn.closed))
+        else:
+            conn.close()
+
+    def _reset(self, conn):
+        try:
+            conn.rollback()
+            # PREPARE não é desfeito pelo rollback: limpa tudo para o registro
+            # de statements preparados não divergir do servidor
+            if conn.prepared:
+                with conn.cursor() as cursor:
+                    cursor.execute("DEALLOCATE ALL")
+                conn.commit()
+                conn.prepared.clear()
+        except psycopg2.Error:
+            conn.close()
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                self._reset(conn)
+            raise
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def cursor(self):
+        with self.connection() as conn:
+            with conn.cursor() as cursor:
+                yield cursor
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.closeall()
+            self.pool = None
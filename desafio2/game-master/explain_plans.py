@@ -0,0 +1,103 @@
+import argparse
+import json
+import sys
+
+import game_master
+from migrate import migrate
+from seed import seed_heroes
+
+INDEX_NODES = ('Index Scan', 'Index Only Scan', 'Bitmap Index Scan')
+
+# (rótulo, statement do Game Master, parâmetros, índice esperado)
+CHECKS = (
+    ('inventário dos heróis', 'heroes_details', 'hero_ids', 'inventory_hero_type_power'),
+    ('conquistas dos heróis', 'heroes_details', 'hero_ids', 'achievements_hero_unlocked'),
+    ('quests disponíveis', 'available_quests', None, 'quests_status_difficulty')
+)
+
+def walk(plan):
+    yield plan
+    for child in plan.get('Plans', ()):
+        yield from walk(child)
+
+def explain(cursor, sql, params):
+    cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql, params)
+    result = cursor.fetchone()[0]
+    result = json.loads(result) if isinstance(result, str) else result
+    return result[0]
+
+def seed_quests(cursor, count):
+    # Quadro de avisos grande: só ~5% das quests disponíveis, para o filtro por status ser seletivo
+    cursor.execute("""
+        INSERT INTO quests (title, description, difficulty, reward_xp, reward_gold, status)
+        SELECT 'Quest gerada #' || g, 'Gerada para o benchmark de planos',
+               (ARRAY['Fácil', 'Médio', 'Difícil'])[1 + g %% 3],
+               100 + g %% 2000, 50 + g %% 5000,
+               CASE WHEN g %% 20 = 0 THEN 'available' WHEN g %% 20 < 4 THEN 'in_progress' ELSE 'completed' END
+        FROM generate_series(1, %s) AS g
+    """, (count,))
+    cursor.execute("ANALYZE quests")
+
+def main():
+    parser = argparse.ArgumentParser(description='EXPLAIN ANALYZE dos comandos do Game Master em dados grandes')
+    parser.add_argument('--heroes', type=int, default=1_000_000, help='heróis mínimos na taverna (gera o que faltar)')
+    parser.add_argument('--quests', type=int, default=200_000, help='quests mínimas no quadro (gera o que faltar)')
+    parser.add_argument('--verbose', action='store_true', help='imprime o plano completo')
+    args = parser.parse_args()
+
+    if not game_master.wait_for_database():
+        sys.exit(1)
+    db = game_master.db
+    migrate(db)
+
+    print("=" * 70)
+    print("🔎 PLANOS DE EXECUÇÃO DOS COMANDOS DO GAME MASTER")
+    print("=" * 70)
+
+    with db.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM heroes")
+        heroes = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*) FROM quests")
+        quests = cursor.fetchone()[0]
+        if quests < args.quests:
+            print(f"🌱 Gerando {args.quests - quests:,} quests...")
+            seed_quests(cursor, args.quests - quests)
+    if heroes < args.heroes:
+        print(f"🌱 Gerando {args.heroes - heroes:,} heróis...")
+        seed_heroes(db, args.heroes - heroes)
+
+    failures = 0
+    with db.cursor() as cursor:
+        # Um lote de heróis do fim da tabela, com inventário e conquistas
+        cursor.execute("""
+            SELECT DISTINCT hero_id FROM achievements
+            WHERE hero_id IN (SELECT hero_id FROM inventory ORDER BY hero_id DESC LIMIT 1000)
+            LIMIT 100
+        """)
+        hero_ids = [row[0] for row in cursor.fetchall()] or [1]
+        print(f"🦸 Lote de exemplo: {len(hero_ids)} heróis")
+        print()
+
+        for label, statement, param, expected_index in CHECKS:
+            params = (True, True, hero_ids) if param == 'hero_ids' else ()
+            result = explain(cursor, game_master.STATEMENTS[statement], params)
+            nodes = list(walk(result['Plan']))
+            indexes = {node['Index Name'] for node in nodes if node['Node Type'] in INDEX_NODES}
+            seq_scans = [node['Relation Name'] for node in nodes if node['Node Type'] == 'Seq Scan']
+            ok = expected_index in indexes and not seq_scans
+            failures += not ok
+
+            status = "✅" if ok else "❌"
+            scan = ', '.join(sorted(node['Node Type'] for node in nodes if node['Node Type'] in INDEX_NODES)) or 'nenhum'
+            print(f"{status} {label:<22} {result['Execution Time']:>8.3f} ms | {scan} | índices: {', '.join(sorted(indexes)) or '-'}")
+            if seq_scans:
+                print(f"   ⚠️  Seq Scan em: {', '.join(seq_scans)}")
+            if args.verbose or not ok:
+                print(json.dumps(result['Plan'], indent=2, ensure_ascii=False))
+
+    db.close()
+    print("=" * 70)
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
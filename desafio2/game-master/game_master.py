@@ -1,17 +1,101 @@
 import psycopg2
+import os
 import time
 import sys
 from datetime import datetime
 import random
+from db import DB_CONFIG, DatabasePool
+from seed import print_report, seed_heroes
+from migrate import migrate
 
-DB_CONFIG = {
-    'dbname': 'tavern_rpg',
-    'user': 'gamemaster',
-    'password': 'hero123',
-    'host': 'tavern-database',
-    'port': '5432'
+SHOW_TIMINGS = os.environ.get('SHOW_TIMINGS', '0') == '1'
+RANKING_PAGE_SIZE = int(os.environ.get('RANKING_PAGE_SIZE', '10'))
+RANKING_AROUND = int(os.environ.get('RANKING_AROUND', '5'))
+
+# Consultas de cada comando; preparadas uma vez por conexão do pool
+STATEMENTS = {
+    'tavern_stats': "SELECT * FROM tavern_stats",
+    # Ranking paginado por keyset: a ordem é a do índice (level, experience, id)
+    # lido de trás para frente, e cada página começa na chave da última linha
+    # da anterior - custo constante em qualquer profundidade, sem OFFSET
+    'ranking_first_page': """
+        SELECT ranking, name, class, level, experience, gold, id
+        FROM hero_ranking
+        ORDER BY level DESC, experience DESC, id DESC
+        LIMIT %s
+    """,
+    'ranking_page_after': """
+        SELECT ranking, name, class, level, experience, gold, id
+        FROM hero_ranking
+        WHERE (level, experience, id) < (%s, %s, %s)
+        ORDER BY level DESC, experience DESC, id DESC
+        LIMIT %s
+    """,
+    'ranking_at_rank': """
+        SELECT r.ranking, r.name, r.class, r.level, r.experience, r.gold, r.id
+        FROM hero_ranking r,
+             (SELECT level, experience FROM hero_ranking
+              WHERE ranking <= %s ORDER BY ranking DESC LIMIT 1) start
+        WHERE (r.level, r.experience) <= (start.level, start.experience)
+        ORDER BY r.level DESC, r.experience DESC, r.id DESC
+        LIMIT %s
+    """,
+    'ranking_around_hero': """
+        WITH hero AS (SELECT level, experience, id FROM hero_ranking WHERE id = %s)
+        (SELECT r.ranking, r.name, r.class, r.level, r.experience, r.gold, r.id
+         FROM hero_ranking r, hero h
+         WHERE (r.level, r.experience, r.id) > (h.level, h.experience, h.id)
+         ORDER BY r.level, r.experience, r.id
+         LIMIT %s)
+        UNION ALL
+        (SELECT r.ranking, r.name, r.class, r.level, r.experience, r.gold, r.id
+         FROM hero_ranking r, hero h
+         WHERE (r.level, r.experience, r.id) <= (h.level, h.experience, h.id)
+         ORDER BY r.level DESC, r.experience DESC, r.id DESC
+         LIMIT %s)
+    """,
+    'ranking_freshness': """
+        SELECT r.refreshed_at, EXTRACT(EPOCH FROM now() - r.refreshed_at),
+               c.heroes_changed_at > r.source_changed_at, r.duration_ms
+        FROM materialized_refreshes r, tavern_counters c
+        WHERE r.view_name = 'hero_ranking'
+    """,
+    'available_quests': """
+        SELECT title, difficulty, reward_xp, reward_gold, status 
+        FROM quests 
+        WHERE status = 'available'
+        ORDER BY difficulty_rank
+    """,
+    'create_hero': """
+        INSERT INTO heroes (name, class, level, experience, health_points, mana_points, gold)
+        VALUES (%s, %s, 1, 0, 100, 50, 100)
+        RETURNING id, name, class
+    """,
+    'refresh_ranking': "SELECT refresh_hero_ranking()",
+    # Nome, inventário e conquistas de vários heróis numa ida ao banco: cada
+    # lista vem agregada em JSON por herói (subconsulta pelo índice de hero_id);
+    # os dois primeiros parâmetros ligam/desligam cada lista
+    'heroes_details': """
+        SELECT h.id, h.name,
+            CASE WHEN %s THEN (
+                SELECT COALESCE(json_agg(json_build_array(i.item_name, i.item_type, i.quantity, i.power)
+                    ORDER BY i.item_type, i.power DESC), '[]')
+                FROM inventory i
+                WHERE i.hero_id = h.id
+            ) END as items,
+            CASE WHEN %s THEN (
+                SELECT COALESCE(json_agg(json_build_array(a.achievement_name, a.achievement_description, a.unlocked_at)
+                    ORDER BY a.unlocked_at DESC), '[]')
+                FROM achievements a
+                WHERE a.hero_id = h.id
+            ) END as achievements
+        FROM heroes h
+        WHERE h.id = ANY(%s)
+    """
 }
 
+db = DatabasePool(STATEMENTS)
+
 def wait_for_database(max_retries=30):
     print("⏳ Aguardando banco de dados da taverna ficar disponível...")
     
@@ -28,9 +112,6 @@ def wait_for_database(max_retries=30):
     print("❌ Não foi possível conectar ao banco de dados")
     return False
 
-def get_connection():
-    return psycopg2.connect(**DB_CONFIG)
-
 def print_separator(char='=', length=70):
     print(char * length)
 
@@ -44,14 +125,12 @@ def show_welcome():
     print()
 
 def show_tavern_stats():
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    print("📊 ESTATÍSTICAS DA TAVERNA")
-    print_separator('-')
-    
-    cursor.execute("SELECT * FROM tavern_stats")
-    stats = cursor.fetchone()
+    with db.cursor() as cursor:
+        print("📊 ESTATÍSTICAS DA TAVERNA")
+        print_separator('-')
+        
+        cursor.run('tavern_stats')
+        stats = cursor.fetchone()
     
     print(f"  👥 Total de Heróis: {stats[0]}")
     print(f"  📈 Nível Médio: {stats[1]}")
@@ -59,64 +138,109 @@ def show_tavern_stats():
     print(f"  ⭐ Nível Mais Alto: {stats[3]}")
     print(f"  📜 Quests Disponíveis: {stats[4]}")
     print(f"  ✅ Quests Completadas: {stats[5]}")
+    print(f"  🕒 Contadores atualizados em {stats[6].strftime('%Y-%m-%d %H:%M:%S')} (mantidos por triggers)")
     print()
-    
-    cursor.close()
-    conn.close()
 
-def show_hero_ranking():
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    print("🏆 RANKING DE HERÓIS")
-    print_separator('-')
+def page_key(row):
+    return (row[3], row[4], row[6])
+
+def fetch_ranking(cursor, page, size=RANKING_PAGE_SIZE):
+    kind, value = page
+    if kind == 'after':
+        cursor.run('ranking_page_after', (*value, size))
+    elif kind == 'rank':
+        cursor.run('ranking_at_rank', (value, size))
+    elif kind == 'around':
+        cursor.run('ranking_around_hero', (value, RANKING_AROUND, RANKING_AROUND + 1))
+        # Vizinhos de cima vêm em ordem crescente: reordena pela ordem do ranking
+        return sorted(cursor.fetchall(), key=page_key, reverse=True)
+    else:
+        cursor.run('ranking_first_page', (size,))
+    return cursor.fetchall()
+
+def show_hero_ranking(page=('first', None)):
+    with db.cursor() as cursor:
+        print("🏆 RANKING DE HERÓIS")
+        print_separator('-')
+        
+        rows = fetch_ranking(cursor, page)
+        cursor.run('ranking_freshness')
+        freshness = cursor.fetchone()
     
-    cursor.execute("""
-        SELECT ranking, name, class, level, experience, gold 
-        FROM hero_ranking
-    """)
+    kind, value = page
+    if kind == 'rank':
+        print(f"  📍 A partir da posição #{value}")
+    elif kind == 'around':
+        print(f"  📍 Heróis ao redor do herói {value}")
     
-    for row in cursor.fetchall():
+    for row in rows:
         rank_emoji = "🥇" if row[0] == 1 else "🥈" if row[0] == 2 else "🥉" if row[0] == 3 else "  "
-        print(f"  {rank_emoji} #{row[0]} - {row[1]}")
+        marker = " 👈" if kind == 'around' and row[6] == value else ""
+        print(f"  {rank_emoji} #{row[0]} - {row[1]}{marker}")
         print(f"       Classe: {row[2]} | Nível: {row[3]} | XP: {row[4]:,} | Ouro: {row[5]:,}")
     
+    if not rows:
+        print("  📭 Nenhum herói nesta página")
+    
     print()
-    cursor.close()
-    conn.close()
+    print_ranking_freshness(freshness)
+    print()
+    return rows
 
-def show_available_quests():
-    conn = get_connection()
-    cursor = conn.cursor()
+def browse_ranking():
+    page = ('first', None)
+    history = []
     
-    print("📜 QUESTS DISPONÍVEIS NO QUADRO DE AVISOS")
-    print_separator('-')
-    
-    cursor.execute("""
-        SELECT title, difficulty, reward_xp, reward_gold, status 
-        FROM quests 
-        WHERE status = 'available'
-        ORDER BY 
-            CASE difficulty 
-                WHEN 'Fácil' THEN 1 
-                WHEN 'Médio' THEN 2 
-                WHEN 'Difícil' THEN 3 
-            END
-    """)
+    while True:
+        rows = run_command(show_hero_ranking, page)
+        print("  [Enter] próxima | v - voltar | r <posição> - ir para posição | h <id> - ao redor do herói | s - sair")
+        command = input("Ranking> ").strip().lower()
+        print()
+        
+        if command == '':
+            if not rows or (len(rows) < RANKING_PAGE_SIZE and page[0] != 'around'):
+                print("🏁 Fim do ranking")
+                continue
+            history.append(page)
+            page = ('after', page_key(rows[-1]))
+        elif command == 'v':
+            page = history.pop() if history else ('first', None)
+        elif command.startswith('r ') and command[2:].strip().isdigit() and int(command[2:]) > 0:
+            history.append(page)
+            page = ('rank', int(command[2:]))
+        elif command.startswith('h ') and command[2:].strip().isdigit():
+            history.append(page)
+            page = ('around', int(command[2:]))
+        elif command == 's':
+            break
+        else:
+            print("❌ Comando inválido!")
+
+def print_ranking_freshness(freshness):
+    if freshness is None:
+        print("  ⚠️  Ranking materializado ainda não foi atualizado")
+        return
+    refreshed_at, age, stale, duration_ms = freshness
+    status = "⏳ há mudanças em heroes depois disso" if stale else "✅ em dia"
+    print(f"  🕒 Ranking materializado em {refreshed_at.strftime('%H:%M:%S')} "
+        f"(há {age:.0f}s, refresh de {duration_ms} ms) - {status}")
+
+def show_available_quests():
+    with db.cursor() as cursor:
+        print("📜 QUESTS DISPONÍVEIS NO QUADRO DE AVISOS")
+        print_separator('-')
+        
+        cursor.run('available_quests')
+        rows = cursor.fetchall()
     
-    for row in cursor.fetchall():
+    for row in rows:
         difficulty_emoji = "🟢" if row[1] == "Fácil" else "🟡" if row[1] == "Médio" else "🔴"
         print(f"  {difficulty_emoji} {row[0]}")
         print(f"       Dificuldade: {row[1]} | Recompensa: {row[2]} XP + {row[3]} Ouro")
     
     print()
-    cursor.close()
-    conn.close()
 
 def create_new_hero():
-    conn = get_connection()
-    cursor = conn.cursor()
-    
     first_names = ["Aldric", "Brienne", "Cedric", "Diana", "Erik", "Fiona", "Gareth", "Helena"]
     last_names = ["o Valente", "a Sábia", "das Sombras", "de Ferro", "Flamejante", "Gélida"]
     classes = ["Guerreiro", "Mago", "Ranger", "Clérigo", "Paladino", "Ladino"]
@@ -124,14 +248,9 @@ def create_new_hero():
     name = f"{random.choice(first_names)} {random.choice(last_names)}"
     hero_class = random.choice(classes)
     
-    cursor.execute("""
-        INSERT INTO heroes (name, class, level, experience, health_points, mana_points, gold)
-        VALUES (%s, %s, 1, 0, 100, 50, 100)
-        RETURNING id, name, class
-    """, (name, hero_class))
-    
-    hero = cursor.fetchone()
-    conn.commit()
+    with db.cursor() as cursor:
+        cursor.run('create_hero', (name, hero_class))
+        hero = cursor.fetchone()
     
     print("✨ NOVO HERÓI CHEGOU À TAVERNA!")
     print_separator('-')
@@ -141,33 +260,31 @@ def create_new_hero():
     print(f"  Nível: 1")
     print(f"  💰 Ouro inicial: 100")
     print()
-    
-    cursor.close()
-    conn.close()
 
-def show_hero_inventory(hero_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT name FROM heroes WHERE id = %s", (hero_id,))
-    hero = cursor.fetchone()
-    
-    if not hero:
-        print(f"❌ Herói com ID {hero_id} não encontrado!")
-        return
-    
-    print(f"🎒 INVENTÁRIO DE {hero[0]}")
+def fetch_heroes_details(cursor, hero_ids, inventory=True, achievements=True):
+    # {hero_id: (nome, itens, conquistas)} só para os heróis que existem
+    hero_ids = list(dict.fromkeys(hero_ids))
+    if not hero_ids:
+        return {}
+    
+    cursor.run('heroes_details', (inventory, achievements, hero_ids))
+    rows = {row[0]: row[1:] for row in cursor.fetchall()}
+    
+    details = {}
+    for hero_id in hero_ids:
+        if hero_id not in rows:
+            continue
+        name, items, unlocked = rows[hero_id]
+        # O JSON traz o timestamp como texto ISO
+        unlocked = [(title, description, datetime.fromisoformat(unlocked_at))
+            for title, description, unlocked_at in unlocked or []]
+        details[hero_id] = (name, [tuple(item) for item in items or []], unlocked)
+    return details
+
+def print_inventory(name, items):
+    print(f"🎒 INVENTÁRIO DE {name}")
     print_separator('-')
     
-    cursor.execute("""
-        SELECT item_name, item_type, quantity, power 
-        FROM inventory 
-        WHERE hero_id = %s
-        ORDER BY item_type, power DESC
-    """, (hero_id,))
-    
-    items = cursor.fetchall()
-    
     if items:
         for item in items:
             type_emoji = "⚔️" if item[1] == "Arma" else "🛡️" if item[1] == "Escudo" or item[1] == "Armadura" else "📦"
@@ -177,32 +294,11 @@ def show_hero_inventory(hero_id):
         print("  📭 Inventário vazio")
     
     print()
-    cursor.close()
-    conn.close()
 
-def show_achievements(hero_id):
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT name FROM heroes WHERE id = %s", (hero_id,))
-    hero = cursor.fetchone()
-    
-    if not hero:
-        print(f"❌ Herói com ID {hero_id} não encontrado!")
-        return
-    
-    print(f"🏅 CONQUISTAS DE {hero[0]}")
+def print_achievements(name, achievements):
+    print(f"🏅 CONQUISTAS DE {name}")
     print_separator('-')
     
-    cursor.execute("""
-        SELECT achievement_name, achievement_description, unlocked_at 
-        FROM achievements 
-        WHERE hero_id = %s
-        ORDER BY unlocked_at DESC
-    """, (hero_id,))
-    
-    achievements = cursor.fetchall()
-    
     if achievements:
         for ach in achievements:
             print(f"  {ach[0]}")
@@ -212,8 +308,52 @@ def show_achievements(hero_id):
         print("  📭 Nenhuma conquista desbloqueada ainda")
     
     print()
-    cursor.close()
-    conn.close()
+
+def show_heroes_details(hero_ids, inventory=True, achievements=True):
+    with db.cursor() as cursor:
+        details = fetch_heroes_details(cursor, hero_ids, inventory, achievements)
+    
+    for hero_id in dict.fromkeys(hero_ids):
+        if hero_id not in details:
+            print(f"❌ Herói com ID {hero_id} não encontrado!")
+            continue
+        name, items, unlocked = details[hero_id]
+        if inventory:
+            print_inventory(name, items)
+        if achievements:
+            print_achievements(name, unlocked)
+
+def show_hero_inventory(hero_id):
+    show_heroes_details([hero_id], achievements=False)
+
+def show_achievements(hero_id):
+    show_heroes_details([hero_id], inventory=False)
+
+def parse_hero_ids(text):
+    # "1, 2 3" -> [1, 2, 3]
+    ids = text.replace(',', ' ').split()
+    return [int(hero_id) for hero_id in ids] if ids and all(hero_id.isdigit() for hero_id in ids) else []
+
+def refresh_ranking_now():
+    with db.cursor() as cursor:
+        cursor.run('refresh_ranking')
+        duration_ms = cursor.fetchone()[0]
+    print(f"🔄 Ranking materializado atualizado em {duration_ms} ms")
+    print()
+
+def bulk_create_heroes(count, method='copy'):
+    print(f"🏭 GERANDO {count:,} HERÓIS EM MASSA ({method})")
+    print_separator('-')
+    totals, elapsed = seed_heroes(db, count, method=method)
+    print_report(totals, elapsed, method)
+    print()
+
+def run_command(command, *args):
+    start = time.perf_counter()
+    result = command(*args)
+    if SHOW_TIMINGS:
+        print(f"⏱️  {command.__name__}: {(time.perf_counter() - start) * 1000:.2f} ms")
+    return result
 
 def interactive_mode():
     show_welcome()
@@ -225,8 +365,10 @@ def interactive_mode():
         print("  2️⃣  - Mostrar ranking de heróis")
         print("  3️⃣  - Mostrar quests disponíveis")
         print("  4️⃣  - Criar novo herói")
-        print("  5️⃣  - Ver inventário de herói")
-        print("  6️⃣  - Ver conquistas de herói")
+        print("  5️⃣  - Ver inventário de herói(s)")
+        print("  6️⃣  - Ver conquistas de herói(s)")
+        print("  7️⃣  - Gerar heróis em massa")
+        print("  8️⃣  - Atualizar ranking materializado agora")
         print("  0️⃣  - Sair")
         print()
         
@@ -234,21 +376,27 @@ def interactive_mode():
         print()
         
         if choice == '1':
-            show_tavern_stats()
+            run_command(show_tavern_stats)
         elif choice == '2':
-            show_hero_ranking()
+            browse_ranking()
         elif choice == '3':
-            show_available_quests()
+            run_command(show_available_quests)
         elif choice == '4':
-            create_new_hero()
+            run_command(create_new_hero)
         elif choice == '5':
-            hero_id = input("Digite o ID do herói: ").strip()
-            if hero_id.isdigit():
-                show_hero_inventory(int(hero_id))
+            hero_ids = parse_hero_ids(input("Digite o(s) ID(s) do(s) herói(s): "))
+            if hero_ids:
+                run_command(show_heroes_details, hero_ids, True, False)
         elif choice == '6':
-            hero_id = input("Digite o ID do herói: ").strip()
-            if hero_id.isdigit():
-                show_achievements(int(hero_id))
+            hero_ids = parse_hero_ids(input("Digite o(s) ID(s) do(s) herói(s): "))
+            if hero_ids:
+                run_command(show_heroes_details, hero_ids, False, True)
+        elif choice == '7':
+            count = input("Quantos heróis? ").strip()
+            if count.isdigit():
+                run_command(bulk_create_heroes, int(count))
+        elif choice == '8':
+            run_command(refresh_ranking_now)
         elif choice == '0':
             print("👋 Até logo, Game Master!")
             break
@@ -261,19 +409,18 @@ def demo_mode():
     print("🎬 MODO DEMONSTRAÇÃO - Exibindo dados da taverna\n")
     time.sleep(2)
     
-    show_tavern_stats()
+    run_command(show_tavern_stats)
     time.sleep(3)
     
-    show_hero_ranking()
+    run_command(show_hero_ranking)
     time.sleep(3)
     
-    show_available_quests()
+    run_command(show_available_quests)
     time.sleep(3)
     
     print("🎒 Exibindo inventário dos heróis principais...\n")
-    for hero_id in [1, 2, 3]:
-        show_hero_inventory(hero_id)
-        time.sleep(2)
+    run_command(show_heroes_details, [1, 2, 3], True, False)
+    time.sleep(2)
     
     print("✅ Demonstração concluída!")
     print("💾 Todos os dados estão sendo persistidos no volume Docker")
@@ -283,12 +430,21 @@ def main():
     if not wait_for_database():
         sys.exit(1)
     
+    migrate(db)
+    
     mode = sys.argv[1] if len(sys.argv) > 1 else 'demo'
     
-    if mode == 'interactive':
-        interactive_mode()
-    else:
-        demo_mode()
+    try:
+        if mode == 'interactive':
+            interactive_mode()
+        elif mode == 'seed':
+            count = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+            method = sys.argv[3] if len(sys.argv) > 3 else 'copy'
+            bulk_create_heroes(count, method)
+        else:
+            demo_mode()
+    finally:
+        db.close()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,64 @@
+import os
+import sys
+
+MIGRATIONS_DIR = os.environ.get('MIGRATIONS_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations'))
+
+# Chave do advisory lock: Game Master e refresher podem subir juntos
+MIGRATIONS_LOCK = 7_414_171
+
+def list_migrations(directory=MIGRATIONS_DIR):
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith('.sql'):
+            version, _, name = filename[:-4].partition('_')
+            migrations.append((version, name, os.path.join(directory, filename)))
+    return migrations
+
+def migrate(db, directory=MIGRATIONS_DIR):
+    # Cada migração roda na sua transação e registra a si mesma em
+    # schema_migrations (o mesmo arquivo roda no init de um volume novo)
+    applied_now = []
+    with db.connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATIONS_LOCK,))
+            try:
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS schema_migrations (
+                        version TEXT PRIMARY KEY,
+                        name TEXT NOT NULL,
+                        applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                    )
+                """)
+                conn.commit()
+                cursor.execute("SELECT version FROM schema_migrations")
+                applied = {row[0] for row in cursor.fetchall()}
+
+                for version, name, path in list_migrations(directory):
+                    if version in applied:
+                        continue
+                    print(f"🧱 Aplicando migração {version} ({name})...")
+                    with open(path, encoding='utf-8') as f:
+                        cursor.execute(f.read())
+                    conn.commit()
+                    applied_now.append(version)
+            finally:
+                conn.rollback()
+                cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATIONS_LOCK,))
+    return applied_now
+
+def main():
+    import game_master
+    if not game_master.wait_for_database():
+        sys.exit(1)
+    try:
+        applied = migrate(game_master.db)
+    finally:
+        game_master.db.close()
+    if applied:
+        print(f"✅ {len(applied)} migração(ões) aplicada(s): {', '.join(applied)}")
+    else:
+        print("✅ Schema em dia, nenhuma migração pendente")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import os
+import signal
+import sys
+import time
+from datetime import datetime
+
+import psycopg2
+
+from db import DatabasePool
+
+RANKING_REFRESH_INTERVAL = float(os.environ.get('RANKING_REFRESH_INTERVAL', 5))
+RANKING_REFRESH_MAX_AGE = float(os.environ.get('RANKING_REFRESH_MAX_AGE', 300))
+
+STATEMENTS = {
+    'ranking_needs_refresh': """
+        SELECT c.heroes_changed_at > r.source_changed_at,
+               EXTRACT(EPOCH FROM now() - r.refreshed_at)
+        FROM tavern_counters c
+        LEFT JOIN materialized_refreshes r ON r.view_name = 'hero_ranking'
+    """,
+    'refresh_ranking': "SELECT refresh_hero_ranking()"
+}
+
+db = DatabasePool(STATEMENTS, maxconn=1)
+
+def refresh_if_needed():
+    # Barato quando nada mudou: uma leitura da linha de contadores.
+    # Refresh quando heroes mudou desde o último refresh ou, no pior caso,
+    # a cada RANKING_REFRESH_MAX_AGE segundos.
+    with db.cursor() as cursor:
+        cursor.run('ranking_needs_refresh')
+        changed, age = cursor.fetchone()
+        if changed is False and age < RANKING_REFRESH_MAX_AGE:
+            return None
+        cursor.run('refresh_ranking')
+        return cursor.fetchone()[0]
+
+def main():
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"🔄 Refresher do ranking: verificando mudanças a cada {RANKING_REFRESH_INTERVAL:g}s")
+
+    while True:
+        try:
+            duration_ms = refresh_if_needed()
+            if duration_ms is not None:
+                print(f"🏆 [{datetime.now().strftime('%H:%M:%S')}] hero_ranking atualizado em {duration_ms} ms")
+        except psycopg2.Error as e:
+            print(f"❌ Erro ao atualizar o ranking: {e}")
+        time.sleep(RANKING_REFRESH_INTERVAL)
+
+if __name__ == '__main__':
+    try:
+        main()
+    finally:
+        db.close()
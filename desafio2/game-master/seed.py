@@ -0,0 +1,129 @@
+import argparse
+import io
+import random
+import time
+
+from psycopg2.extras import execute_values
+
+FIRST_NAMES = ("Aldric", "Brienne", "Cedric", "Diana", "Erik", "Fiona", "Gareth", "Helena",
+    "Ivar", "Jora", "Kael", "Lyra", "Magnus", "Nadia", "Osric", "Petra")
+LAST_NAMES = ("o Valente", "a Sábia", "das Sombras", "de Ferro", "Flamejante", "Gélida",
+    "do Norte", "Lâmina Rubra", "Coração de Pedra", "da Tempestade")
+CLASSES = ("Guerreiro", "Mago", "Ranger", "Clérigo", "Paladino", "Ladino")
+ITEMS = (
+    ('Espada Longa', 'Arma'), ('Machado de Guerra', 'Arma'), ('Cajado Rúnico', 'Arma'),
+    ('Arco Composto', 'Arma'), ('Escudo de Carvalho', 'Escudo'), ('Cota de Malha', 'Armadura'),
+    ('Manto Encantado', 'Armadura'), ('Poção de Vida', 'Consumível'), ('Poção de Mana', 'Consumível'),
+    ('Flechas de Prata', 'Munição'), ('Pergaminho Antigo', 'Livro')
+)
+ACHIEVEMENTS = (
+    ('🏆 Primeira Vitória', 'Venceu sua primeira batalha'),
+    ('⚔️ Matador de Dragões', 'Derrotou um dragão'),
+    ('📚 Mestre dos Feitiços', 'Aprendeu 50 feitiços diferentes'),
+    ('🎯 Olho de Águia', 'Acertou 100 tiros críticos'),
+    ('💎 Caçador de Tesouros', 'Encontrou 10 tesouros lendários'),
+    ('🛡️ Muralha Viva', 'Bloqueou 1000 ataques')
+)
+
+HERO_COLUMNS = ('id', 'name', 'class', 'level', 'experience', 'health_points', 'mana_points', 'gold')
+INVENTORY_COLUMNS = ('hero_id', 'item_name', 'item_type', 'quantity', 'power')
+ACHIEVEMENT_COLUMNS = ('hero_id', 'achievement_name', 'achievement_description')
+
+def generate_batch(hero_ids, rng):
+    heroes, inventory, achievements = [], [], []
+    for hero_id in hero_ids:
+        level = rng.randint(1, 60)
+        hero_class = rng.choice(CLASSES)
+        mana = 150 + level * 5 if hero_class in ("Mago", "Clérigo") else 30 + level
+        heroes.append((hero_id, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", hero_class,
+            level, level * 150 + rng.randrange(150), 100 + level * 4, mana, rng.randrange(50, 5000)))
+        for _ in range(rng.randrange(6)):
+            item_name, item_type = rng.choice(ITEMS)
+            quantity = rng.randint(1, 20) if item_type in ('Consumível', 'Munição') else 1
+            inventory.append((hero_id, item_name, item_type, quantity, rng.randint(5, 50) + level * 2))
+        for achievement in rng.sample(ACHIEVEMENTS, rng.randrange(3)):
+            achievements.append((hero_id,) + achievement)
+    return heroes, inventory, achievements
+
+def copy_escape(value):
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+def load_copy(cursor, table, columns, rows):
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(copy_escape(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+def load_values(cursor, table, columns, rows):
+    execute_values(cursor, f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s", rows, page_size=1000)
+
+LOADERS = {
+    'copy': load_copy,
+    'values': load_values
+}
+
+def seed_heroes(db, count, batch_size=50_000, method='copy', seed=None):
+    # Gera `count` heróis com inventário e conquistas, um lote por transação.
+    # Os ids vêm da própria sequence (nextval em lote), então o seed pode rodar
+    # junto com o Game Master criando heróis.
+    load = LOADERS[method]
+    rng = random.Random(seed)
+    totals = {'heroes': 0, 'inventory': 0, 'achievements': 0}
+    start = time.perf_counter()
+
+    with db.connection() as conn:
+        with conn.cursor() as cursor:
+            for offset in range(0, count, batch_size):
+                size = min(batch_size, count - offset)
+                cursor.execute("SELECT nextval('heroes_id_seq') FROM generate_series(1, %s)", (size,))
+                hero_ids = [row[0] for row in cursor.fetchall()]
+
+                heroes, inventory, achievements = generate_batch(hero_ids, rng)
+                load(cursor, 'heroes', HERO_COLUMNS, heroes)
+                load(cursor, 'inventory', INVENTORY_COLUMNS, inventory)
+                load(cursor, 'achievements', ACHIEVEMENT_COLUMNS, achievements)
+                conn.commit()
+
+                totals['heroes'] += len(heroes)
+                totals['inventory'] += len(inventory)
+                totals['achievements'] += len(achievements)
+                elapsed = time.perf_counter() - start
+                rows = sum(totals.values())
+                print(f"  🌱 {totals['heroes']:,}/{count:,} heróis | {rows:,} linhas | {rows / elapsed:,.0f} linhas/s")
+
+            cursor.execute("ANALYZE heroes, inventory, achievements")
+
+    return totals, time.perf_counter() - start
+
+def print_report(totals, elapsed, method):
+    rows = sum(totals.values())
+    print()
+    print(f"✅ CARGA CONCLUÍDA ({method}) em {elapsed:.1f}s")
+    print(f"  👥 Heróis: {totals['heroes']:,}")
+    print(f"  🎒 Itens: {totals['inventory']:,}")
+    print(f"  🏅 Conquistas: {totals['achievements']:,}")
+    print(f"  ⚡ {rows:,} linhas | {rows / elapsed:,.0f} linhas/s | {totals['heroes'] / elapsed:,.0f} heróis/s")
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera heróis em massa com inventário e conquistas')
+    parser.add_argument('count', type=int)
+    parser.add_argument('--batch-size', type=int, default=50_000, help='heróis por transação')
+    parser.add_argument('--method', choices=sorted(LOADERS), default='copy')
+    parser.add_argument('--seed', type=int, help='semente do gerador aleatório')
+    args = parser.parse_args()
+
+    import game_master
+    if not game_master.wait_for_database():
+        return
+
+    print(f"🏭 Gerando {args.count:,} heróis ({args.method}, lotes de {args.batch_size:,})...")
+    try:
+        totals, elapsed = seed_heroes(game_master.db, args.count, args.batch_size, args.method, args.seed)
+    finally:
+        game_master.db.close()
+    print_report(totals, elapsed, args.method)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from bench_stats import cleanup, seed
+from db import ReaderConnection
+from export import WRITERS, export_sql, export_table
+
+def child(mode, fmt, limit, itersize):
+    # Roda num processo novo para o pico de memória (ru_maxrss) ser só desta exportação
+    reader = ReaderConnection()
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as out:
+        if mode == 'fetchall':
+            columns, sql = export_sql('heroes', limit)
+            count = WRITERS[fmt](reader.query(sql), columns, out)
+        else:
+            count = export_table(reader, 'heroes', fmt, out, itersize, limit)
+    elapsed = time.perf_counter() - start
+    reader.close()
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({'rows': count, 'elapsed': elapsed, 'peak_mib': peak_mib}))
+
+def run_child(mode, fmt, limit, itersize):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', mode, '--format', fmt,
+            '--limit', str(limit), '--itersize', str(itersize)],
+        check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='Pico de memória da exportação: fetchall() vs cursor no servidor')
+    parser.add_argument('--heroes', type=int, default=2_000_000)
+    parser.add_argument('--sizes', default='100000,500000,2000000', help='linhas exportadas em cada rodada')
+    parser.add_argument('--format', choices=sorted(WRITERS), default='csv')
+    parser.add_argument('--itersize', type=int, default=2000)
+    parser.add_argument('--keep', action='store_true', help='não remove as linhas geradas ao final')
+    parser.add_argument('--child', choices=('fetchall', 'stream'), help=argparse.SUPPRESS)
+    parser.add_argument('--limit', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.format, args.limit, args.itersize)
+        return
+
+    print("=" * 70)
+    print("📤 BENCHMARK DE EXPORTAÇÃO: memória do cliente por tamanho da tabela")
+    print("=" * 70)
+
+    elapsed = seed(args.heroes, 0)
+    print(f"🌱 {args.heroes:,} heróis gerados em {elapsed:.1f}s")
+    print()
+
+    try:
+        print(f"{'linhas':>12} | {'fetchall() pico':>16} {'tempo':>8} | {'streaming pico':>15} {'tempo':>8}")
+        for size in (int(value) for value in args.sizes.split(',')):
+            fetchall = run_child('fetchall', args.format, size, args.itersize)
+            stream = run_child('stream', args.format, size, args.itersize)
+            print(f"{stream['rows']:>12,} | {fetchall['peak_mib']:>12.1f} MiB {fetchall['elapsed']:>7.1f}s | "
+                f"{stream['peak_mib']:>11.1f} MiB {stream['elapsed']:>7.1f}s")
+    finally:
+        if not args.keep:
+            cleanup()
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
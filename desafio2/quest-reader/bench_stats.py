@@ -0,0 +1,119 @@
+import argparse
+import time
+
+import psycopg2
+
+from db import DB_CONFIG, ReaderConnection
+from stats import StatsCollector
+
+BENCH_PREFIX = 'bench-'
+
+def legacy_counts():
+    # Caminho antigo do verify_data_persistence: conexão nova + 4 COUNT(*)
+    conn = psycopg2.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+    counts = []
+    for table in ('heroes', 'quests', 'inventory', 'achievements'):
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        counts.append(cursor.fetchone()[0])
+    cursor.close()
+    conn.close()
+    return counts
+
+def legacy_summary():
+    # Caminho antigo do continuous_reading: conexão nova + 3 consultas
+    conn = psycopg2.connect(**DB_CONFIG)
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM heroes")
+    heroes = cursor.fetchone()[0]
+    cursor.execute("SELECT COUNT(*) FROM quests WHERE status = 'completed'")
+    completed = cursor.fetchone()[0]
+    cursor.execute("SELECT SUM(gold) FROM heroes")
+    total_gold = cursor.fetchone()[0] or 0
+    cursor.close()
+    conn.close()
+    return heroes, completed, total_gold
+
+def seed(heroes, items):
+    conn = psycopg2.connect(**DB_CONFIG)
+    conn.autocommit = True
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    cursor.execute("""
+        INSERT INTO heroes (name, class, level, experience, gold)
+        SELECT %s || g, 'Guerreiro', 1 + g %% 50, g %% 10000, g %% 5000
+        FROM generate_series(1, %s) AS g
+    """, (BENCH_PREFIX, heroes))
+    cursor.execute("SELECT MIN(id), MAX(id) FROM heroes WHERE name LIKE %s", (BENCH_PREFIX + '%',))
+    first_id, last_id = cursor.fetchone()
+    cursor.execute("""
+        INSERT INTO inventory (hero_id, item_name, item_type, quantity, power)
+        SELECT %s + g %% (%s - %s + 1), 'Poção de Vida', 'Consumível', 1, g %% 100
+        FROM generate_series(1, %s) AS g
+    """, (first_id, last_id, first_id, items))
+    cursor.execute("VACUUM ANALYZE heroes")
+    cursor.execute("VACUUM ANALYZE inventory")
+    conn.close()
+    return time.perf_counter() - start
+
+def cleanup():
+    conn = psycopg2.connect(**DB_CONFIG)
+    conn.autocommit = True
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM heroes WHERE name LIKE %s", (BENCH_PREFIX + '%',))
+    cursor.execute("VACUUM ANALYZE heroes")
+    cursor.execute("VACUUM ANALYZE inventory")
+    conn.close()
+
+def timed(fn, iterations):
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return latencies[len(latencies) // 2] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='Coleta de estatísticas: caminho antigo vs uma ida ao banco')
+    parser.add_argument('--heroes', type=int, default=2_000_000)
+    parser.add_argument('--items', type=int, default=5_000_000)
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--keep', action='store_true', help='não remove as linhas geradas ao final')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("📊 BENCHMARK DE ESTATÍSTICAS DO QUEST READER")
+    print("=" * 70)
+
+    elapsed = seed(args.heroes, args.items)
+    print(f"🌱 {args.heroes:,} heróis + {args.items:,} itens gerados em {elapsed:.1f}s")
+    print()
+
+    reader = ReaderConnection()
+    exact = StatsCollector(reader, estimate_threshold='off')
+    estimated = StatsCollector(reader, estimate_threshold='1000000')
+    try:
+        rows = (
+            ('contagens: 4 consultas, conexão nova', legacy_counts),
+            ('contagens: 1 consulta, exatas', exact.counts),
+            ('contagens: 1 consulta, reltuples', estimated.counts),
+            ('resumo: 3 consultas, conexão nova', legacy_summary),
+            ('resumo: 1 consulta', exact.summary)
+        )
+        for label, fn in rows:
+            print(f"   {label:<40} {timed(fn, args.iterations):>10.2f} ms (mediana)")
+
+        print()
+        exact_counts = exact.counts()
+        for table, count in estimated.counts().items():
+            print(f"   {table:<14} exato {exact_counts[table].rows:>12,} | exibido {str(count):>12}")
+        print(f"🔌 Conexões abertas pelo leitor de longa duração: {reader.connects}")
+    finally:
+        reader.close()
+        if not args.keep:
+            cleanup()
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
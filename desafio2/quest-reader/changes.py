@@ -0,0 +1,106 @@
+import json
+import os
+import select
+
+import psycopg2
+
+from db import DB_CONFIG
+
+CHANGES_CHANNEL = 'tavern_changes'
+CHANGES_HEARTBEAT = float(os.environ.get('CHANGES_HEARTBEAT', 30))
+
+TRIGGERS_SQL = """
+    SELECT COUNT(*) FROM pg_trigger
+    WHERE tgname IN ('heroes_notify_insert', 'heroes_notify_update', 'heroes_notify_delete',
+                     'quests_notify_insert', 'quests_notify_update', 'quests_notify_delete')
+"""
+
+class Snapshot:
+    # Snapshot do Postgres no formato "xmin:xmax:xip1,xip2,..."
+    def __init__(self, text):
+        xmin, xmax, xip = text.split(':')
+        self.xmin = int(xmin)
+        self.xmax = int(xmax)
+        self.in_progress = {int(xid) for xid in xip.split(',') if xid}
+
+    def visible(self, xid):
+        if xid < self.xmin:
+            return True
+        if xid >= self.xmax:
+            return False
+        return xid not in self.in_progress
+
+class ResyncNeeded(Exception):
+    pass
+
+class TavernCounters:
+    def __init__(self, summary):
+        self.heroes = summary['heroes']
+        self.total_gold = summary['total_gold']
+        self.completed_quests = summary['completed_quests']
+        self.snapshot = Snapshot(summary['snapshot'])
+
+    def apply(self, event):
+        # Retorna True se os contadores mudaram; levanta ResyncNeeded se só
+        # uma recontagem completa resolve (TRUNCATE)
+        if self.snapshot.visible(int(event['xid'])):
+            # Transação já estava na recontagem
+            return False
+        if event.get('truncate'):
+            raise ResyncNeeded(event['table'])
+        self.heroes += event.get('heroes', 0)
+        self.total_gold += event.get('total_gold', 0)
+        self.completed_quests += event.get('completed_quests', 0)
+        return True
+
+class ChangeListener:
+    def __init__(self, channel=CHANGES_CHANNEL, config=DB_CONFIG, heartbeat=CHANGES_HEARTBEAT):
+        self.channel = channel
+        self.config = config
+        self.heartbeat = heartbeat
+        self.conn = None
+        self.connects = 0
+        self.events = 0
+
+    def connect(self):
+        self.conn = psycopg2.connect(**self.config)
+        self.conn.autocommit = True
+        with self.conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.channel}")
+        self.connects += 1
+
+    def query_one(self, sql, params=None):
+        with self.conn.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchone()
+
+    def triggers_installed(self):
+        return self.query_one(TRIGGERS_SQL)[0] == 6
+
+    def drain(self):
+        events = [json.loads(notify.payload) for notify in self.conn.notifies]
+        self.conn.notifies.clear()
+        self.events += len(events)
+        return events
+
+    def wait(self):
+        # Bloqueia até chegar notificação ou dar o heartbeat; sem mudanças no
+        # banco, a única carga é um SELECT 1 a cada CHANGES_HEARTBEAT segundos.
+        # Notificações que chegam durante outra consulta nesta conexão (o
+        # heartbeat, a checagem dos triggers, a recontagem) o psycopg2 já tirou
+        # do socket e enfileirou em conn.notifies: o select não as veria
+        if self.conn.notifies:
+            return self.drain()
+        if select.select([self.conn], [], [], self.heartbeat) == ([], [], []):
+            self.query_one("SELECT 1")
+            return self.drain()
+        self.conn.poll()
+        return self.drain()
+
+    def close(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except psycopg2.Error:
+                pass
+            self.conn = None
@@ -0,0 +1,74 @@
+import os
+import time
+
+import psycopg2
+
+DB_CONFIG = {
+    'dbname': 'tavern_rpg',
+    'user': 'gamemaster',
+    'password': 'hero123',
+    'host': 'tavern-database',
+    'port': '5432'
+}
+
+DB_RECONNECT_DELAY = float(os.environ.get('DB_RECONNECT_DELAY', 2))
+EXPORT_ITERSIZE = int(os.environ.get('EXPORT_ITERSIZE', 2000))
+
+class ReaderConnection:
+    def __init__(self, config=DB_CONFIG, reconnect_delay=DB_RECONNECT_DELAY):
+        self.config = config
+        self.reconnect_delay = reconnect_delay
+        self.conn = None
+        self.connects = 0
+
+    def _connect(self):
+        if self.connects:
+            print("🔌 Reconectando ao banco de dados...")
+            time.sleep(self.reconnect_delay)
+        self.conn = psycopg2.connect(**self.config)
+        # Só leitura e sem transação aberta entre leituras
+        self.conn.set_session(readonly=True, autocommit=True)
+        self.connects += 1
+
+    def query(self, sql, params=None):
+        # Leituras são idempotentes: se a conexão caiu, reconecta e tenta mais uma vez
+        for attempt in range(2):
+            if self.conn is None or self.conn.closed:
+                self._connect()
+            try:
+                with self.conn.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    return cursor.fetchall()
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                self.close()
+                if attempt:
+                    raise
+
+    def stream(self, sql, params=None, itersize=EXPORT_ITERSIZE, name='reader_stream'):
+        # Cursor nomeado (DECLARE ... CURSOR no servidor): o psycopg2 busca
+        # `itersize` linhas por vez e a memória do cliente não cresce com a
+        # tabela. Precisa de transação, então sai do autocommit só durante a leitura.
+        if self.conn is None or self.conn.closed:
+            self._connect()
+        self.conn.autocommit = False
+        try:
+            with self.conn.cursor(name=name) as cursor:
+                cursor.itersize = itersize
+                cursor.execute(sql, params)
+                yield from cursor
+        finally:
+            if not self.conn.closed:
+                self.conn.rollback()
+                self.conn.autocommit = True
+
+    def query_one(self, sql, params=None):
+        rows = self.query(sql, params)
+        return rows[0] if rows else None
+
+    def close(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except psycopg2.Error:
+                pass
+            self.conn = None
@@ -0,0 +1,92 @@
+import argparse
+import csv
+import json
+import sys
+import time
+
+from db import EXPORT_ITERSIZE, ReaderConnection
+
+EXPORTS = {
+    'heroes': (
+        ('id', 'name', 'class', 'level', 'experience', 'health_points', 'mana_points', 'gold', 'created_at'),
+        """
+            SELECT id, name, class, level, experience, health_points, mana_points, gold, created_at
+            FROM heroes
+            ORDER BY level DESC, experience DESC
+        """
+    ),
+    'quests': (
+        ('title', 'description', 'difficulty', 'reward_xp', 'reward_gold', 'status', 'created_at'),
+        """
+            SELECT title, description, difficulty, reward_xp, reward_gold, status, created_at
+            FROM quests
+            ORDER BY difficulty_rank, created_at
+        """
+    )
+}
+
+def write_text(rows, columns, out):
+    out.write(' | '.join(columns) + '\n')
+    count = 0
+    for row in rows:
+        out.write(' | '.join(str(value) for value in row) + '\n')
+        count += 1
+    return count
+
+def write_csv(rows, columns, out):
+    writer = csv.writer(out)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+def write_jsonl(rows, columns, out):
+    count = 0
+    for row in rows:
+        out.write(json.dumps(dict(zip(columns, row)), default=str, ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+WRITERS = {
+    'text': write_text,
+    'csv': write_csv,
+    'jsonl': write_jsonl
+}
+
+def export_sql(table, limit=None):
+    columns, sql = EXPORTS[table]
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    return columns, sql
+
+def export_table(reader, table, fmt, out, itersize=EXPORT_ITERSIZE, limit=None):
+    columns, sql = export_sql(table, limit)
+    return WRITERS[fmt](reader.stream(sql, itersize=itersize, name=f"export_{table}"), columns, out)
+
+def main():
+    parser = argparse.ArgumentParser(description='Exporta heróis ou quests em streaming (cursor no servidor)')
+    parser.add_argument('table', choices=sorted(EXPORTS))
+    parser.add_argument('--format', choices=sorted(WRITERS), default='csv')
+    parser.add_argument('--output', help='arquivo de saída (padrão: stdout)')
+    parser.add_argument('--itersize', type=int, default=EXPORT_ITERSIZE, help='linhas buscadas por ida ao servidor')
+    parser.add_argument('--limit', type=int)
+    args = parser.parse_args()
+
+    reader = ReaderConnection()
+    out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        count = export_table(reader, args.table, args.format, out, args.itersize, args.limit)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        reader.close()
+    elapsed = time.perf_counter() - start
+    # Progresso vai para o stderr para não misturar com a exportação no stdout
+    print(f"📤 {count:,} linhas de {args.table} exportadas ({args.format}) em {elapsed:.1f}s "
+        f"({count / elapsed if elapsed else 0:,.0f} linhas/s)", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -2,14 +2,14 @@ import psycopg2
 import time
 import sys
 from datetime import datetime
+from db import DB_CONFIG, ReaderConnection
+from stats import StatsCollector
+from changes import ChangeListener, ResyncNeeded, TavernCounters
+from export import export_sql
 
-DB_CONFIG = {
-    'dbname': 'tavern_rpg',
-    'user': 'gamemaster',
-    'password': 'hero123',
-    'host': 'tavern-database',
-    'port': '5432'
-}
+# Uma conexão de longa duração para todas as leituras
+reader = ReaderConnection()
+stats = StatsCollector(reader)
 
 def wait_for_database(max_retries=30):
     print("⏳ Quest Reader aguardando banco de dados...")
@@ -31,108 +31,70 @@ def print_separator(char='=', length=70):
     print(char * length)
 
 def verify_data_persistence():
-    conn = psycopg2.connect(**DB_CONFIG)
-    cursor = conn.cursor()
-    
     print_separator()
     print("🔍 VERIFICAÇÃO DE PERSISTÊNCIA DE DADOS")
     print_separator()
     print()
     
-    cursor.execute("SELECT COUNT(*) FROM heroes")
-    hero_count = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM quests")
-    quest_count = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM inventory")
-    item_count = cursor.fetchone()[0]
-
-    cursor.execute("SELECT COUNT(*) FROM achievements")
-    achievement_count = cursor.fetchone()[0]
+    counts = stats.counts()
     
     print("✅ DADOS ENCONTRADOS NO VOLUME:")
-    print(f"   👥 Heróis: {hero_count}")
-    print(f"   📜 Quests: {quest_count}")
-    print(f"   🎒 Itens: {item_count}")
-    print(f"   🏅 Conquistas: {achievement_count}")
+    print(f"   👥 Heróis: {counts['heroes']}")
+    print(f"   📜 Quests: {counts['quests']}")
+    print(f"   🎒 Itens: {counts['inventory']}")
+    print(f"   🏅 Conquistas: {counts['achievements']}")
+    if any(count.estimated for count in counts.values()):
+        print("   (~ estimativa do planejador para tabelas muito grandes)")
     print()
     
-    if hero_count > 0:
+    if counts['heroes'].rows > 0:
         print("💾 ✅ PERSISTÊNCIA CONFIRMADA!")
         print("   Os dados sobreviveram à recriação do container!")
     else:
         print("⚠️  Nenhum dado encontrado (primeira execução?)")
     
     print()
-    cursor.close()
-    conn.close()
 
 def read_all_heroes():
-    conn = psycopg2.connect(**DB_CONFIG)
-    cursor = conn.cursor()
-    
     print("📚 LENDO TODOS OS HERÓIS DA TAVERNA")
     print_separator('-')
     
-    cursor.execute("""
-        SELECT id, name, class, level, experience, health_points, mana_points, gold, created_at
-        FROM heroes
-        ORDER BY level DESC, experience DESC
-    """)
-    
-    heroes = cursor.fetchall()
-    
-    if heroes:
-        for hero in heroes:
-            print(f"\n  🦸 ID: {hero[0]} - {hero[1]}")
-            print(f"     Classe: {hero[2]} | Nível: {hero[3]}")
-            print(f"     💚 HP: {hero[5]} | 💙 MP: {hero[6]} | 💰 Ouro: {hero[7]:,}")
-            print(f"     ⚡ XP: {hero[4]:,}")
-            print(f"     📅 Criado em: {hero[8].strftime('%Y-%m-%d %H:%M')}")
-    else:
+    # Streaming por cursor no servidor: imprime enquanto lê, sem fetchall()
+    _, sql = export_sql('heroes')
+    count = 0
+    for hero in reader.stream(sql, name='read_all_heroes'):
+        print(f"\n  🦸 ID: {hero[0]} - {hero[1]}")
+        print(f"     Classe: {hero[2]} | Nível: {hero[3]}")
+        print(f"     💚 HP: {hero[5]} | 💙 MP: {hero[6]} | 💰 Ouro: {hero[7]:,}")
+        print(f"     ⚡ XP: {hero[4]:,}")
+        print(f"     📅 Criado em: {hero[8].strftime('%Y-%m-%d %H:%M')}")
+        count += 1
+    
+    if not count:
         print("  📭 Nenhum herói encontrado")
     
     print()
-    cursor.close()
-    conn.close()
 
 def read_all_quests():
-    conn = psycopg2.connect(**DB_CONFIG)
-    cursor = conn.cursor()
-    
     print("📚 LENDO TODAS AS QUESTS")
     print_separator('-')
     
-    cursor.execute("""
-        SELECT title, description, difficulty, reward_xp, reward_gold, status, created_at
-        FROM quests
-        ORDER BY 
-            CASE difficulty 
-                WHEN 'Fácil' THEN 1 
-                WHEN 'Médio' THEN 2 
-                WHEN 'Difícil' THEN 3 
-            END,
-            created_at
-    """)
-    
-    quests = cursor.fetchall()
-    
-    if quests:
-        for quest in quests:
-            status_emoji = "✅" if quest[5] == "completed" else "🔄" if quest[5] == "in_progress" else "📜"
-            difficulty_emoji = "🟢" if quest[2] == "Fácil" else "🟡" if quest[2] == "Médio" else "🔴"
-            
-            print(f"\n  {status_emoji} {quest[0]}")
-            print(f"     {quest[1]}")
-            print(f"     {difficulty_emoji} Dificuldade: {quest[2]} | Status: {quest[5]}")
-            print(f"     💎 Recompensa: {quest[3]} XP + {quest[4]} Ouro")
-    else:
+    _, sql = export_sql('quests')
+    count = 0
+    for quest in reader.stream(sql, name='read_all_quests'):
+        status_emoji = "✅" if quest[5] == "completed" else "🔄" if quest[5] == "in_progress" else "📜"
+        difficulty_emoji = "🟢" if quest[2] == "Fácil" else "🟡" if quest[2] == "Médio" else "🔴"
+        
+        print(f"\n  {status_emoji} {quest[0]}")
+        print(f"     {quest[1]}")
+        print(f"     {difficulty_emoji} Dificuldade: {quest[2]} | Status: {quest[5]}")
+        print(f"     💎 Recompensa: {quest[3]} XP + {quest[4]} Ouro")
+        count += 1
+    
+    if not count:
         print("  📭 Nenhuma quest encontrada")
     
     print()
-    cursor.close()
-    conn.close()
 
 def continuous_reading():
     print_separator()
@@ -148,24 +110,11 @@ def continuous_reading():
             print(f"\n🔄 Leitura #{iteration} - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             print_separator('-')
             
-            conn = psycopg2.connect(**DB_CONFIG)
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT COUNT(*) FROM heroes")
-            heroes = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM quests WHERE status = 'completed'")
-            completed = cursor.fetchone()[0]
+            summary = stats.summary()
             
-            cursor.execute("SELECT SUM(gold) FROM heroes")
-            total_gold = cursor.fetchone()[0] or 0
-            
-            print(f"  👥 Heróis na taverna: {heroes}")
-            print(f"  ✅ Quests completadas: {completed}")
-            print(f"  💰 Ouro total: {total_gold:,}")
-            
-            cursor.close()
-            conn.close()
+            print(f"  👥 Heróis na taverna: {summary['heroes']}")
+            print(f"  ✅ Quests completadas: {summary['completed_quests']}")
+            print(f"  💰 Ouro total: {summary['total_gold']:,}")
             
             iteration += 1
             time.sleep(10)
@@ -177,6 +126,59 @@ def continuous_reading():
             print(f"\n❌ Erro: {e}")
             time.sleep(5)
 
+def print_counters(counters):
+    print(f"  👥 Heróis na taverna: {counters.heroes}")
+    print(f"  ✅ Quests completadas: {counters.completed_quests}")
+    print(f"  💰 Ouro total: {counters.total_gold:,}")
+
+def event_driven_reading():
+    print_separator()
+    print("📡 QUEST READER - MODO POR EVENTOS (LISTEN/NOTIFY)")
+    print_separator()
+    print("Atualizando os contadores a cada mudança em heroes/quests...")
+    print("(Pressione Ctrl+C para parar)")
+    print()
+    
+    listener = ChangeListener()
+    counters = None
+    while True:
+        try:
+            if listener.conn is None:
+                # LISTEN antes da recontagem: nenhuma mudança se perde entre as duas
+                listener.connect()
+                if not listener.triggers_installed():
+                    print("⚠️  Triggers de notificação ausentes (volume criado antes deles?)")
+                    print("   Voltando para leitura periódica...")
+                    listener.close()
+                    continuous_reading()
+                    return
+                counters = TavernCounters(StatsCollector(listener).summary())
+                print(f"\n🔄 Recontagem completa - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+                print_separator('-')
+                print_counters(counters)
+            
+            changed = False
+            for event in listener.wait():
+                changed = counters.apply(event) or changed
+            if changed:
+                print(f"\n📡 Mudança recebida - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+                print_separator('-')
+                print_counters(counters)
+            
+        except KeyboardInterrupt:
+            print("\n\n👋 Leitura interrompida pelo usuário")
+            break
+        except ResyncNeeded as e:
+            print(f"\n🧹 TRUNCATE em {e}: recontando...")
+            counters = TavernCounters(StatsCollector(listener).summary())
+            print_counters(counters)
+        except psycopg2.Error as e:
+            print(f"\n❌ Conexão perdida: {e}")
+            listener.close()
+            time.sleep(5)
+    
+    listener.close()
+
 def main():
 
     if not wait_for_database():
@@ -192,9 +194,13 @@ def main():
     mode = sys.argv[1] if len(sys.argv) > 1 else 'once'
     if mode == 'continuous':
         continuous_reading()
+    elif mode == 'events':
+        event_driven_reading()
     else:
         print("✅ Leitura concluída!")
         print("💾 Dados lidos do volume persistido com sucesso!")
+    
+    reader.close()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,72 @@
+import os
+
+STATS_ESTIMATE_THRESHOLD = os.environ.get('STATS_ESTIMATE_THRESHOLD', '1000000')
+
+COUNTED_TABLES = ('heroes', 'quests', 'inventory', 'achievements')
+
+def parse_threshold(value):
+    return None if value == 'off' else int(value)
+
+def build_counts_sql(tables):
+    # Uma consulta só. Para cada tabela, se a estimativa do planejador
+    # (pg_class.reltuples, atualizada por ANALYZE/autovacuum) passa do limite,
+    # usa a estimativa. Senão faz o COUNT(*) exato. O subselect do ramo não
+    # escolhido do CASE não é executado.
+    columns = []
+    for table in tables:
+        estimate = f"(SELECT estimate FROM estimates WHERE relname = '{table}')"
+        columns.append(
+            f"CASE WHEN {estimate} >= %(threshold)s THEN {estimate} "
+            f"ELSE (SELECT COUNT(*) FROM {table}) END")
+        columns.append(f"COALESCE({estimate} >= %(threshold)s, false)")
+    names = ', '.join(f"'{table}'" for table in tables)
+    return f"""
+        WITH estimates AS (
+            SELECT relname, reltuples::bigint AS estimate
+            FROM pg_class
+            WHERE relkind = 'r'
+              AND relnamespace = 'public'::regnamespace
+              AND relname IN ({names})
+        )
+        SELECT {', '.join(columns)}
+    """
+
+COUNTS_SQL = build_counts_sql(COUNTED_TABLES)
+
+# Contadores mantidos por triggers (tavern_counters): leitura O(1), consistente
+# com o snapshot porque são atualizados na mesma transação das escritas
+SUMMARY_SQL = """
+    SELECT total_heroes, total_gold, completed_quests, pg_current_snapshot()::text
+    FROM tavern_counters
+"""
+
+class TableCount:
+    __slots__ = ('rows', 'estimated')
+
+    def __init__(self, rows, estimated):
+        self.rows = rows
+        self.estimated = estimated
+
+    def __str__(self):
+        return f"~{self.rows:,}" if self.estimated else f"{self.rows:,}"
+
+class StatsCollector:
+    def __init__(self, reader, estimate_threshold=STATS_ESTIMATE_THRESHOLD):
+        self.reader = reader
+        self.estimate_threshold = parse_threshold(estimate_threshold)
+
+    def counts(self):
+        row = self.reader.query_one(COUNTS_SQL, {'threshold': self.estimate_threshold})
+        return {
+            table: TableCount(row[i * 2], row[i * 2 + 1])
+            for i, table in enumerate(COUNTED_TABLES)
+        }
+
+    def summary(self):
+        heroes, total_gold, completed_quests, snapshot = self.reader.query_one(SUMMARY_SQL)
+        return {
+            'heroes': heroes,
+            'total_gold': total_gold,
+            'completed_quests': completed_quests,
+            'snapshot': snapshot
+        }
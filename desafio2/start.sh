@@ -18,7 +18,7 @@ docker compose build
 echo ""
 
 echo "🚀 Iniciando containers..."
-docker compose up -d tavern-database
+docker compose up -d tavern-database ranking-refresher
 echo ""
 
 echo "⏳ Aguardando banco de dados inicializar..."
@@ -39,6 +39,7 @@ echo "✅ Taverna dos Heróis inicializada com sucesso!"
 echo ""
 echo "📝 Comandos úteis:"
 echo "   • Ver dados: docker compose run --rm quest-reader"
+echo "   • Acompanhar mudanças em tempo real: docker compose run --rm quest-reader python quest_reader.py events"
 echo "   • Modo interativo Game Master: docker compose run --rm game-master python game_master.py interactive"
 echo "   • Ver logs do banco: docker compose logs tavern-database"
 echo "   • Parar tudo: docker compose down"
@@ -40,6 +40,21 @@ for i in "${!battles[@]}"; do
     sleep 2
 done
 
+echo "============================================================"
+echo "🏟️ TORNEIO ELIMINATÓRIO (uma requisição, 8 heróis):"
+echo "============================================================"
+curl -s -X POST $API_URL/tournament \
+  -H "Content-Type: application/json" \
+  -d '{"format": "bracket", "hero_ids": [1, 2, 3, 4, 5, 6, 7, 8]}' \
+  | python3 -c "
+import sys, json
+t = json.load(sys.stdin)
+for number, matches in enumerate(t['rounds'], 1):
+    print(f'Rodada {number}: ' + ' | '.join(f\"{m['hero1_id']} x {m['hero2_id']} -> {m['winner_id']}\" for m in matches))
+print(f\"🏆 Campeão: herói {t['champion_id']} ({t['total']} lutas em {t['elapsed_ms']} ms)\")
+"
+echo ""
+
 echo "============================================================"
 echo "🏆 RANKING ATUALIZADO (do Cache Redis):"
 echo "============================================================"
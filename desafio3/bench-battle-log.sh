@@ -0,0 +1,43 @@
+#!/bin/bash
+
+echo "============================================================"
+echo "📜 BENCHMARK: log das batalhas em texto vs compacto"
+echo "============================================================"
+echo ""
+
+cd "$(dirname "$0")"
+
+API_URL="http://localhost:5000"
+BATTLES=${BATTLES:-2000}
+
+if ! docker info > /dev/null 2>&1; then
+    echo "❌ Docker não está rodando. Por favor, inicie o Docker."
+    exit 1
+fi
+
+wait_for() {
+    echo "⏳ Aguardando $1..."
+    for i in $(seq 1 60); do
+        if curl -sf "$1" > /dev/null; then
+            return 0
+        fi
+        sleep 2
+    done
+    echo "❌ $1 não respondeu"
+    return 1
+}
+
+for storage in text compact; do
+    echo ""
+    echo "🔧 BATTLE_LOG_STORAGE=$storage"
+    echo "------------------------------------------------------------"
+
+    BATTLE_LOG_STORAGE=$storage docker compose up -d --build > /dev/null 2>&1
+    if wait_for $API_URL/health; then
+        python3 bench_battle_log.py --url $API_URL --battles "$BATTLES" --label "⚔️ Arena"
+    fi
+    docker compose down > /dev/null 2>&1
+done
+
+echo ""
+echo "✅ Benchmark concluído!"
@@ -0,0 +1,47 @@
+#!/bin/bash
+
+echo "============================================================"
+echo "🧊 BENCHMARK: rajadas contra o cache frio, com e sem a camada de cache"
+echo "============================================================"
+echo ""
+
+cd "$(dirname "$0")"
+
+API_URL="http://localhost:5000"
+CONCURRENCY=${CONCURRENCY:-200}
+ROUNDS=${ROUNDS:-5}
+
+if ! docker info > /dev/null 2>&1; then
+    echo "❌ Docker não está rodando. Por favor, inicie o Docker."
+    exit 1
+fi
+
+wait_for() {
+    echo "⏳ Aguardando $1..."
+    for i in $(seq 1 60); do
+        if curl -sf "$1" > /dev/null; then
+            return 0
+        fi
+        sleep 2
+    done
+    echo "❌ $1 não respondeu"
+    return 1
+}
+
+for layer in off on; do
+    echo ""
+    echo "🔧 CACHE_LAYER=$layer"
+    echo "------------------------------------------------------------"
+
+    CACHE_LAYER=$layer docker compose up -d --build > /dev/null 2>&1
+    if wait_for $API_URL/health; then
+        python3 bench_cache.py --url $API_URL --concurrency "$CONCURRENCY" --rounds "$ROUNDS" \
+            --label "⚔️ Arena (cache $layer)" --path /heroes --key cache:heroes
+        echo ""
+        curl -s $API_URL/stats | python3 -c "import sys, json; print('📈 Contadores:', json.load(sys.stdin)['cache'])"
+    fi
+    docker compose down > /dev/null 2>&1
+done
+
+echo ""
+echo "✅ Benchmark concluído!"
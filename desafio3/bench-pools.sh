@@ -0,0 +1,52 @@
+#!/bin/bash
+
+echo "============================================================"
+echo "🔌 BENCHMARK: conexão por request vs pools de Postgres/Redis"
+echo "============================================================"
+echo ""
+
+cd "$(dirname "$0")"
+
+API_URL="http://localhost:5000"
+CONCURRENCY=${CONCURRENCY:-32}
+DURATION=${DURATION:-20}
+
+if ! docker info > /dev/null 2>&1; then
+    echo "❌ Docker não está rodando. Por favor, inicie o Docker."
+    exit 1
+fi
+
+wait_for() {
+    echo "⏳ Aguardando $1..."
+    for i in $(seq 1 60); do
+        if curl -sf "$1" > /dev/null; then
+            return 0
+        fi
+        sleep 2
+    done
+    echo "❌ $1 não respondeu"
+    return 1
+}
+
+for pools in off on; do
+    echo ""
+    echo "🔧 CLIENT_POOLS=$pools"
+    echo "------------------------------------------------------------"
+
+    CLIENT_POOLS=$pools docker compose up -d --build > /dev/null 2>&1
+    if wait_for $API_URL/health; then
+        python3 ../shared/bench_serving.py --url $API_URL \
+            --concurrency "$CONCURRENCY" --duration "$DURATION" --label "⚔️ Arena (pools $pools)" \
+            --endpoint "GET /heroes" \
+            --endpoint "GET /ranking" \
+            --endpoint 'POST /battle {"hero1_id": 1, "hero2_id": 2}'
+
+        echo ""
+        echo "📈 Pools de um dos workers:"
+        curl -s $API_URL/metrics/pools | python3 -m json.tool
+    fi
+    docker compose down > /dev/null 2>&1
+done
+
+echo ""
+echo "✅ Benchmark concluído!"
@@ -0,0 +1,84 @@
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+def post(conn, path, payload):
+    conn.request('POST', path, body=json.dumps(payload), headers={'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    body = response.read()
+    if response.status != 201:
+        raise RuntimeError(f"{path} respondeu {response.status}: {body[:200]!r}")
+    return json.loads(body)
+
+def loop_single(url, pairs, concurrency):
+    # Uma requisição /battle por luta, como o battle-demo.sh
+    def worker(chunk):
+        conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=120)
+        for hero1_id, hero2_id in chunk:
+            post(conn, '/battle', {'hero1_id': hero1_id, 'hero2_id': hero2_id})
+        conn.close()
+
+    threads = [threading.Thread(target=worker, args=(pairs[i::concurrency],)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+def batch(url, pairs, size):
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=300)
+    start = time.perf_counter()
+    for i in range(0, len(pairs), size):
+        post(conn, '/battles/batch', {'battles': [{'hero1_id': a, 'hero2_id': b} for a, b in pairs[i:i + size]]})
+    conn.close()
+    return time.perf_counter() - start
+
+def tournament(url, hero_ids, legs):
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=300)
+    start = time.perf_counter()
+    result = post(conn, '/tournament', {'format': 'round_robin', 'hero_ids': hero_ids, 'legs': legs})
+    conn.close()
+    return time.perf_counter() - start, result['total']
+
+def main():
+    parser = argparse.ArgumentParser(description='Batalhas por segundo: /battle em loop vs /battles/batch vs /tournament')
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--battles', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=8, help='clientes do loop de /battle')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--heroes', default='1,2,3,4,5,6,7,8')
+    parser.add_argument('--legs', type=int, default=70, help='turnos do round robin')
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    hero_ids = [int(hero_id) for hero_id in args.heroes.split(',')]
+    pairs = [tuple(random.sample(hero_ids, 2)) for _ in range(args.battles)]
+
+    print("=" * 70)
+    print(f"⚔️ THROUGHPUT DE BATALHAS ({args.battles:,} lutas entre {len(hero_ids)} heróis)")
+    print("=" * 70)
+
+    elapsed = loop_single(url, pairs, 1)
+    baseline = args.battles / elapsed
+    print(f"  🔁 /battle em loop (1 cliente):       {baseline:>9,.0f} batalhas/s ({elapsed:.1f}s)")
+
+    elapsed = loop_single(url, pairs, args.concurrency)
+    print(f"  🔁 /battle em loop ({args.concurrency} clientes):      {args.battles / elapsed:>9,.0f} batalhas/s "
+        f"({args.battles / elapsed / baseline:.1f}x)")
+
+    elapsed = batch(url, pairs, args.batch_size)
+    print(f"  📦 /battles/batch (lotes de {args.batch_size}):  {args.battles / elapsed:>9,.0f} batalhas/s "
+        f"({args.battles / elapsed / baseline:.1f}x)")
+
+    elapsed, total = tournament(url, hero_ids, args.legs)
+    print(f"  🏟️  /tournament round robin ({total:,} lutas): {total / elapsed:>9,.0f} batalhas/s "
+        f"({total / elapsed / baseline:.1f}x)")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import http.client
+import json
+import random
+import time
+from urllib.parse import urlsplit
+
+from bench_batch import batch, loop_single
+from bench_contention import psql
+
+def table_size():
+    # Tabela + índices + TOAST
+    return int(psql("SELECT pg_total_relation_size('battles')")[0][0])
+
+def last_battle_id():
+    return int(psql("SELECT COALESCE(MAX(id), 0) FROM battles")[0][0])
+
+def log_bytes(after_battle_id):
+    # Bytes médios de battle_log e battle_rounds nas linhas novas
+    rows = psql(f"""
+        SELECT COALESCE(AVG(pg_column_size(battle_log)), 0), COALESCE(AVG(pg_column_size(battle_rounds)), 0),
+               AVG(pg_column_size(battles.*))
+        FROM battles
+        WHERE id > {after_battle_id}
+    """)
+    return tuple(float(value or 0) for value in rows[0])
+
+def fetch_log(url, battle_id):
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+    start = time.perf_counter()
+    conn.request('GET', f'/battles/{battle_id}/log')
+    response = conn.getresponse()
+    body = json.loads(response.read())
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return body, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description='Tamanho da tabela battles e batalhas/s com o log em texto ou compacto')
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--battles', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--heroes', default='1,2,3,4,5,6,7,8')
+    parser.add_argument('--label', default='⚔️ Arena')
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    hero_ids = [int(hero_id) for hero_id in args.heroes.split(',')]
+    pairs = [tuple(random.sample(hero_ids, 2)) for _ in range(args.battles)]
+
+    first_id = last_battle_id()
+    size_before = table_size()
+
+    loop_time = loop_single(url, pairs, args.concurrency)
+    batch_time = batch(url, pairs, args.batch_size)
+
+    size_after = table_size()
+    text_bytes, compact_bytes, row_bytes = log_bytes(first_id)
+    inserted = last_battle_id() - first_id
+    log, log_time = fetch_log(url, last_battle_id())
+
+    print(f"{args.label} (log {log.get('storage', '?')})")
+    print(f"  🔁 /battle em loop ({args.concurrency} clientes): {args.battles / loop_time:>9,.0f} batalhas/s")
+    print(f"  📦 /battles/batch (lotes de {args.batch_size}):  {args.battles / batch_time:>9,.0f} batalhas/s")
+    print(f"  💾 battles cresceu {(size_after - size_before) / 1024 / 1024:,.1f} MB em {inserted:,} batalhas "
+        f"({(size_after - size_before) / max(inserted, 1):,.0f} bytes/batalha)")
+    print(f"  📏 Linha média: {row_bytes:,.0f} bytes (battle_log {text_bytes:,.0f}, battle_rounds {compact_bytes:,.0f})")
+    print(f"  📜 /battles/<id>/log: {log_time * 1000:.1f} ms, {len(log.get('log', '')):,} caracteres")
+
+if __name__ == '__main__':
+    main()
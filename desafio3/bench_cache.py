@@ -0,0 +1,76 @@
+import argparse
+import http.client
+import subprocess
+import threading
+import time
+from urllib.parse import urlsplit
+
+def redis_cli(*args):
+    # Redis da arena não expõe porta: fala com ele pelo container
+    result = subprocess.run(['docker', 'compose', 'exec', '-T', 'arena-cache', 'redis-cli', *args],
+        capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+def computes():
+    return int(redis_cli('GET', 'stats:cache_computes') or 0)
+
+def burst(url, path, concurrency):
+    barrier = threading.Barrier(concurrency)
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def request():
+        conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+        conn.connect()
+        barrier.wait()
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            ok = False
+        elapsed = time.perf_counter() - start
+        conn.close()
+        with lock:
+            (latencies if ok else errors).append(elapsed)
+
+    threads = [threading.Thread(target=request) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return latencies, len(errors)
+
+def main():
+    parser = argparse.ArgumentParser(description='Rajadas de requests simultâneos contra o cache frio')
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--path', default='/heroes')
+    parser.add_argument('--key', default='cache:heroes', help='chave apagada antes de cada rajada')
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--label', default='⚔️ Arena')
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    print(f"{args.label}: {args.rounds} rajadas de {args.concurrency} GET {args.path} com {args.key} apagada")
+    print(f"{'rajada':>7} | {'p50':>9} | {'p99':>9} | {'máx':>9} | {'erros':>5} | {'recálculos':>10}")
+    print("-" * 66)
+    for round_number in range(1, args.rounds + 1):
+        redis_cli('DEL', args.key)
+        before = computes()
+        latencies, errors = burst(url, args.path, args.concurrency)
+        recomputed = computes() - before
+        if latencies:
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)] * 1000
+            print(f"{round_number:>7} | {p50:>6.1f} ms | {p99:>6.1f} ms | {latencies[-1] * 1000:>6.1f} ms | "
+                f"{errors:>5} | {recomputed:>10}")
+        else:
+            print(f"{round_number:>7} | {'-':>9} | {'-':>9} | {'-':>9} | {errors:>5} | {recomputed:>10}")
+
+if __name__ == '__main__':
+    main()
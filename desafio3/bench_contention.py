@@ -0,0 +1,102 @@
+import argparse
+import http.client
+import json
+import random
+import subprocess
+import threading
+import time
+from urllib.parse import urlsplit
+
+def psql(sql):
+    # Postgres da arena não expõe porta: consulta pelo container
+    result = subprocess.run(['docker', 'compose', 'exec', '-T', 'arena-database',
+        'psql', '-U', 'arena_master', '-d', 'battle_arena', '-At', '-F', ',', '-c', sql],
+        capture_output=True, text=True, check=True)
+    return [line.split(',') for line in result.stdout.strip().splitlines() if line]
+
+def hero_counters(hero_ids):
+    ids = ','.join(str(hero_id) for hero_id in hero_ids)
+    rows = psql(f"SELECT id, wins, losses, draws FROM heroes WHERE id IN ({ids})")
+    return {int(row[0]): tuple(int(value) for value in row[1:]) for row in rows}
+
+def expected_from_battles(hero_ids, after_battle_id):
+    # O que os contadores deveriam ter ganho, recontado a partir da tabela battles
+    expected = {}
+    for hero_id in hero_ids:
+        rows = psql(f"""
+            SELECT COUNT(*) FILTER (WHERE winner_id = {hero_id}),
+                   COUNT(*) FILTER (WHERE winner_id IS NOT NULL AND winner_id <> {hero_id}),
+                   COUNT(*) FILTER (WHERE winner_id IS NULL)
+            FROM battles
+            WHERE id > {after_battle_id} AND {hero_id} IN (hero1_id, hero2_id)
+        """)
+        expected[hero_id] = tuple(int(value) for value in rows[0])
+    return expected
+
+def fight(url, pairs, results, lock):
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+    for hero1_id, hero2_id in pairs:
+        body = json.dumps({'hero1_id': hero1_id, 'hero2_id': hero2_id})
+        try:
+            conn.request('POST', '/battle', body=body, headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+            status = 'erro'
+        with lock:
+            results[status] = results.get(status, 0) + 1
+    conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Milhares de batalhas paralelas entre poucos heróis, conferindo os contadores')
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--battles', type=int, default=3000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--heroes', default='1,2,3', help='ids dos heróis disputados')
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    hero_ids = [int(hero_id) for hero_id in args.heroes.split(',')]
+    pairs = [tuple(random.sample(hero_ids, 2)) for _ in range(args.battles)]
+
+    last_battle_id = int(psql("SELECT COALESCE(MAX(id), 0) FROM battles")[0][0])
+    before = hero_counters(hero_ids)
+
+    results = {}
+    lock = threading.Lock()
+    chunks = [pairs[i::args.concurrency] for i in range(args.concurrency)]
+    threads = [threading.Thread(target=fight, args=(url, chunk, results, lock)) for chunk in chunks]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    after = hero_counters(hero_ids)
+    expected = expected_from_battles(hero_ids, last_battle_id)
+    stored = int(psql(f"SELECT COUNT(*) FROM battles WHERE id > {last_battle_id}")[0][0])
+
+    print("=" * 70)
+    print(f"⚔️ {args.battles:,} batalhas entre os heróis {args.heroes} com {args.concurrency} clientes")
+    print("=" * 70)
+    print(f"  ⏱️  {elapsed:.1f}s ({results.get(201, 0) / elapsed:,.0f} batalhas/s) | respostas: {results}")
+    print(f"  💾 Batalhas gravadas: {stored:,}")
+
+    exact = stored == results.get(201, 0)
+    for hero_id in hero_ids:
+        gained = tuple(a - b for a, b in zip(after[hero_id], before[hero_id]))
+        ok = gained == expected[hero_id]
+        exact = exact and ok
+        print(f"  {'✅' if ok else '❌'} Herói {hero_id}: +{gained[0]} V / +{gained[1]} D / +{gained[2]} E "
+            f"(esperado {expected[hero_id][0]} / {expected[hero_id][1]} / {expected[hero_id][2]})")
+
+    print("=" * 70)
+    print("✅ Contadores exatos" if exact else "❌ Contadores divergentes da tabela battles")
+    raise SystemExit(0 if exact else 1)
+
+if __name__ == '__main__':
+    main()
@@ -23,6 +23,8 @@ CREATE TABLE IF NOT EXISTS battles (
     hero2_damage_dealt INTEGER NOT NULL,
     rounds INTEGER NOT NULL,
     battle_log TEXT,
+    -- Log compacto: HP inicial e dano de cada golpe, ver engine.pack_log
+    battle_rounds BYTEA,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
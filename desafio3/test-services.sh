@@ -32,15 +32,14 @@ echo ""
 read -p "Pressione ENTER para continuar..."
 echo ""
 
-echo "🏆 TESTE 3: Ver Ranking (Web → Cache → Database)"
+echo "🏆 TESTE 3: Ver Ranking (Web → Cache)"
 echo "------------------------------------------------------------"
-echo "Primeira chamada busca do Database e salva no Redis..."
+echo "Leaderboard mantido no Redis (sorted set)..."
 echo ""
 curl -s $API_URL/ranking | python3 -m json.tool
 echo ""
-echo "Segunda chamada (deve vir do cache Redis)..."
-sleep 1
-curl -s $API_URL/ranking | python3 -m json.tool | head -15
+echo "Posição de um herói no ranking..."
+curl -s $API_URL/ranking/1 | python3 -m json.tool
 echo ""
 read -p "Pressione ENTER para continuar..."
 echo ""
@@ -74,6 +73,13 @@ echo "📜 TESTE 6: Histórico de Batalhas (Database)"
 echo "------------------------------------------------------------"
 curl -s "$API_URL/battles?limit=5" | python3 -m json.tool
 echo ""
+read -p "Pressione ENTER para continuar..."
+echo ""
+
+echo "🔮 TESTE 7: Previsão Simulada (sem gravar batalhas)"
+echo "------------------------------------------------------------"
+curl -s "$API_URL/predict?hero1_id=1&hero2_id=2" | python3 -m json.tool
+echo ""
 
 echo "============================================================"
 echo "✅ TESTES DE COMUNICAÇÃO CONCLUÍDOS!"
@@ -1,33 +1,38 @@
 from flask import Flask, jsonify, request
 import psycopg2
 import redis
-import random
 import time
-import json
+import os
 from datetime import datetime
-from psycopg2.extras import RealDictCursor
+from psycopg2 import pool
+from psycopg2.extras import execute_values
+import engine
+import leaderboard
+import predict
+import tournament
+from cache import Cache, CacheBusy, counters
+from pools import DB_CONFIG, REDIS_CONFIG, DatabasePool, RedisClients
 
 app = Flask(__name__)
 
-DB_CONFIG = {
-    'dbname': 'battle_arena',
-    'user': 'arena_master',
-    'password': 'battle123',
-    'host': 'arena-database',
-    'port': '5432'
-}
+BATCH_MAX_BATTLES = int(os.environ.get('BATCH_MAX_BATTLES', 5000))
+# compact: só os danos por golpe em battle_rounds (BYTEA), texto montado em
+# /battles/<id>/log; text: o log completo em battle_log, como antes
+BATTLE_LOG_STORAGE = os.environ.get('BATTLE_LOG_STORAGE', 'compact')
+BATTLE_LOG_STORAGES = ('compact', 'text')
+if BATTLE_LOG_STORAGE not in BATTLE_LOG_STORAGES:
+    raise ValueError(f"BATTLE_LOG_STORAGE desconhecido: {BATTLE_LOG_STORAGE}")
 
-REDIS_CONFIG = {
-    'host': 'arena-cache',
-    'port': 6379,
-    'decode_responses': True
-}
-
-def get_db():
-    return psycopg2.connect(**DB_CONFIG, cursor_factory=RealDictCursor)
+db = DatabasePool()
+caches = RedisClients()
 
 def get_redis():
-    return redis.Redis(**REDIS_CONFIG)
+    return caches.get()
+
+cache = Cache(get_redis)
+predictions = Cache(get_redis, ttl=predict.PREDICT_CACHE_TTL, lock_ttl=predict.PREDICT_LOCK_TTL,
+    wait=predict.PREDICT_WAIT, compute_on_timeout=False)
+predictor = predict.Predictor()
 
 def wait_for_services():
     max_retries = 30
@@ -55,11 +60,19 @@ def home():
         'message': 'Bem-vindo à Arena! Teste seus heróis em combate épico!',
         'endpoints': {
             '/heroes': 'Lista todos os heróis disponíveis',
-            '/ranking': 'Ranking em tempo real (via Redis cache)',
+            '/ranking': 'Ranking em tempo real (sorted set no Redis; ?limit=&offset=)',
+            '/ranking/<id>': 'Posição de um herói no ranking',
+            '/ranking/rebuild': 'POST - Reconstrói o ranking a partir do Postgres',
             '/battle': 'POST - Iniciar uma batalha entre dois heróis',
             '/battles': 'Histórico de batalhas',
+            '/battles/<id>/log': 'Log round a round de uma batalha',
+            '/battles/batch': 'POST - Várias batalhas numa requisição',
+            '/tournament': 'POST - Torneio round_robin ou bracket',
+            '/predict': 'Chance de vitória simulada (?hero1_id=&hero2_id=&simulations=)',
+            '/matchups': 'Matriz de confrontos simulados (?hero_ids=1,2,3&simulations=)',
             '/stats': 'Estatísticas gerais da arena',
-            '/health': 'Health check de todos os serviços'
+            '/health': 'Health check de todos os serviços',
+            '/metrics/pools': 'Métricas dos pools de conexão (Postgres e Redis)'
         }
     }), 200
 
@@ -71,11 +84,8 @@ def health():
     }
     
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        cursor.execute('SELECT 1')
-        cursor.close()
-        conn.close()
+        with db.cursor() as cursor:
+            cursor.execute('SELECT 1')
         health_status['database'] = 'healthy'
     except Exception as e:
         health_status['database'] = f'unhealthy: {str(e)}'
@@ -92,68 +102,90 @@ def health():
     
     return jsonify(health_status), status_code
 
+@app.route('/metrics/pools')
+def pool_metrics():
+    # Métricas do worker que atendeu o request (cada worker tem seus pools)
+    return jsonify({
+        'pid': os.getpid(),
+        'pooled': caches.enabled and db.enabled,
+        'database': db.metrics(),
+        'cache': caches.metrics()
+    }), 200
+
+@app.errorhandler(pool.PoolError)
+def pool_exhausted(error):
+    return jsonify({'error': f'Arena sobrecarregada: {error}'}), 503
+
+@app.errorhandler(CacheBusy)
+def still_computing(error):
+    # Outro request já está simulando: tente de novo em instantes
+    response = jsonify({'status': 'calculando', 'message': str(error), 'retry_after': 2})
+    response.headers['Retry-After'] = '2'
+    return response, 202
+
+@app.errorhandler(leaderboard.LeaderboardBusy)
+def leaderboard_busy(error):
+    return jsonify({'error': f'Ranking sendo reconstruído, tente novamente: {error}'}), 503
+
+def load_heroes():
+    with db.cursor() as cursor:
+        cursor.execute("""
+            SELECT id, name, class, level, attack_power, defense_power, 
+                health_points, wins, losses, draws
+            FROM heroes
+            ORDER BY (wins * 3 + draws) DESC
+        """)
+        return cursor.fetchall()
+
 @app.route('/heroes')
 def get_heroes():
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT id, name, class, level, attack_power, defense_power, 
-            health_points, wins, losses, draws
-        FROM heroes
-        ORDER BY (wins * 3 + draws) DESC
-    """)
-    
-    heroes = cursor.fetchall()
-    cursor.close()
-    conn.close()
+    heroes, source = cache.get('heroes', load_heroes)
     
     return jsonify({
+        'source': source,
         'total': len(heroes),
         'heroes': heroes
     }), 200
 
 @app.route('/ranking')
 def get_ranking():
-    r = get_redis()
+    # Leaderboard vivo no Redis (sorted set atualizado por /battle):
+    # ?limit=N&offset=M para páginas, sem passar pelo Postgres
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    offset = max(request.args.get('offset', 0, type=int), 0)
     
-    cache_key = 'ranking:current'
-    cached = r.get(cache_key)
-    
-    if cached:
-        ranking = json.loads(cached)
-        return jsonify({
-            'source': 'cache',
-            'cached_at': ranking.get('cached_at'),
-            'ranking': ranking.get('data')
-        }), 200
-    
-    conn = get_db()
-    cursor = conn.cursor()
+    r = get_redis()
+    if not leaderboard.ensure_ready(r, db):
+        return jsonify({'error': 'Leaderboard sendo reconstruído, tente novamente'}), 503
     
-    cursor.execute("""
-        SELECT name, class, level, wins, losses, draws, 
-            win_rate, ranking_points
-        FROM hero_stats
-        LIMIT 10
-    """)
-    
-    ranking_data = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    
-    ranking_response = {
-        'cached_at': datetime.now().isoformat(),
-        'data': ranking_data
-    }
+    return jsonify({
+        'source': 'leaderboard',
+        'total': leaderboard.size(r),
+        'offset': offset,
+        'ranking': leaderboard.page(r, offset, limit)
+    }), 200
+
+@app.route('/ranking/<int:hero_id>')
+def get_hero_ranking(hero_id):
+    r = get_redis()
+    if not leaderboard.ensure_ready(r, db):
+        return jsonify({'error': 'Leaderboard sendo reconstruído, tente novamente'}), 503
     
-    r.setex(cache_key, 60, json.dumps(ranking_response, default=str))
+    hero = leaderboard.hero_position(r, hero_id)
+    if not hero:
+        return jsonify({'error': 'Herói não encontrado'}), 404
     
     return jsonify({
-        'source': 'database',
-        'ranking': ranking_data
+        'source': 'leaderboard',
+        'total': leaderboard.size(r),
+        'hero': hero
     }), 200
 
+@app.route('/ranking/rebuild', methods=['POST'])
+def rebuild_ranking():
+    count = leaderboard.rebuild(get_redis(), db)
+    return jsonify({'rebuilt': True, 'heroes': count}), 200
+
 @app.route('/battle', methods=['POST'])
 def create_battle():
     data = request.get_json()
@@ -161,174 +193,442 @@ def create_battle():
     if not data or 'hero1_id' not in data or 'hero2_id' not in data:
         return jsonify({'error': 'hero1_id e hero2_id são obrigatórios'}), 400
     
-    hero1_id = data['hero1_id']
-    hero2_id = data['hero2_id']
+    try:
+        hero1_id = int(data['hero1_id'])
+        hero2_id = int(data['hero2_id'])
+    except (TypeError, ValueError):
+        return jsonify({'error': 'hero1_id e hero2_id devem ser números'}), 400
     
     if hero1_id == hero2_id:
         return jsonify({'error': 'Um herói não pode lutar contra si mesmo!'}), 400
     
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT * FROM heroes WHERE id = %s', (hero1_id,))
-    hero1 = cursor.fetchone()
-    
-    cursor.execute('SELECT * FROM heroes WHERE id = %s', (hero2_id,))
-    hero2 = cursor.fetchone()
-    
-    if not hero1 or not hero2:
-        cursor.close()
-        conn.close()
-        return jsonify({'error': 'Herói não encontrado'}), 404
-    
-    battle_result = simulate_battle(hero1, hero2)
+    # Até o leaderboard receber a batalha, uma reconstrução espera por ela
+    with leaderboard.publishing(get_redis()):
+        with db.cursor() as cursor:
+            # Os dois heróis numa consulta, travados sempre na ordem do id: duas
+            # batalhas com os mesmos heróis se enfileiram em vez de se cruzarem
+            cursor.execute("""
+                SELECT * FROM heroes
+                WHERE id IN (%s, %s)
+                ORDER BY id
+                FOR UPDATE
+            """, (hero1_id, hero2_id))
+            heroes = {hero['id']: hero for hero in cursor.fetchall()}
+            
+            if len(heroes) < 2:
+                return jsonify({'error': 'Herói não encontrado'}), 404
+            
+            battle_result = engine.simulate([(heroes[hero1_id], heroes[hero2_id])])[0]
+            
+            # Batalha e estatísticas dos dois heróis num único comando
+            cursor.execute("""
+                WITH battle AS (
+                    INSERT INTO battles (hero1_id, hero2_id, winner_id, hero1_damage_dealt, 
+                                    hero2_damage_dealt, rounds, battle_log, battle_rounds)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    RETURNING id
+                ), hero_updates AS (
+                    UPDATE heroes h SET
+                        wins = h.wins + d.wins,
+                        losses = h.losses + d.losses,
+                        draws = h.draws + d.draws,
+                        total_damage_dealt = h.total_damage_dealt + d.dealt,
+                        total_damage_received = h.total_damage_received + d.received
+                    FROM (VALUES (%s, %s, %s, %s, %s, %s), (%s, %s, %s, %s, %s, %s))
+                        AS d(id, wins, losses, draws, dealt, received)
+                    WHERE h.id = d.id
+                )
+                SELECT id FROM battle
+            """, (hero1_id, hero2_id, battle_result['winner_id'],
+                battle_result['hero1_damage'], battle_result['hero2_damage'],
+                battle_result['rounds'], *battle_log_columns(battle_result),
+                *battle_stats(hero1_id, hero2_id, battle_result)))
+            
+            battle_id = cursor.fetchone()['id']
+        
+        publish_battles([(hero1_id, hero2_id, battle_result)])
+    battle_result.pop('log_data')
     
+    return jsonify({
+        'battle_id': battle_id,
+        'result': battle_result
+    }), 201
+
+def battle_log_columns(result):
+    # (battle_log, battle_rounds) conforme BATTLE_LOG_STORAGE
+    if BATTLE_LOG_STORAGE == 'text':
+        return result['log'], None
+    return None, result['log_data']
+
+def lock_heroes(cursor, hero_ids):
     cursor.execute("""
+        SELECT * FROM heroes
+        WHERE id = ANY(%s)
+        ORDER BY id
+        FOR UPDATE
+    """, (sorted(hero_ids),))
+    return {hero['id']: hero for hero in cursor.fetchall()}
+
+def aggregate_stats(fights):
+    # Uma linha (id, wins, losses, draws, dano causado, dano recebido) por
+    # herói, somando todas as lutas do lote
+    totals = {}
+    for hero1_id, hero2_id, result in fights:
+        stats = battle_stats(hero1_id, hero2_id, result)
+        for row in (stats[:6], stats[6:]):
+            current = totals.setdefault(row[0], [0] * 5)
+            for i, value in enumerate(row[1:]):
+                current[i] += value
+    return [(hero_id, *values) for hero_id, values in totals.items()]
+
+def persist_battles(cursor, fights):
+    # Todas as batalhas num INSERT multi-linha e um UPDATE por herói (não por luta)
+    rows = execute_values(cursor, """
         INSERT INTO battles (hero1_id, hero2_id, winner_id, hero1_damage_dealt, 
-                        hero2_damage_dealt, rounds, battle_log)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
+                        hero2_damage_dealt, rounds, battle_log, battle_rounds)
+        VALUES %s
         RETURNING id
-    """, (hero1_id, hero2_id, battle_result['winner_id'],
-        battle_result['hero1_damage'], battle_result['hero2_damage'],
-        battle_result['rounds'], battle_result['log']))
-    
-    battle_id = cursor.fetchone()['id']
-    
-    if battle_result['winner_id'] == hero1_id:
-        cursor.execute('UPDATE heroes SET wins = wins + 1, total_damage_dealt = total_damage_dealt + %s, total_damage_received = total_damage_received + %s WHERE id = %s',
-                    (battle_result['hero1_damage'], battle_result['hero2_damage'], hero1_id))
-        cursor.execute('UPDATE heroes SET losses = losses + 1, total_damage_dealt = total_damage_dealt + %s, total_damage_received = total_damage_received + %s WHERE id = %s',
-                    (battle_result['hero2_damage'], battle_result['hero1_damage'], hero2_id))
-    elif battle_result['winner_id'] == hero2_id:
-        cursor.execute('UPDATE heroes SET losses = losses + 1, total_damage_dealt = total_damage_dealt + %s, total_damage_received = total_damage_received + %s WHERE id = %s',
-                    (battle_result['hero1_damage'], battle_result['hero2_damage'], hero1_id))
-        cursor.execute('UPDATE heroes SET wins = wins + 1, total_damage_dealt = total_damage_dealt + %s, total_damage_received = total_damage_received + %s WHERE id = %s',
-                    (battle_result['hero2_damage'], battle_result['hero1_damage'], hero2_id))
-    else:
-        cursor.execute('UPDATE heroes SET draws = draws + 1 WHERE id IN (%s, %s)', (hero1_id, hero2_id))
-    
-    conn.commit()
-    cursor.close()
-    conn.close()
-    
+    """, [(hero1_id, hero2_id, result['winner_id'], result['hero1_damage'], result['hero2_damage'],
+        result['rounds'], *battle_log_columns(result)) for hero1_id, hero2_id, result in fights],
+        page_size=1000, fetch=True)
+    
+    execute_values(cursor, """
+        UPDATE heroes h SET
+            wins = h.wins + d.wins,
+            losses = h.losses + d.losses,
+            draws = h.draws + d.draws,
+            total_damage_dealt = h.total_damage_dealt + d.dealt,
+            total_damage_received = h.total_damage_received + d.received
+        FROM (VALUES %s) AS d(id, wins, losses, draws, dealt, received)
+        WHERE h.id = d.id
+    """, aggregate_stats(fights))
+    return [row['id'] for row in rows]
+
+def publish_battles(fights):
+    # Depois do commit: leaderboard, contador e cache atualizados uma vez por lote
+    results = {}
+    for hero_id, wins, losses, draws, _, _ in aggregate_stats(fights):
+        results[hero_id] = (wins, losses, draws)
     r = get_redis()
-    r.delete('ranking:current')
-    r.incr('stats:total_battles')
+    leaderboard.record_battles(r, results)
+    r.incrby('stats:total_battles', len(fights))
+    cache.invalidate('heroes', 'stats')
+
+def run_battles(hero_ids, plan):
+    # Trava os heróis, roda `plan(fight_many)` em memória e grava tudo numa transação
+    with leaderboard.publishing(get_redis()):
+        with db.cursor() as cursor:
+            heroes = lock_heroes(cursor, hero_ids)
+            missing = sorted(set(hero_ids) - set(heroes))
+            if missing:
+                return None, missing
+            
+            def fight_many(pairs):
+                # Cada leva de lutas roda de uma vez na engine (vetorizada com numpy);
+                # o texto do log só é montado se for gravado
+                results = engine.simulate([(heroes[hero1_id], heroes[hero2_id]) for hero1_id, hero2_id in pairs],
+                    with_log=BATTLE_LOG_STORAGE == 'text')
+                return [(hero1_id, hero2_id, result) for (hero1_id, hero2_id), result in zip(pairs, results)]
+            
+            outcome = plan(fight_many)
+            fights = outcome[0]
+            battle_ids = persist_battles(cursor, fights) if fights else []
+        
+        if fights:
+            publish_battles(fights)
+    return (battle_ids, *outcome), None
+
+def summarize(battle_ids, fights):
+    return [{
+        'battle_id': battle_id,
+        'hero1_id': hero1_id,
+        'hero2_id': hero2_id,
+        'winner_id': result['winner_id'],
+        'rounds': result['rounds'],
+        'hero1_damage': result['hero1_damage'],
+        'hero2_damage': result['hero2_damage']
+    } for battle_id, (hero1_id, hero2_id, result) in zip(battle_ids, fights)]
+
+def parse_hero_ids(values):
+    try:
+        return [int(value) for value in values]
+    except (TypeError, ValueError):
+        return None
+
+@app.route('/battles/batch', methods=['POST'])
+def create_battles_batch():
+    # {"battles": [{"hero1_id": 1, "hero2_id": 2}, ...]}
+    data = request.get_json(silent=True) or {}
+    battles = data.get('battles')
+    if not isinstance(battles, list) or not battles:
+        return jsonify({'error': 'battles deve ser uma lista de {hero1_id, hero2_id}'}), 400
+    if len(battles) > BATCH_MAX_BATTLES:
+        return jsonify({'error': f'Máximo de {BATCH_MAX_BATTLES} batalhas por lote'}), 400
+    
+    pairs = []
+    for battle in battles:
+        pair = parse_hero_ids([battle.get('hero1_id'), battle.get('hero2_id')]) if isinstance(battle, dict) else None
+        if not pair:
+            return jsonify({'error': 'hero1_id e hero2_id são obrigatórios e devem ser números'}), 400
+        if pair[0] == pair[1]:
+            return jsonify({'error': 'Um herói não pode lutar contra si mesmo!'}), 400
+        pairs.append(pair)
+    
+    start = time.perf_counter()
+    hero_ids = {hero_id for pair in pairs for hero_id in pair}
+    outcome, missing = run_battles(hero_ids, lambda fight_many: (fight_many(pairs),))
+    if missing:
+        return jsonify({'error': 'Herói não encontrado', 'missing': missing}), 404
+    battle_ids, fights = outcome
     
     return jsonify({
-        'battle_id': battle_id,
-        'result': battle_result
+        'total': len(fights),
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 2),
+        'standings': tournament.standings(sorted(hero_ids), fights),
+        'battles': summarize(battle_ids, fights)
     }), 201
 
-def simulate_battle(hero1, hero2):
-    h1_hp = hero1['health_points']
-    h2_hp = hero2['health_points']
+@app.route('/tournament', methods=['POST'])
+def create_tournament():
+    # {"format": "round_robin" | "bracket", "hero_ids": [...], "legs": 1}
+    data = request.get_json(silent=True) or {}
+    fmt = data.get('format', 'round_robin')
+    hero_ids = parse_hero_ids(data.get('hero_ids') or [])
+    legs = data.get('legs', 1)
+    
+    if fmt not in tournament.TOURNAMENT_FORMATS:
+        return jsonify({'error': f'format deve ser um de {", ".join(tournament.TOURNAMENT_FORMATS)}'}), 400
+    if not hero_ids or len(hero_ids) < 2 or len(set(hero_ids)) != len(hero_ids):
+        return jsonify({'error': 'hero_ids deve ter ao menos 2 heróis distintos'}), 400
+    if not isinstance(legs, int) or legs < 1:
+        return jsonify({'error': 'legs deve ser um inteiro positivo'}), 400
+    if tournament.planned_fights(fmt, len(hero_ids), legs) > BATCH_MAX_BATTLES:
+        return jsonify({'error': f'Torneio passaria de {BATCH_MAX_BATTLES} batalhas'}), 400
+    
+    start = time.perf_counter()
+    if fmt == 'round_robin':
+        outcome, missing = run_battles(hero_ids, lambda fight_many: tournament.round_robin(hero_ids, fight_many, legs))
+    else:
+        outcome, missing = run_battles(hero_ids, lambda fight_many: tournament.bracket(hero_ids, fight_many))
+    if missing:
+        return jsonify({'error': 'Herói não encontrado', 'missing': missing}), 404
+    
+    response = {
+        'format': fmt,
+        'total': len(outcome[1]),
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 2)
+    }
+    if fmt == 'round_robin':
+        battle_ids, fights, table = outcome
+        response.update({'champion_id': table[0]['hero_id'], 'standings': table})
+    else:
+        battle_ids, fights, rounds, champion_id = outcome
+        response.update({'champion_id': champion_id, 'rounds': rounds})
+    response['battles'] = summarize(battle_ids, fights)
     
-    h1_damage_total = 0
-    h2_damage_total = 0
+    return jsonify(response), 201
+
+def load_combat_stats(hero_ids=None):
+    with db.cursor() as cursor:
+        if hero_ids is None:
+            cursor.execute("""
+                SELECT id, name, class, attack_power, defense_power, health_points
+                FROM heroes
+                ORDER BY id
+                LIMIT %s
+            """, (predict.MATCHUPS_MAX_HEROES + 1,))
+        else:
+            cursor.execute("""
+                SELECT id, name, class, attack_power, defense_power, health_points
+                FROM heroes
+                WHERE id = ANY(%s)
+                ORDER BY id
+            """, (hero_ids,))
+        return cursor.fetchall()
+
+def parse_simulations():
+    simulations = request.args.get('simulations', predict.PREDICT_SIMULATIONS, type=int)
+    if not 1 <= simulations <= predict.PREDICT_MAX_SIMULATIONS:
+        return None
+    return simulations
+
+def prediction_source(source):
+    # Cache.get chama de 'database' o valor recém-calculado; aqui ele vem da simulação
+    return 'simulation' if source == 'database' else source
+
+@app.route('/predict')
+def predict_battle():
+    # Só leitura: simula a luta muitas vezes, nada é gravado
+    hero_ids = parse_hero_ids([request.args.get('hero1_id'), request.args.get('hero2_id')])
+    if not hero_ids:
+        return jsonify({'error': 'hero1_id e hero2_id são obrigatórios e devem ser números'}), 400
+    if hero_ids[0] == hero_ids[1]:
+        return jsonify({'error': 'Um herói não pode lutar contra si mesmo!'}), 400
+    simulations = parse_simulations()
+    if simulations is None:
+        return jsonify({'error': f'simulations deve estar entre 1 e {predict.PREDICT_MAX_SIMULATIONS}'}), 400
     
-    log = []
-    rounds = 0
-    max_rounds = 20
+    heroes = {hero['id']: hero for hero in load_combat_stats(hero_ids)}
+    if len(heroes) < 2:
+        return jsonify({'error': 'Herói não encontrado'}), 404
+    hero1, hero2 = heroes[hero_ids[0]], heroes[hero_ids[1]]
     
-    log.append(f"⚔️ {hero1['name']} VS {hero2['name']}")
-    log.append("=" * 50)
+    start = time.perf_counter()
+    chances, source = predictions.get(predict.predict_name(hero1, hero2, simulations),
+        lambda: predictor.predict(hero1, hero2, simulations))
     
-    while h1_hp > 0 and h2_hp > 0 and rounds < max_rounds:
-        rounds += 1
-        log.append(f"\nRound {rounds}:")
-        
-        h1_damage = max(0, hero1['attack_power'] - hero2['defense_power']//2 + random.randint(-10, 10))
-        h2_hp -= h1_damage
-        h1_damage_total += h1_damage
-        log.append(f"  {hero1['name']} ataca! Dano: {h1_damage} (HP: {max(0, h2_hp)})")
-        
-        if h2_hp <= 0:
-            break
-        
-        h2_damage = max(0, hero2['attack_power'] - hero1['defense_power']//2 + random.randint(-10, 10))
-        h1_hp -= h2_damage
-        h2_damage_total += h2_damage
-        log.append(f"  {hero2['name']} contra-ataca! Dano: {h2_damage} (HP: {max(0, h1_hp)})")
-    
-    log.append("\n" + "=" * 50)
-    
-    if h1_hp > h2_hp:
-        winner_id = hero1['id']
-        log.append(f"🏆 VENCEDOR: {hero1['name']}!")
-    elif h2_hp > h1_hp:
-        winner_id = hero2['id']
-        log.append(f"🏆 VENCEDOR: {hero2['name']}!")
-    else:
-        winner_id = None
-        log.append("🤝 EMPATE!")
+    return jsonify({
+        'hero1': hero1,
+        'hero2': hero2,
+        'simulations': simulations,
+        'source': prediction_source(source),
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 2),
+        'prediction': chances
+    }), 200
+
+@app.route('/matchups')
+def get_matchups():
+    # matrix[i][j]: chances do herói i (ataca primeiro) contra o herói j
+    simulations = parse_simulations()
+    if simulations is None:
+        return jsonify({'error': f'simulations deve estar entre 1 e {predict.PREDICT_MAX_SIMULATIONS}'}), 400
+    
+    hero_ids = None
+    if request.args.get('hero_ids'):
+        hero_ids = parse_hero_ids(request.args['hero_ids'].split(','))
+        if not hero_ids or len(hero_ids) < 2:
+            return jsonify({'error': 'hero_ids deve ter ao menos 2 heróis (ex: 1,2,3)'}), 400
+        hero_ids = sorted(set(hero_ids))
+    if hero_ids and len(hero_ids) > predict.MATCHUPS_MAX_HEROES:
+        return jsonify({'error': f'Máximo de {predict.MATCHUPS_MAX_HEROES} heróis por matriz'}), 400
+    
+    heroes = load_combat_stats(hero_ids)
+    if hero_ids is not None and len(heroes) < len(hero_ids):
+        missing = sorted(set(hero_ids) - {hero['id'] for hero in heroes})
+        return jsonify({'error': 'Herói não encontrado', 'missing': missing}), 404
+    if len(heroes) > predict.MATCHUPS_MAX_HEROES:
+        return jsonify({'error': f'Mais de {predict.MATCHUPS_MAX_HEROES} heróis: escolha com ?hero_ids='}), 400
+    if len(heroes) < 2:
+        return jsonify({'error': 'São necessários ao menos 2 heróis'}), 400
+    if predict.matrix_battles(len(heroes), simulations) > predict.MATCHUPS_MAX_BATTLES:
+        return jsonify({'error': f'{len(heroes)} heróis × {simulations} simulações passam de '
+            f'{predict.MATCHUPS_MAX_BATTLES} lutas: reduza simulations ou hero_ids'}), 400
+    
+    start = time.perf_counter()
+    matrix, source = predictions.get(predict.matrix_name(heroes, simulations),
+        lambda: predictor.matchups(heroes, simulations))
     
-    return {
-        'winner_id': winner_id,
-        'hero1_damage': h1_damage_total,
-        'hero2_damage': h2_damage_total,
-        'rounds': rounds,
-        'log': '\n'.join(log)
-    }
+    return jsonify({
+        'heroes': heroes,
+        'simulations': simulations,
+        'source': prediction_source(source),
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 2),
+        'matrix': matrix
+    }), 200
+
+def battle_stats(hero1_id, hero2_id, result):
+    # (id, wins, losses, draws, dano causado, dano recebido) de cada herói;
+    # empates contam só o empate, como sempre foi
+    h1_damage, h2_damage = result['hero1_damage'], result['hero2_damage']
+    if result['winner_id'] is None:
+        return (hero1_id, 0, 0, 1, 0, 0) + (hero2_id, 0, 0, 1, 0, 0)
+    hero1_won = int(result['winner_id'] == hero1_id)
+    return ((hero1_id, hero1_won, 1 - hero1_won, 0, h1_damage, h2_damage)
+        + (hero2_id, 1 - hero1_won, hero1_won, 0, h2_damage, h1_damage))
 
 @app.route('/battles')
 def get_battles():
     limit = request.args.get('limit', 20, type=int)
     
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT b.id, b.rounds, b.created_at,
-            h1.name as hero1_name, h2.name as hero2_name,
-            hw.name as winner_name,
-            b.hero1_damage_dealt, b.hero2_damage_dealt
-        FROM battles b
-        JOIN heroes h1 ON b.hero1_id = h1.id
-        JOIN heroes h2 ON b.hero2_id = h2.id
-        LEFT JOIN heroes hw ON b.winner_id = hw.id
-        ORDER BY b.created_at DESC
-        LIMIT %s
-    """, (limit,))
-    
-    battles = cursor.fetchall()
-    cursor.close()
-    conn.close()
+    with db.cursor() as cursor:
+        cursor.execute("""
+            SELECT b.id, b.rounds, b.created_at,
+                h1.name as hero1_name, h2.name as hero2_name,
+                hw.name as winner_name,
+                b.hero1_damage_dealt, b.hero2_damage_dealt
+            FROM battles b
+            JOIN heroes h1 ON b.hero1_id = h1.id
+            JOIN heroes h2 ON b.hero2_id = h2.id
+            LEFT JOIN heroes hw ON b.winner_id = hw.id
+            ORDER BY b.created_at DESC
+            LIMIT %s
+        """, (limit,))
+        battles = cursor.fetchall()
     
     return jsonify({
         'total': len(battles),
         'battles': battles
     }), 200
 
-@app.route('/stats')
-def get_stats():
-    conn = get_db()
-    cursor = conn.cursor()
-    
-    cursor.execute('SELECT COUNT(*) as total FROM heroes')
-    total_heroes = cursor.fetchone()['total']
-    
-    cursor.execute('SELECT COUNT(*) as total FROM battles')
-    total_battles = cursor.fetchone()['total']
-    
-    cursor.execute("""
-        SELECT name, wins FROM heroes 
-        WHERE wins > 0 
-        ORDER BY wins DESC LIMIT 1
-    """)
-    most_wins = cursor.fetchone()
-    
-    cursor.close()
-    conn.close()
-    
-    r = get_redis()
-    cache_hits = r.get('stats:cache_hits') or 0
+@app.route('/battles/<int:battle_id>/log')
+def get_battle_log(battle_id):
+    with db.cursor() as cursor:
+        cursor.execute("""
+            SELECT b.id, b.hero1_id, b.hero2_id, b.winner_id, b.rounds,
+                b.battle_log, b.battle_rounds,
+                h1.name as hero1_name, h2.name as hero2_name
+            FROM battles b
+            JOIN heroes h1 ON b.hero1_id = h1.id
+            JOIN heroes h2 ON b.hero2_id = h2.id
+            WHERE b.id = %s
+        """, (battle_id,))
+        battle = cursor.fetchone()
+    
+    if not battle:
+        return jsonify({'error': 'Batalha não encontrada'}), 404
+    
+    # Batalhas antigas (ou BATTLE_LOG_STORAGE=text) já têm o texto pronto
+    if battle['battle_log'] is not None:
+        storage, log = 'text', battle['battle_log']
+    elif battle['battle_rounds'] is not None:
+        storage = 'compact'
+        log = engine.render_packed_log(
+            {'id': battle['hero1_id'], 'name': battle['hero1_name']},
+            {'id': battle['hero2_id'], 'name': battle['hero2_name']},
+            bytes(battle['battle_rounds']), battle['winner_id'])
+    else:
+        return jsonify({'error': 'Batalha sem log registrado'}), 404
     
     return jsonify({
+        'battle_id': battle['id'],
+        'rounds': battle['rounds'],
+        'storage': storage,
+        'log': log
+    }), 200
+
+def load_arena_totals():
+    with db.cursor() as cursor:
+        cursor.execute('SELECT COUNT(*) as total FROM heroes')
+        total_heroes = cursor.fetchone()['total']
+        
+        cursor.execute('SELECT COUNT(*) as total FROM battles')
+        total_battles = cursor.fetchone()['total']
+        
+        cursor.execute("""
+            SELECT name, wins FROM heroes 
+            WHERE wins > 0 
+            ORDER BY wins DESC LIMIT 1
+        """)
+        most_wins = cursor.fetchone()
+    
+    return {
         'total_heroes': total_heroes,
         'total_battles': total_battles,
-        'most_victorious': most_wins,
-        'cache_hits': int(cache_hits),
+        'most_victorious': most_wins
+    }
+
+@app.route('/stats')
+def get_stats():
+    totals, source = cache.get('stats', load_arena_totals)
+    cache_counters = counters(get_redis())
+    
+    return jsonify({
+        'source': source,
+        'total_heroes': totals['total_heroes'],
+        'total_battles': totals['total_battles'],
+        'most_victorious': totals['most_victorious'],
+        'cache_hits': cache_counters['hits'],
+        'cache': cache_counters,
         'services_status': {
             'database': 'connected',
             'cache': 'connected',
@@ -336,14 +636,26 @@ def get_stats():
         }
     }), 200
 
+def ensure_schema():
+    # Volumes criados antes do log compacto não têm a coluna battle_rounds
+    with db.cursor() as cursor:
+        cursor.execute('ALTER TABLE battles ADD COLUMN IF NOT EXISTS battle_rounds BYTEA')
+
 if __name__ == '__main__':
+    from serve import serve
+    
     print("=" * 60)
     print("⚔️ ARENA DE BATALHAS - INICIANDO...")
     print("=" * 60)
     
     if wait_for_services():
+        ensure_schema()
+        heroes = leaderboard.rebuild(get_redis(), db)
+        # Os workers abrem seus próprios pools depois do fork
+        db.close()
+        print(f"🏆 Leaderboard carregado no Redis: {heroes} heróis")
         print("🚀 API rodando na porta 5000")
         print("=" * 60)
-        app.run(host='0.0.0.0', port=5000, debug=False)
+        serve(app, port=5000)
     else:
         print("❌ Falha ao conectar aos serviços!")
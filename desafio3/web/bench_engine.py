@@ -0,0 +1,69 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+import engine
+
+# Heróis do init.sql da arena (sem precisar do banco)
+HEROES = [
+    {'id': 1, 'name': 'Dragão Vermelho', 'attack_power': 95, 'defense_power': 80, 'health_points': 500},
+    {'id': 2, 'name': 'Cavaleiro Sagrado', 'attack_power': 85, 'defense_power': 90, 'health_points': 450},
+    {'id': 3, 'name': 'Arquimago Sombrio', 'attack_power': 100, 'defense_power': 60, 'health_points': 350},
+    {'id': 4, 'name': 'Bárbaro Furioso', 'attack_power': 90, 'defense_power': 70, 'health_points': 480},
+    {'id': 5, 'name': 'Assassino Letal', 'attack_power': 88, 'defense_power': 65, 'health_points': 380},
+    {'id': 6, 'name': 'Druida Anciã', 'attack_power': 75, 'defense_power': 85, 'health_points': 420},
+    {'id': 7, 'name': 'Necromante', 'attack_power': 92, 'defense_power': 68, 'health_points': 400},
+    {'id': 8, 'name': 'Guardião de Aço', 'attack_power': 70, 'defense_power': 95, 'health_points': 520}
+]
+
+def timed(run):
+    start = time.perf_counter()
+    results = run()
+    return time.perf_counter() - start, results
+
+def outcome_rates(pairs, results):
+    wins = sum(result['winner_id'] == hero1['id'] for (hero1, _), result in zip(pairs, results))
+    draws = sum(result['winner_id'] is None for result in results)
+    return wins / len(results), draws / len(results)
+
+def main():
+    parser = argparse.ArgumentParser(description='Batalhas por segundo: engine escalar vs vetorizada (numpy)')
+    parser.add_argument('--battles', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    random.seed(args.seed)
+    pairs = [tuple(random.sample(HEROES, 2)) for _ in range(args.battles)]
+
+    print("=" * 70)
+    print(f"🧮 ENGINES DE BATALHA ({args.battles:,} lutas)")
+    print("=" * 70)
+
+    scalar_time, scalar = timed(lambda: [engine.simulate_battle(h1, h2) for h1, h2 in pairs])
+    vector_time, _ = timed(lambda: engine.simulate_battles(pairs, rng=rng))
+    bare_time, vector = timed(lambda: engine.simulate_battles(pairs, rng=rng, with_log=False))
+
+    # Mesmos sorteios nas duas engines: os resultados têm de ser idênticos
+    rolls = engine.draw_rolls(rng, args.battles)
+    same_rolls = engine.simulate_battles(pairs, rolls=rolls)
+    mismatches = sum(engine.simulate_battle(h1, h2, rolls[i].tolist()) != result
+        for i, ((h1, h2), result) in enumerate(zip(pairs, same_rolls)))
+
+    baseline = args.battles / scalar_time
+    print(f"  🐍 escalar (com log):        {baseline:>12,.0f} batalhas/s")
+    print(f"  🧮 numpy (com log):          {args.battles / vector_time:>12,.0f} batalhas/s ({scalar_time / vector_time:.1f}x)")
+    print(f"  🧮 numpy (sem log):          {args.battles / bare_time:>12,.0f} batalhas/s ({scalar_time / bare_time:.1f}x)")
+    print(f"  {'✅' if not mismatches else '❌'} Mesmos sorteios: {mismatches} resultados diferentes")
+
+    # Sorteios independentes (random.randint vs numpy): mesma distribuição
+    scalar_rates = outcome_rates(pairs, scalar)
+    vector_rates = outcome_rates(pairs, vector)
+    print(f"  🎲 Sorteios independentes: herói 1 vence {scalar_rates[0]:.2%} (escalar) vs {vector_rates[0]:.2%} (numpy), "
+        f"empates {scalar_rates[1]:.2%} vs {vector_rates[1]:.2%}")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+import json
+import os
+import random
+import threading
+import time
+import uuid
+
+CACHE_LAYER = os.environ.get('CACHE_LAYER', 'on') == 'on'
+CACHE_TTL = float(os.environ.get('CACHE_TTL', 30))
+# Depois de vencido, o valor ainda fica guardado por CACHE_STALE_TTL segundos
+# para ser servido enquanto um único worker recalcula
+CACHE_STALE_TTL = float(os.environ.get('CACHE_STALE_TTL', 300))
+CACHE_JITTER = float(os.environ.get('CACHE_JITTER', 0.1))
+CACHE_LOCK_TTL = float(os.environ.get('CACHE_LOCK_TTL', 10))
+CACHE_WAIT = float(os.environ.get('CACHE_WAIT', 5))
+
+HITS_KEY = 'stats:cache_hits'
+MISSES_KEY = 'stats:cache_misses'
+STALE_KEY = 'stats:cache_stale'
+COMPUTES_KEY = 'stats:cache_computes'
+
+# Marca como vencido sem apagar (o valor antigo continua disponível) e avança
+# a geração: um cálculo que começou antes disso não grava o valor como fresco
+INVALIDATE_SCRIPT = """
+redis.call('INCR', KEYS[2])
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HSET', KEYS[1], 'fresh_until', 0)
+end
+"""
+
+# Grava o valor calculado; se a geração mudou durante o cálculo, ele já nasce vencido
+STORE_SCRIPT = """
+local fresh_until = ARGV[2]
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[4] then
+    fresh_until = 0
+end
+redis.call('HSET', KEYS[1], 'value', ARGV[1], 'fresh_until', fresh_until)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+"""
+
+# Renova o lock enquanto o cálculo dura (só se ainda for nosso)
+EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Libera o lock só se ainda for nosso (pode ter expirado e sido pego por outro)
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+def cache_key(name):
+    return f'cache:{name}'
+
+def lock_key(name):
+    return f'lock:cache:{name}'
+
+def generation_key(name):
+    return f'cache:generation:{name}'
+
+def jittered(ttl):
+    # Evita que chaves gravadas juntas vençam juntas
+    return ttl * random.uniform(1 - CACHE_JITTER, 1 + CACHE_JITTER)
+
+def counters(r):
+    hits, misses, stale, computes = (int(value or 0) for value in r.mget(HITS_KEY, MISSES_KEY, STALE_KEY, COMPUTES_KEY))
+    served = hits + misses + stale
+    return {
+        'hits': hits,
+        'misses': misses,
+        'stale_hits': stale,
+        'computes': computes,
+        'hit_ratio': round((hits + stale) / served, 4) if served else 0
+    }
+
+class CacheBusy(Exception):
+    pass
+
+class Cache:
+    # compute_on_timeout=False: quem cansou de esperar recebe CacheBusy em vez
+    # de repetir o cálculo (para cálculos caros demais para rodar em dobro)
+    def __init__(self, get_redis, enabled=CACHE_LAYER, ttl=CACHE_TTL, lock_ttl=CACHE_LOCK_TTL,
+            wait=CACHE_WAIT, compute_on_timeout=True):
+        self.get_redis = get_redis
+        self.enabled = enabled
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.wait = wait
+        self.compute_on_timeout = compute_on_timeout
+
+    def _store(self, r, name, value, generation):
+        ttl = jittered(self.ttl)
+        r.eval(STORE_SCRIPT, 2, cache_key(name), generation_key(name),
+            json.dumps(value, default=str), time.time() + ttl, int(ttl + CACHE_STALE_TTL), generation)
+
+    def _compute(self, r, compute):
+        r.incr(COMPUTES_KEY)
+        return compute()
+
+    def _keep_lock(self, r, name, token, done):
+        # O lock vence em lock_ttl se o worker morrer, mas não no meio de um cálculo longo
+        while not done.wait(self.lock_ttl / 3):
+            if not r.eval(EXTEND_SCRIPT, 1, lock_key(name), token, int(self.lock_ttl * 1000)):
+                return
+
+    def _compute_locked(self, r, name, compute, token):
+        done = threading.Event()
+        threading.Thread(target=self._keep_lock, args=(r, name, token, done), daemon=True).start()
+        try:
+            # Geração lida antes do cálculo: compara na hora de gravar
+            generation = r.get(generation_key(name)) or '0'
+            value = self._compute(r, compute)
+            self._store(r, name, value, generation)
+            return value
+        finally:
+            done.set()
+            r.eval(RELEASE_SCRIPT, 1, lock_key(name), token)
+
+    def _refresh_in_background(self, r, name, compute, token):
+        def run():
+            try:
+                self._compute_locked(r, name, compute, token)
+            except Exception as e:
+                print(f"⚠️ Falha ao recalcular cache {name}: {e}")
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _try_lock(self, r, name):
+        token = uuid.uuid4().hex
+        if r.set(lock_key(name), token, nx=True, px=int(self.lock_ttl * 1000)):
+            return token
+        return None
+
+    def get(self, name, compute):
+        # -> (valor, origem): 'cache', 'stale', 'database'
+        r = self.get_redis()
+        if not self.enabled:
+            return self._compute(r, compute), 'database'
+
+        entry = r.hgetall(cache_key(name))
+        if 'value' in entry:
+            value = json.loads(entry['value'])
+            if float(entry['fresh_until']) > time.time():
+                r.incr(HITS_KEY)
+                return value, 'cache'
+            # Vencido: serve o valor antigo e só quem pegar o lock recalcula
+            r.incr(STALE_KEY)
+            token = self._try_lock(r, name)
+            if token:
+                self._refresh_in_background(r, name, compute, token)
+            return value, 'stale'
+
+        # Nada guardado: um recalcula (single-flight), os outros esperam o resultado
+        r.incr(MISSES_KEY)
+        token = self._try_lock(r, name)
+        if token:
+            return self._compute_locked(r, name, compute, token), 'database'
+
+        deadline = time.monotonic() + self.wait
+        while time.monotonic() < deadline:
+            time.sleep(0.02)
+            entry = r.hgetall(cache_key(name))
+            if 'value' in entry:
+                fresh = float(entry['fresh_until']) > time.time()
+                return json.loads(entry['value']), 'cache' if fresh else 'stale'
+        if not self.compute_on_timeout:
+            raise CacheBusy(f"{name} ainda sendo calculado")
+        return self._compute(r, compute), 'database'
+
+    def invalidate(self, *names):
+        if not self.enabled:
+            return
+        r = self.get_redis()
+        for name in names:
+            r.eval(INVALIDATE_SCRIPT, 2, cache_key(name), generation_key(name))
@@ -0,0 +1,236 @@
+import os
+import random
+import struct
+
+import numpy as np
+
+BATTLE_ENGINE = os.environ.get('BATTLE_ENGINE', 'numpy')
+BATTLE_ENGINES = ('numpy', 'python')
+MAX_ROUNDS = 20
+# Variação de cada golpe: randint(-ROLL, ROLL)
+ROLL = 10
+# Maior HP ou dano do formato curto do log compacto (uint16)
+LOG_MAX_VALUE = 2 ** 16 - 1
+# Prefixo do formato largo (int64): comprimento ímpar, o curto é sempre par
+LOG_WIDE_MARKER = b'\x00'
+
+def draw_rolls(rng, count):
+    # Sorteios de uma vez para `count` batalhas: [batalha, round, atacante].
+    # A mesma matriz alimenta as duas engines (com rolls iguais, resultados iguais)
+    return rng.integers(-ROLL, ROLL + 1, size=(count, MAX_ROUNDS, 2))
+
+def simulate_battle(hero1, hero2, rolls=None):
+    # Engine escalar: um round por vez; sem `rolls`, sorteia com random.randint
+    h1_hp = hero1['health_points']
+    h2_hp = hero2['health_points']
+
+    h1_damage_total = 0
+    h2_damage_total = 0
+
+    log = []
+    hits = []
+    rounds = 0
+
+    log.append(f"⚔️ {hero1['name']} VS {hero2['name']}")
+    log.append("=" * 50)
+
+    while h1_hp > 0 and h2_hp > 0 and rounds < MAX_ROUNDS:
+        rounds += 1
+        log.append(f"\nRound {rounds}:")
+
+        roll = rolls[rounds - 1][0] if rolls is not None else random.randint(-ROLL, ROLL)
+        h1_damage = max(0, hero1['attack_power'] - hero2['defense_power']//2 + int(roll))
+        h2_hp -= h1_damage
+        h1_damage_total += h1_damage
+        hits.append(h1_damage)
+        log.append(f"  {hero1['name']} ataca! Dano: {h1_damage} (HP: {max(0, h2_hp)})")
+
+        if h2_hp <= 0:
+            break
+
+        roll = rolls[rounds - 1][1] if rolls is not None else random.randint(-ROLL, ROLL)
+        h2_damage = max(0, hero2['attack_power'] - hero1['defense_power']//2 + int(roll))
+        h1_hp -= h2_damage
+        h2_damage_total += h2_damage
+        hits.append(h2_damage)
+        log.append(f"  {hero2['name']} contra-ataca! Dano: {h2_damage} (HP: {max(0, h1_hp)})")
+
+    log.append("\n" + "=" * 50)
+
+    if h1_hp > h2_hp:
+        winner_id = hero1['id']
+        log.append(f"🏆 VENCEDOR: {hero1['name']}!")
+    elif h2_hp > h1_hp:
+        winner_id = hero2['id']
+        log.append(f"🏆 VENCEDOR: {hero2['name']}!")
+    else:
+        winner_id = None
+        log.append("🤝 EMPATE!")
+
+    return {
+        'winner_id': winner_id,
+        'hero1_damage': h1_damage_total,
+        'hero2_damage': h2_damage_total,
+        'rounds': rounds,
+        'log': '\n'.join(log),
+        'log_data': pack_log(hero1['health_points'], hero2['health_points'], hits)
+    }
+
+def pack_log(hp1, hp2, hits):
+    # Log compacto: HP inicial dos dois e o dano de cada golpe na ordem
+    # (1, 2, 1, 2, ...), uint16 little-endian. Número ímpar de golpes = o herói
+    # 1 derrubou o 2 no último round. ~10-40 bytes contra ~1 KB do texto.
+    # Batalha com algum valor fora do uint16 (HP negativo, ataque enorme) vai
+    # inteira no formato largo em vez de ser truncada
+    values = (hp1, hp2, *hits)
+    if min(values) >= 0 and max(values) <= LOG_MAX_VALUE:
+        return struct.pack(f'<{len(values)}H', *values)
+    return LOG_WIDE_MARKER + struct.pack(f'<{len(values)}q', *values)
+
+def unpack_log(data):
+    if len(data) % 2:
+        values = struct.unpack(f'<{len(data) // 8}q', data[1:])
+    else:
+        values = struct.unpack(f'<{len(data) // 2}H', data)
+    return values[0], values[1], list(values[2:])
+
+def stats_arrays(heroes):
+    return (np.array([hero['attack_power'] for hero in heroes], dtype=np.int64),
+        np.array([hero['defense_power'] for hero in heroes], dtype=np.int64),
+        np.array([hero['health_points'] for hero in heroes], dtype=np.int64))
+
+def simulate_arrays(atk1, def1, hp1, atk2, def2, hp2, rolls):
+    # Todas as batalhas e todos os rounds de uma vez. O dano de cada golpe não
+    # depende do HP, então os 20 rounds são calculados inteiros e o fim de
+    # cada luta sai do primeiro round em que o HP acumulado zera
+    count = len(atk1)
+    damage1 = np.maximum(0, (atk1 - def2 // 2)[:, None] + rolls[:, :, 0])
+    damage2 = np.maximum(0, (atk2 - def1 // 2)[:, None] + rolls[:, :, 1])
+    dealt1 = np.cumsum(damage1, axis=1)
+    dealt2 = np.cumsum(damage2, axis=1)
+
+    # Round (0-based) do golpe fatal de cada lado; MAX_ROUNDS = ninguém caiu
+    h2_down = hp2[:, None] - dealt1 <= 0
+    h1_down = hp1[:, None] - dealt2 <= 0
+    k1 = np.where(h2_down.any(axis=1), h2_down.argmax(axis=1), MAX_ROUNDS)
+    k2 = np.where(h1_down.any(axis=1), h1_down.argmax(axis=1), MAX_ROUNDS)
+
+    # No mesmo round o herói 1 ataca primeiro: o herói 2 não chega a revidar
+    hero1_finished = (k1 <= k2) & (k1 < MAX_ROUNDS)
+    last = np.minimum(np.minimum(k1, k2), MAX_ROUNDS - 1)
+    index = np.arange(count)
+    hero1_damage = dealt1[index, last]
+    before_last = np.where(last > 0, dealt2[index, np.maximum(last - 1, 0)], 0)
+    hero2_damage = np.where(hero1_finished, before_last, dealt2[index, last])
+
+    final1 = hp1 - hero2_damage
+    final2 = hp2 - hero1_damage
+    # 1 = herói 1 venceu, 2 = herói 2, 0 = empate
+    outcome = np.where(final1 > final2, 1, np.where(final2 > final1, 2, 0))
+    return {
+        'outcome': outcome,
+        'rounds': last + 1,
+        'hero1_damage': hero1_damage,
+        'hero2_damage': hero2_damage,
+        'hero1_finished': hero1_finished,
+        'damage1': damage1,
+        'damage2': damage2
+    }
+
+def render_log(hero1, hero2, damage1, damage2, rounds, hero1_finished, winner_id):
+    # Mesmo texto da engine escalar, montado a partir dos danos por round
+    h1_hp = hero1['health_points']
+    h2_hp = hero2['health_points']
+    log = [f"⚔️ {hero1['name']} VS {hero2['name']}", "=" * 50]
+    for r in range(rounds):
+        log.append(f"\nRound {r + 1}:")
+        h2_hp -= damage1[r]
+        log.append(f"  {hero1['name']} ataca! Dano: {damage1[r]} (HP: {max(0, h2_hp)})")
+        if r == rounds - 1 and hero1_finished:
+            break
+        h1_hp -= damage2[r]
+        log.append(f"  {hero2['name']} contra-ataca! Dano: {damage2[r]} (HP: {max(0, h1_hp)})")
+    log.append("\n" + "=" * 50)
+    if winner_id == hero1['id']:
+        log.append(f"🏆 VENCEDOR: {hero1['name']}!")
+    elif winner_id == hero2['id']:
+        log.append(f"🏆 VENCEDOR: {hero2['name']}!")
+    else:
+        log.append("🤝 EMPATE!")
+    return '\n'.join(log)
+
+def render_packed_log(hero1, hero2, data, winner_id):
+    # Texto de simulate_battle a partir do log compacto (herói: id e name)
+    hp1, hp2, hits = unpack_log(data)
+    return render_log({**hero1, 'health_points': hp1}, {**hero2, 'health_points': hp2},
+        hits[0::2], hits[1::2], (len(hits) + 1) // 2, len(hits) % 2 == 1, winner_id)
+
+def pack_logs(hp1, hp2, sim):
+    # pack_log de todas as batalhas: uma matriz [hp1, hp2, golpes...] cortada por linha
+    count = len(hp1)
+    table = np.empty((count, 2 + 2 * MAX_ROUNDS), dtype=np.int64)
+    table[:, 0] = hp1
+    table[:, 1] = hp2
+    table[:, 2::2] = sim['damage1']
+    table[:, 3::2] = sim['damage2']
+    sizes = 2 + 2 * sim['rounds'] - sim['hero1_finished']
+
+    # Mesmo critério de pack_log, olhando só os golpes que entram no log: a
+    # conversão para uint16 daria a volta calada nas batalhas fora da faixa
+    used = np.arange(table.shape[1]) < sizes[:, None]
+    wide = ((table < 0) & used).any(axis=1) | ((table > LOG_MAX_VALUE) & used).any(axis=1)
+
+    # Fatiar bytes é bem mais barato que fatiar o array linha a linha
+    raw = table.astype('<u2').tobytes()
+    width = table.shape[1] * 2
+    ends = (2 * sizes).tolist()
+    packed = [raw[i * width:i * width + end] for i, end in enumerate(ends)]
+    for i in np.flatnonzero(wide).tolist():
+        packed[i] = LOG_WIDE_MARKER + table[i, :sizes[i]].astype('<i8').tobytes()
+    return packed
+
+def simulate_battles(pairs, rolls=None, rng=None, with_log=True):
+    # pairs: [(herói 1, herói 2), ...] -> resultados no formato de simulate_battle
+    if not pairs:
+        return []
+    if rolls is None:
+        rolls = draw_rolls(rng or np.random.default_rng(), len(pairs))
+    heroes1 = [hero1 for hero1, _ in pairs]
+    heroes2 = [hero2 for _, hero2 in pairs]
+    stats1, stats2 = stats_arrays(heroes1), stats_arrays(heroes2)
+    sim = simulate_arrays(*stats1, *stats2, rolls)
+    log_data = pack_logs(stats1[2], stats2[2], sim)
+
+    # Listas Python antes do laço: indexar arrays numpy um a um é lento
+    outcomes = sim['outcome'].tolist()
+    rounds = sim['rounds'].tolist()
+    hero1_damage = sim['hero1_damage'].tolist()
+    hero2_damage = sim['hero2_damage'].tolist()
+    if with_log:
+        finished = sim['hero1_finished'].tolist()
+        damage1 = sim['damage1'].tolist()
+        damage2 = sim['damage2'].tolist()
+
+    results = []
+    for i, (hero1, hero2) in enumerate(pairs):
+        outcome = outcomes[i]
+        winner_id = hero1['id'] if outcome == 1 else hero2['id'] if outcome == 2 else None
+        result = {
+            'winner_id': winner_id,
+            'hero1_damage': hero1_damage[i],
+            'hero2_damage': hero2_damage[i],
+            'rounds': rounds[i],
+            'log_data': log_data[i]
+        }
+        if with_log:
+            result['log'] = render_log(hero1, hero2, damage1[i], damage2[i], rounds[i], finished[i], winner_id)
+        results.append(result)
+    return results
+
+def simulate(pairs, engine=BATTLE_ENGINE, with_log=True):
+    # with_log=False dispensa o texto (a engine escalar monta sempre); log_data vem sempre
+    if engine not in BATTLE_ENGINES:
+        raise ValueError(f"BATTLE_ENGINE desconhecida: {engine}")
+    if engine == 'python':
+        return [simulate_battle(hero1, hero2) for hero1, hero2 in pairs]
+    return simulate_battles(pairs, with_log=with_log)
@@ -0,0 +1,220 @@
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+
+LEADERBOARD_KEY = 'leaderboard:points'
+READY_KEY = 'leaderboard:ready'
+REBUILD_LOCK_KEY = 'leaderboard:rebuild_lock'
+# Batalhas entre o commit no Postgres e o ZINCRBY: token -> início
+INFLIGHT_KEY = 'leaderboard:inflight'
+REBUILD_WAIT = float(os.environ.get('LEADERBOARD_REBUILD_WAIT', 10))
+# Token de batalha mais velho que isso é de um worker que morreu no meio
+INFLIGHT_TTL = float(os.environ.get('LEADERBOARD_INFLIGHT_TTL', 30))
+
+# Só registra a batalha se não houver reconstrução em andamento
+BEGIN_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+return 1
+"""
+
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+class LeaderboardBusy(Exception):
+    pass
+
+# Score = pontos de ranking nos bits altos e vitórias nos baixos: uma única
+# ordenação numérica reproduz o ORDER BY ranking_points DESC, wins DESC da
+# view hero_stats e cada batalha vira um ZINCRBY. O score é um double (53
+# bits exatos): vitórias <= pontos / 3 < 2^26, então com pontos < 2^27
+# (~44 milhões de vitórias) as vitórias nunca invadem os bits dos pontos.
+# O desempate por total_damage_dealt da view não entra no score: empatados
+# em pontos e vitórias ficam na ordem do id (lexicográfica) do Redis
+POINTS_SHIFT = 2 ** 26
+MAX_POINTS = 2 ** 27
+
+def hero_key(hero_id):
+    return f'leaderboard:hero:{hero_id}'
+
+def score(points, wins):
+    if points >= MAX_POINTS:
+        raise ValueError(f"{points} pontos não cabem no score do leaderboard (máximo {MAX_POINTS - 1})")
+    return points * POINTS_SHIFT + wins
+
+def entry(position, hero_id, fields):
+    wins, losses, draws = int(fields['wins']), int(fields['losses']), int(fields['draws'])
+    fights = wins + losses + draws
+    return {
+        'position': position,
+        'id': int(hero_id),
+        'name': fields['name'],
+        'class': fields['class'],
+        'level': int(fields['level']),
+        'wins': wins,
+        'losses': losses,
+        'draws': draws,
+        'win_rate': round(wins / fights * 100, 2) if fights else 0,
+        'ranking_points': wins * 3 + draws
+    }
+
+def record_battles(r, results):
+    # results: {hero_id: (vitórias, derrotas, empates)} já somados por herói.
+    # Chamado depois do commit; MULTI/EXEC aplica tudo junto
+    pipe = r.pipeline()
+    for hero_id, (wins, losses, draws) in results.items():
+        if wins or draws:
+            pipe.zincrby(LEADERBOARD_KEY, score(wins * 3 + draws, wins), hero_id)
+        for field, value in (('wins', wins), ('losses', losses), ('draws', draws)):
+            if value:
+                pipe.hincrby(hero_key(hero_id), field, value)
+    pipe.execute()
+
+def record_battle(r, hero1_id, hero2_id, winner_id):
+    if winner_id is None:
+        record_battles(r, {hero1_id: (0, 0, 1), hero2_id: (0, 0, 1)})
+    else:
+        loser_id = hero2_id if winner_id == hero1_id else hero1_id
+        record_battles(r, {winner_id: (1, 0, 0), loser_id: (0, 1, 0)})
+
+@contextmanager
+def publishing(r):
+    # Envolve a transação das batalhas *e* o record_battles depois do commit.
+    # rebuild() espera as que estão em andamento e segura as novas: o retrato
+    # do Postgres nunca fica entre um commit e o seu ZINCRBY
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + REBUILD_WAIT
+    while not r.eval(BEGIN_SCRIPT, 2, REBUILD_LOCK_KEY, INFLIGHT_KEY, token, time.time()):
+        if time.monotonic() > deadline:
+            raise LeaderboardBusy("leaderboard em reconstrução")
+        time.sleep(0.01)
+    try:
+        yield
+    finally:
+        r.zrem(INFLIGHT_KEY, token)
+
+def wait_inflight(r):
+    deadline = time.monotonic() + REBUILD_WAIT
+    while r.zcount(INFLIGHT_KEY, time.time() - INFLIGHT_TTL, '+inf'):
+        if time.monotonic() > deadline:
+            raise LeaderboardBusy("batalhas em andamento não terminaram")
+        time.sleep(0.01)
+    r.zremrangebyscore(INFLIGHT_KEY, '-inf', time.time() - INFLIGHT_TTL)
+
+def acquire_rebuild_lock(r, wait=True):
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + REBUILD_WAIT
+    while not r.set(REBUILD_LOCK_KEY, token, nx=True, ex=int(REBUILD_WAIT * 3)):
+        if not wait:
+            return None
+        if time.monotonic() > deadline:
+            raise LeaderboardBusy("outra reconstrução em andamento")
+        time.sleep(0.05)
+    return token
+
+def rebuild(r, db, wait=True):
+    # Recuperação: recria o leaderboard a partir do Postgres (fonte da verdade).
+    # Exclusivo com publishing(): com o lock, novas batalhas esperam e as em
+    # andamento terminam antes do SELECT. ZSET e hashes são montados em chaves
+    # temporárias e trocados com RENAME num único MULTI/EXEC.
+    # wait=False: devolve None se outro processo já está reconstruindo
+    token = acquire_rebuild_lock(r, wait)
+    if token is None:
+        return None
+    try:
+        wait_inflight(r)
+        with db.cursor() as cursor:
+            cursor.execute('SELECT id, name, class, level, wins, losses, draws FROM heroes')
+            heroes = cursor.fetchall()
+
+        temp_key = f'{LEADERBOARD_KEY}:rebuild:{os.getpid()}'
+
+        def temp_hero_key(hero_id):
+            return f'{temp_key}:hero:{hero_id}'
+
+        scores = {hero['id']: score((hero['wins'] or 0) * 3 + (hero['draws'] or 0), hero['wins'] or 0)
+            for hero in heroes}
+
+        pipe = r.pipeline(transaction=False)
+        pipe.delete(temp_key)
+        for hero in heroes:
+            pipe.delete(temp_hero_key(hero['id']))
+            pipe.hset(temp_hero_key(hero['id']), mapping={
+                'name': hero['name'],
+                'class': hero['class'],
+                'level': hero['level'] or 0,
+                'wins': hero['wins'] or 0,
+                'losses': hero['losses'] or 0,
+                'draws': hero['draws'] or 0
+            })
+        if scores:
+            pipe.zadd(temp_key, scores)
+        pipe.execute()
+
+        pipe = r.pipeline()
+        for hero in heroes:
+            pipe.rename(temp_hero_key(hero['id']), hero_key(hero['id']))
+        if scores:
+            pipe.rename(temp_key, LEADERBOARD_KEY)
+        else:
+            pipe.delete(LEADERBOARD_KEY)
+        pipe.set(READY_KEY, int(time.time()))
+        pipe.execute()
+        return len(heroes)
+    finally:
+        r.eval(RELEASE_SCRIPT, 1, REBUILD_LOCK_KEY, token)
+
+def ensure_ready(r, db):
+    # Só um processo reconstrói (SET NX); os demais esperam o marcador em vez
+    # de irem todos ao Postgres ao mesmo tempo
+    if r.exists(READY_KEY):
+        return True
+    if rebuild(r, db, wait=False) is not None:
+        return True
+    deadline = time.monotonic() + REBUILD_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        if r.exists(READY_KEY):
+            return True
+    return False
+
+def hydrate(r, members, first_position):
+    pipe = r.pipeline(transaction=False)
+    for hero_id in members:
+        pipe.hgetall(hero_key(hero_id))
+    return [entry(first_position + i, hero_id, fields)
+        for i, (hero_id, fields) in enumerate(zip(members, pipe.execute())) if 'name' in fields]
+
+def page(r, offset=0, limit=10):
+    members = r.zrevrange(LEADERBOARD_KEY, offset, offset + limit - 1)
+    return hydrate(r, members, offset + 1)
+
+def hero_position(r, hero_id):
+    position = r.zrevrank(LEADERBOARD_KEY, hero_id)
+    if position is None:
+        return None
+    entries = hydrate(r, [hero_id], position + 1)
+    return entries[0] if entries else None
+
+def size(r):
+    return r.zcard(LEADERBOARD_KEY)
+
+def main():
+    # python leaderboard.py rebuild
+    if sys.argv[1:] != ['rebuild']:
+        print("Uso: python leaderboard.py rebuild")
+        sys.exit(1)
+    from app import db, get_redis
+    count = rebuild(get_redis(), db)
+    print(f"🏆 Leaderboard reconstruído a partir do Postgres: {count} heróis")
+
+if __name__ == '__main__':
+    main()
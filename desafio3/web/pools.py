@@ -0,0 +1,254 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2
+import redis
+from psycopg2 import pool
+from psycopg2.extras import RealDictCursor
+
+DB_CONFIG = {
+    'dbname': 'battle_arena',
+    'user': 'arena_master',
+    'password': 'battle123',
+    'host': 'arena-database',
+    'port': '5432'
+}
+
+REDIS_CONFIG = {
+    'host': 'arena-cache',
+    'port': 6379,
+    'decode_responses': True
+}
+
+# Pools por processo: cada worker do Gunicorn abre os seus depois do fork
+CLIENT_POOLS = os.environ.get('CLIENT_POOLS', 'on') == 'on'
+DB_POOL_MIN = int(os.environ.get('DB_POOL_MIN', 1))
+DB_POOL_MAX = int(os.environ.get('DB_POOL_MAX', os.environ.get('SERVER_THREADS', 4)))
+REDIS_POOL_MAX = int(os.environ.get('REDIS_POOL_MAX', os.environ.get('SERVER_THREADS', 4)))
+POOL_TIMEOUT = float(os.environ.get('POOL_TIMEOUT', 5))
+POOL_HEALTH_CHECK_INTERVAL = float(os.environ.get('POOL_HEALTH_CHECK_INTERVAL', 30))
+
+class PoolStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.pid = os.getpid()
+        self.checkouts = 0
+        self.in_use = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.failed_checkouts = 0
+        self.opened = 0
+        self.reconnects = 0
+
+    def connection_opened(self):
+        with self.lock:
+            self.opened += 1
+
+    def reconnected(self):
+        with self.lock:
+            self.reconnects += 1
+
+    def checked_out(self, waited):
+        with self.lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def returned(self):
+        with self.lock:
+            self.in_use -= 1
+
+    def checkout_failed(self):
+        with self.lock:
+            self.failed_checkouts += 1
+
+    def snapshot(self, max_size):
+        with self.lock:
+            return {
+                'max_size': max_size,
+                'opened': self.opened,
+                'in_use': self.in_use,
+                'checkouts': self.checkouts,
+                'wait_avg_ms': round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0,
+                'wait_max_ms': round(self.wait_max * 1000, 3),
+                'failed_checkouts': self.failed_checkouts,
+                'reconnects': self.reconnects
+            }
+
+class DatabasePool:
+    def __init__(self, enabled=CLIENT_POOLS, minconn=DB_POOL_MIN, maxconn=DB_POOL_MAX,
+            timeout=POOL_TIMEOUT, health_check_interval=POOL_HEALTH_CHECK_INTERVAL):
+        self.enabled = enabled
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.stats = PoolStats()
+        self.lock = threading.Lock()
+        self.pool = None
+        self.pid = None
+        self.slots = None
+
+    def _connection_factory(self, dsn, *args):
+        conn = psycopg2.extensions.connection(dsn)
+        self.stats.connection_opened()
+        conn.last_used = time.monotonic()
+        return conn
+
+    def _get_pool(self):
+        # Criado no primeiro request de cada processo: um pool herdado do
+        # master do Gunicorn compartilharia os sockets entre os workers
+        if self.pid != os.getpid():
+            with self.lock:
+                if self.pid != os.getpid():
+                    if self.stats.pid != os.getpid():
+                        self.stats.reset()
+                    self.pool = pool.ThreadedConnectionPool(
+                        self.minconn, self.maxconn, connection_factory=self._connection_factory, **DB_CONFIG)
+                    # ThreadedConnectionPool falha na hora quando esgota; o
+                    # semáforo faz a thread esperar uma conexão livre
+                    self.slots = threading.BoundedSemaphore(self.maxconn)
+                    self.pid = os.getpid()
+        return self.pool
+
+    def _is_healthy(self, conn):
+        if conn.closed:
+            return False
+        if time.monotonic() - conn.last_used < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _acquire(self):
+        if not self.enabled:
+            start = time.perf_counter()
+            conn = psycopg2.connect(connection_factory=self._connection_factory, **DB_CONFIG)
+            self.stats.checked_out(time.perf_counter() - start)
+            return conn
+
+        start = time.perf_counter()
+        try:
+            db_pool = self._get_pool()
+        except psycopg2.Error:
+            self.stats.checkout_failed()
+            raise
+        if not self.slots.acquire(timeout=self.timeout):
+            self.stats.checkout_failed()
+            raise pool.PoolError(f"nenhuma conexão livre em {self.timeout}s")
+        try:
+            conn = db_pool.getconn()
+            if not self._is_healthy(conn):
+                # Conexão derrubada pelo servidor (restart, timeout ocioso): descarta e abre outra
+                db_pool.putconn(conn, close=True)
+                self.stats.reconnected()
+                conn = db_pool.getconn()
+        except Exception:
+            self.slots.release()
+            self.stats.checkout_failed()
+            raise
+        self.stats.checked_out(time.perf_counter() - start)
+        return conn
+
+    def _release(self, conn):
+        conn.last_used = time.monotonic()
+        self.stats.returned()
+        if not self.enabled:
+            conn.close()
+            return
+        self.pool.putconn(conn, close=bool(conn.closed))
+        self.slots.release()
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    conn.close()
+            raise
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def cursor(self):
+        with self.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                yield cursor
+
+    def metrics(self):
+        return self.stats.snapshot(self.maxconn if self.enabled else None)
+
+    def close(self):
+        with self.lock:
+            if self.pool is not None:
+                self.pool.closeall()
+            self.pool = None
+            self.pid = None
+
+class RedisPool(redis.BlockingConnectionPool):
+    # BlockingConnectionPool espera (até `timeout`) por uma conexão livre em
+    # vez de estourar; as sobrescritas só contam aberturas e tempo de espera
+    def __init__(self, **kwargs):
+        self.stats = PoolStats()
+        super().__init__(**kwargs)
+
+    def reset(self):
+        # Chamado também pelo redis-py quando detecta um fork
+        super().reset()
+        self.stats.reset()
+
+    def make_connection(self):
+        # O socket só abre no primeiro comando: conta conexões criadas pelo pool
+        self.stats.connection_opened()
+        return super().make_connection()
+
+    def get_connection(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            connection = super().get_connection(*args, **kwargs)
+        except redis.ConnectionError:
+            self.stats.checkout_failed()
+            raise
+        self.stats.checked_out(time.perf_counter() - start)
+        connection.checked_out = True
+        return connection
+
+    def release(self, connection):
+        # get_connection também devolve a conexão quando o connect falha
+        if getattr(connection, 'checked_out', False):
+            connection.checked_out = False
+            self.stats.returned()
+        super().release(connection)
+
+class RedisClients:
+    def __init__(self, enabled=CLIENT_POOLS, maxconn=REDIS_POOL_MAX, timeout=POOL_TIMEOUT,
+            health_check_interval=POOL_HEALTH_CHECK_INTERVAL):
+        self.enabled = enabled
+        self.maxconn = maxconn
+        self.pool = RedisPool(max_connections=maxconn, timeout=timeout,
+            health_check_interval=health_check_interval, **REDIS_CONFIG)
+        self.client = redis.Redis(connection_pool=self.pool)
+
+    def get(self):
+        if not self.enabled:
+            return redis.Redis(**REDIS_CONFIG)
+        return self.client
+
+    def metrics(self):
+        return self.pool.stats.snapshot(self.maxconn if self.enabled else None)
@@ -0,0 +1,122 @@
+import hashlib
+import os
+import threading
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+import engine
+
+PREDICT_SIMULATIONS = int(os.environ.get('PREDICT_SIMULATIONS', 2000))
+PREDICT_MAX_SIMULATIONS = int(os.environ.get('PREDICT_MAX_SIMULATIONS', 20000))
+PREDICT_PROCESSES = int(os.environ.get('PREDICT_PROCESSES', 2))
+# Batalhas por chamada da engine: limita a memória das matrizes de sorteios
+PREDICT_CHUNK_BATTLES = int(os.environ.get('PREDICT_CHUNK_BATTLES', 50_000))
+MATCHUPS_MAX_HEROES = int(os.environ.get('MATCHUPS_MAX_HEROES', 32))
+# Lutas simuladas por matriz (pares × simulations): ~1 milhão/s no pool de 2
+# processos, então o padrão (32 heróis × 2000) fica em ~2 s
+MATCHUPS_MAX_BATTLES = int(os.environ.get('MATCHUPS_MAX_BATTLES', 2_000_000))
+# O lock do cálculo é renovado enquanto ele roda; o TTL só vale se o worker morrer.
+# Quem espera mais que PREDICT_WAIT recebe 202 em vez de calcular de novo
+PREDICT_LOCK_TTL = float(os.environ.get('PREDICT_LOCK_TTL', 30))
+PREDICT_WAIT = float(os.environ.get('PREDICT_WAIT', 10))
+# A previsão só muda com os atributos (que fazem parte da chave): o TTL só limpa chaves velhas
+PREDICT_CACHE_TTL = float(os.environ.get('PREDICT_CACHE_TTL', 3600))
+
+def hero_stats(hero):
+    # Só o que muda o resultado de uma luta: ataque, defesa e HP
+    return (hero['attack_power'], hero['defense_power'], hero['health_points'])
+
+def stats_key(stats):
+    return '-'.join(str(value) for value in stats)
+
+def pair_seed(stats1, stats2, simulations):
+    # Semente fixa por confronto: mesmos atributos, mesma previsão em qualquer worker
+    return zlib.crc32(f'{stats_key(stats1)}:{stats_key(stats2)}:{simulations}'.encode())
+
+def simulate_pairs(pairs, simulations):
+    # Roda nos processos do pool. pairs: [(stats1, stats2), ...] ->
+    # [(vitórias do 1, empates, vitórias do 2, soma dos rounds), ...]
+    results = []
+    per_call = max(1, PREDICT_CHUNK_BATTLES // simulations)
+    for start in range(0, len(pairs), per_call):
+        chunk = pairs[start:start + per_call]
+        rolls = np.concatenate([
+            engine.draw_rolls(np.random.default_rng(pair_seed(stats1, stats2, simulations)), simulations)
+            for stats1, stats2 in chunk])
+        stats1 = np.repeat(np.array([s1 for s1, _ in chunk], dtype=np.int64), simulations, axis=0)
+        stats2 = np.repeat(np.array([s2 for _, s2 in chunk], dtype=np.int64), simulations, axis=0)
+        sim = engine.simulate_arrays(stats1[:, 0], stats1[:, 1], stats1[:, 2],
+            stats2[:, 0], stats2[:, 1], stats2[:, 2], rolls)
+
+        outcome = sim['outcome'].reshape(len(chunk), simulations)
+        rounds = sim['rounds'].reshape(len(chunk), simulations).sum(axis=1)
+        wins = (outcome == 1).sum(axis=1)
+        draws = (outcome == 0).sum(axis=1)
+        losses = (outcome == 2).sum(axis=1)
+        results.extend(zip(wins.tolist(), draws.tolist(), losses.tolist(), rounds.tolist()))
+    return results
+
+def probabilities(counts, simulations):
+    wins, draws, losses, rounds = counts
+    return {
+        'win': round(wins / simulations, 4),
+        'draw': round(draws / simulations, 4),
+        'loss': round(losses / simulations, 4),
+        'expected_rounds': round(rounds / simulations, 2)
+    }
+
+class Predictor:
+    def __init__(self, processes=PREDICT_PROCESSES):
+        self.processes = processes
+        self.lock = threading.Lock()
+        self.executor = None
+        self.pid = None
+
+    def _get_executor(self):
+        # Um pool por worker do Gunicorn, criado no primeiro uso. spawn em vez
+        # de fork: o worker tem threads e conexões abertas que não devem ser copiadas
+        if self.pid != os.getpid():
+            with self.lock:
+                if self.pid != os.getpid():
+                    self.executor = ProcessPoolExecutor(self.processes, mp_context=get_context('spawn'))
+                    self.pid = os.getpid()
+        return self.executor
+
+    def simulate(self, pairs, simulations):
+        # {(stats1, stats2): contagens}; atributos repetidos simulam uma vez só
+        unique = list(dict.fromkeys(pairs))
+        if self.processes < 1 or len(unique) == 1:
+            counts = simulate_pairs(unique, simulations)
+        else:
+            size = -(-len(unique) // self.processes)
+            chunks = [unique[i:i + size] for i in range(0, len(unique), size)]
+            counts = [c for part in self._get_executor().map(simulate_pairs, chunks, [simulations] * len(chunks))
+                for c in part]
+        return dict(zip(unique, counts))
+
+    def predict(self, hero1, hero2, simulations):
+        pair = (hero_stats(hero1), hero_stats(hero2))
+        return probabilities(self.simulate([pair], simulations)[pair], simulations)
+
+    def matchups(self, heroes, simulations):
+        # Matriz N×N: linha = herói 1 (ataca primeiro), coluna = herói 2
+        pairs = [(hero_stats(hero1), hero_stats(hero2))
+            for hero1 in heroes for hero2 in heroes if hero1['id'] != hero2['id']]
+        counts = self.simulate(pairs, simulations)
+        return [[probabilities(counts[(hero_stats(hero1), hero_stats(hero2))], simulations)
+            if hero1['id'] != hero2['id'] else None for hero2 in heroes] for hero1 in heroes]
+
+def matrix_battles(hero_count, simulations):
+    return hero_count * (hero_count - 1) * simulations
+
+def matrix_name(heroes, simulations):
+    # Chave do cache: ids e atributos de combate de todos os heróis da matriz.
+    # Muda só quando algum ataque/defesa/HP muda (ou a lista de heróis)
+    signature = ','.join(f"{hero['id']}:{stats_key(hero_stats(hero))}" for hero in heroes)
+    return f'matchups:{simulations}:{hashlib.sha1(signature.encode()).hexdigest()}'
+
+def predict_name(hero1, hero2, simulations):
+    return f'predict:{simulations}:{stats_key(hero_stats(hero1))}:{stats_key(hero_stats(hero2))}'
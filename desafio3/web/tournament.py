@@ -0,0 +1,89 @@
+import itertools
+
+TOURNAMENT_FORMATS = ('round_robin', 'bracket')
+# Empate na chave eliminatória: revanche até sair um vencedor
+BRACKET_REMATCHES = 5
+
+def points(wins, draws):
+    return wins * 3 + draws
+
+def round_robin(hero_ids, fight_many, legs=1):
+    # Todos contra todos, `legs` vezes (alternando quem ataca primeiro), numa leva só
+    pairs = []
+    for leg in range(legs):
+        for hero1_id, hero2_id in itertools.combinations(hero_ids, 2):
+            pairs.append((hero2_id, hero1_id) if leg % 2 else (hero1_id, hero2_id))
+    fights = fight_many(pairs)
+    return fights, standings(hero_ids, fights)
+
+def standings(hero_ids, fights):
+    table = {hero_id: {'hero_id': hero_id, 'wins': 0, 'losses': 0, 'draws': 0} for hero_id in hero_ids}
+    for hero1_id, hero2_id, result in fights:
+        winner_id = result['winner_id']
+        if winner_id is None:
+            table[hero1_id]['draws'] += 1
+            table[hero2_id]['draws'] += 1
+        else:
+            table[winner_id]['wins'] += 1
+            table[hero2_id if winner_id == hero1_id else hero1_id]['losses'] += 1
+    for row in table.values():
+        row['points'] = points(row['wins'], row['draws'])
+    return sorted(table.values(), key=lambda row: (-row['points'], -row['wins'], row['hero_id']))
+
+def bracket_size(count):
+    size = 1
+    while size < count:
+        size *= 2
+    return size
+
+def play_round(pairs, fight_many):
+    # Uma leva por tentativa: empates voltam para a revanche na leva seguinte
+    winners = {}
+    fights = {pair: [] for pair in pairs}
+    pending = list(pairs)
+    for _ in range(1 + BRACKET_REMATCHES):
+        if not pending:
+            break
+        for fight in fight_many(pending):
+            fights[fight[:2]].append(fight)
+            if fight[2]['winner_id'] is not None:
+                winners[fight[:2]] = fight[2]['winner_id']
+        pending = [pair for pair in pending if pair not in winners]
+    for hero1_id, hero2_id in pending:
+        # Empates seguidos: avança quem causou mais dano na última luta
+        result = fights[(hero1_id, hero2_id)][-1][2]
+        winners[(hero1_id, hero2_id)] = hero1_id if result['hero1_damage'] >= result['hero2_damage'] else hero2_id
+    return winners, fights
+
+def bracket(hero_ids, fight_many):
+    # Eliminatória simples na ordem recebida (cabeças de chave): os primeiros
+    # avançam direto (bye) até a chave fechar numa potência de 2
+    byes = bracket_size(len(hero_ids)) - len(hero_ids)
+    slots = []
+    for hero_id in hero_ids[:byes]:
+        slots += [hero_id, None]
+    slots += hero_ids[byes:]
+
+    fights = []
+    rounds = []
+    alive = slots
+    while len(alive) > 1:
+        pairs = list(zip(alive[::2], alive[1::2]))
+        winners, round_fights = play_round([pair for pair in pairs if pair[1] is not None], fight_many)
+        matches = []
+        for pair in pairs:
+            if pair[1] is None:
+                matches.append({'hero1_id': pair[0], 'hero2_id': None, 'winner_id': pair[0], 'fights': 0})
+            else:
+                fights.extend(round_fights[pair])
+                matches.append({'hero1_id': pair[0], 'hero2_id': pair[1], 'winner_id': winners[pair],
+                    'fights': len(round_fights[pair])})
+        rounds.append(matches)
+        alive = [match['winner_id'] for match in matches]
+    return fights, rounds, alive[0]
+
+def planned_fights(fmt, count, legs=1):
+    # Limite superior de lutas (a eliminatória pode ter revanches)
+    if fmt == 'round_robin':
+        return count * (count - 1) // 2 * legs
+    return (count - 1) * (1 + BRACKET_REMATCHES)
@@ -248,10 +248,12 @@ def get_activity_analysis():
     return jsonify(activity_report), 200
 
 if __name__ == '__main__':
+    from serve import serve
+    
     print("=" * 60)
     print("📊 GUILD REPORTER - Microsserviço de Relatórios")
     print("=" * 60)
     print(f"🔗 Conectando ao Guild Service: {GUILD_SERVICE_URL}")
     print("🚀 Serviço rodando na porta 8001")
     print("=" * 60)
-    app.run(host='0.0.0.0', port=8001, debug=False)
+    serve(app, port=8001)
@@ -159,9 +159,11 @@ def get_guild_stats(guild_id):
     }), 200
 
 if __name__ == '__main__':
+    from serve import serve
+    
     print("=" * 60)
     print("🏰 GUILD SERVICE - Microsserviço de Guildas")
     print("=" * 60)
     print("🚀 Serviço rodando na porta 8000")
     print("=" * 60)
-    app.run(host='0.0.0.0', port=8000, debug=False)
+    serve(app, port=8000)
@@ -173,6 +173,8 @@ def get_stats():
     return jsonify(stats), 200
 
 if __name__ == '__main__':
+    from serve import serve
+    
     print("=" * 60)
     print("🚪 API GATEWAY - Ponto Único de Entrada")
     print("=" * 60)
@@ -180,4 +182,4 @@ if __name__ == '__main__':
     print(f"🔗 Item Service: {ITEM_SERVICE_URL}")
     print("🚀 Gateway rodando na porta 8000")
     print("=" * 60)
-    app.run(host='0.0.0.0', port=8000, debug=False)
+    serve(app, port=8000)
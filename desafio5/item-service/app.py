@@ -176,9 +176,11 @@ def get_items_by_type(type):
     }), 200
 
 if __name__ == '__main__':
+    from serve import serve
+    
     print("=" * 60)
     print("⚔️ ITEM SERVICE - Microsserviço de Itens")
     print("=" * 60)
     print("🚀 Serviço rodando na porta 8003")
     print("=" * 60)
-    app.run(host='0.0.0.0', port=8003, debug=False)
+    serve(app, port=8003)
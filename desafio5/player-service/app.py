@@ -144,9 +144,11 @@ def get_player_stats(player_id):
     return jsonify(stats), 200
 
 if __name__ == '__main__':
+    from serve import serve
+    
     print("=" * 60)
     print("👤 PLAYER SERVICE - Microsserviço de Jogadores")
     print("=" * 60)
     print("🚀 Serviço rodando na porta 8002")
     print("=" * 60)
-    app.run(host='0.0.0.0', port=8002, debug=False)
+    serve(app, port=8002)
@@ -0,0 +1,57 @@
+#!/bin/bash
+
+echo "============================================================"
+echo "🏭 BENCHMARK: servidor de desenvolvimento vs Gunicorn"
+echo "============================================================"
+echo ""
+
+cd "$(dirname "$0")"
+
+CONCURRENCY=${CONCURRENCY:-32}
+DURATION=${DURATION:-20}
+
+if ! docker info > /dev/null 2>&1; then
+    echo "❌ Docker não está rodando. Por favor, inicie o Docker."
+    exit 1
+fi
+
+wait_for() {
+    echo "⏳ Aguardando $1..."
+    for i in $(seq 1 60); do
+        if curl -sf "$1" > /dev/null; then
+            return 0
+        fi
+        sleep 2
+    done
+    echo "❌ $1 não respondeu"
+    return 1
+}
+
+for mode in debug production; do
+    echo ""
+    echo "🔧 SERVER_MODE=$mode"
+    echo "------------------------------------------------------------"
+
+    (cd ../desafio3 && SERVER_MODE=$mode docker compose up -d --build > /dev/null 2>&1)
+    if wait_for http://localhost:5000/health; then
+        python3 bench_serving.py --url http://localhost:5000 \
+            --concurrency "$CONCURRENCY" --duration "$DURATION" --label "⚔️ Arena ($mode)" \
+            --endpoint "GET /heroes" \
+            --endpoint "GET /ranking" \
+            --endpoint 'POST /battle {"hero1_id": 1, "hero2_id": 2}'
+    fi
+    (cd ../desafio3 && docker compose down > /dev/null 2>&1)
+
+    (cd ../desafio5 && SERVER_MODE=$mode docker compose up -d --build > /dev/null 2>&1)
+    if wait_for http://localhost:8000/health; then
+        python3 bench_serving.py --url http://localhost:8000 \
+            --concurrency "$CONCURRENCY" --duration "$DURATION" --label "🚪 Gateway ($mode)" \
+            --endpoint "GET /players" \
+            --endpoint "GET /players/1/items" \
+            --endpoint "GET /stats"
+    fi
+    (cd ../desafio5 && docker compose down > /dev/null 2>&1)
+done
+
+echo ""
+echo "✅ Benchmark concluído!"
@@ -0,0 +1,102 @@
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+def parse_endpoint(spec):
+    # "GET /heroes" ou 'POST /battle {"hero1_id": 1, "hero2_id": 2}'
+    method, _, rest = spec.partition(' ')
+    path, _, body = rest.partition(' ')
+    return method.upper(), path, body.encode('utf-8') if body else None
+
+class Worker(threading.Thread):
+    def __init__(self, url, endpoints, deadline):
+        super().__init__(daemon=True)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.endpoints = endpoints
+        self.deadline = deadline
+        self.latencies = {spec: [] for spec in endpoints}
+        self.errors = {spec: 0 for spec in endpoints}
+        self.conn = None
+
+    def request(self, method, path, body):
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        headers = {'Content-Type': 'application/json'} if body else {}
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            response.read()
+            if response.will_close:
+                self.conn.close()
+                self.conn = None
+            return response.status
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+            self.conn = None
+            raise
+
+    def run(self):
+        i = 0
+        while time.perf_counter() < self.deadline:
+            spec = self.endpoints[i % len(self.endpoints)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                ok = self.request(*parse_endpoint(spec)) < 400
+            except (OSError, http.client.HTTPException):
+                ok = False
+            if ok:
+                self.latencies[spec].append(time.perf_counter() - start)
+            else:
+                self.errors[spec] += 1
+
+def percentile(values, p):
+    return values[max(int(len(values) * p / 100) - 1, 0)] if values else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description='Carga concorrente em rotas HTTP (comparação de servidores)')
+    parser.add_argument('--url', required=True)
+    parser.add_argument('--endpoint', action='append', required=True, dest='endpoints',
+        help='"MÉTODO /rota [corpo JSON]"; pode repetir')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--label', default='')
+    parser.add_argument('--json', action='store_true', help='imprime o resultado em JSON')
+    args = parser.parse_args()
+
+    deadline = time.perf_counter() + args.duration
+    workers = [Worker(urlsplit(args.url), args.endpoints, deadline) for _ in range(args.concurrency)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+
+    results = {}
+    for spec in args.endpoints:
+        latencies = sorted(l for w in workers for l in w.latencies[spec])
+        results[spec] = {
+            'ok': len(latencies),
+            'errors': sum(w.errors[spec] for w in workers),
+            'rps': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000
+        }
+
+    if args.json:
+        print(json.dumps({'label': args.label, 'concurrency': args.concurrency, 'results': results}))
+        return
+
+    print(f"📊 {args.label or args.url} | {args.concurrency} conexões | {elapsed:.1f}s")
+    for spec, r in results.items():
+        print(f"   {spec[:40]:<40} {r['rps']:>8,.1f} req/s | p50 {r['p50_ms']:7.2f} ms | "
+            f"p95 {r['p95_ms']:7.2f} ms | p99 {r['p99_ms']:7.2f} ms | erros {r['errors']:,}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import multiprocessing
+import os
+
+SERVER_MODE = os.environ.get('SERVER_MODE', 'production')
+SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', multiprocessing.cpu_count()))
+SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 4))
+SERVER_KEEPALIVE = int(os.environ.get('SERVER_KEEPALIVE', 5))
+SERVER_TIMEOUT = int(os.environ.get('SERVER_TIMEOUT', 30))
+SERVER_GRACEFUL_TIMEOUT = int(os.environ.get('SERVER_GRACEFUL_TIMEOUT', 30))
+SERVER_MAX_REQUESTS = int(os.environ.get('SERVER_MAX_REQUESTS', 0))
+SERVER_RELOAD = os.environ.get('SERVER_RELOAD', '0') == '1'
+
+SERVER_MODES = ('production', 'debug')
+
+def gunicorn_options(host, port):
+    return {
+        'bind': f'{host}:{port}',
+        'workers': SERVER_WORKERS,
+        'worker_class': 'gthread',
+        'threads': SERVER_THREADS,
+        'keepalive': SERVER_KEEPALIVE,
+        'timeout': SERVER_TIMEOUT,
+        'graceful_timeout': SERVER_GRACEFUL_TIMEOUT,
+        'max_requests': SERVER_MAX_REQUESTS,
+        'max_requests_jitter': SERVER_MAX_REQUESTS // 10,
+        'accesslog': None,
+        'errorlog': '-'
+    }
+
+def serve(app, port, host='0.0.0.0'):
+    # Ponto único de inicialização dos serviços Flask. Em produção o app roda
+    # no Gunicorn (workers gthread; SIGHUP troca os workers graciosamente:
+    # `docker compose kill -s HUP <serviço>`). O servidor de desenvolvimento
+    # do Flask, com reloader opcional (SERVER_RELOAD=1), fica para
+    # SERVER_MODE=debug.
+    if SERVER_MODE not in SERVER_MODES:
+        raise ValueError(f"SERVER_MODE desconhecido: {SERVER_MODE}")
+
+    if SERVER_MODE == 'debug':
+        print(f"🐞 Modo debug: servidor de desenvolvimento do Flask na porta {port}")
+        app.run(host=host, port=port, debug=True, use_reloader=SERVER_RELOAD, threaded=True)
+        return
+
+    from gunicorn.app.base import BaseApplication
+
+    class FlaskApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    print(f"🏭 Gunicorn: {SERVER_WORKERS} workers x {SERVER_THREADS} threads na porta {port} "
+        f"(keep-alive {SERVER_KEEPALIVE}s, graceful timeout {SERVER_GRACEFUL_TIMEOUT}s)")
+    FlaskApplication(gunicorn_options(host, port)).run()